@@ -0,0 +1,63 @@
+"""Benchmark commits/sec for each commit backend.
+
+Usage: python benchmarks/bench_commit_backends.py [--commits N]
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import git
+
+from github_auto_commit.backends import BACKENDS
+
+
+def make_repo(path: Path) -> git.Repo:
+    """Create a repository with one initial commit."""
+    repo = git.Repo.init(path)
+    with repo.config_writer() as git_config:
+        git_config.set_value('user', 'name', 'Bench User')
+        git_config.set_value('user', 'email', 'bench@example.com')
+    readme = path / 'README.md'
+    readme.write_text('benchmark\n')
+    repo.index.add([str(readme)])
+    repo.index.commit('Initial commit')
+    return repo
+
+
+def bench_backend(name: str, commits: int) -> float:
+    """Return commits/sec for ``commits`` commits made with backend ``name``."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repo_dir = Path(temp_dir)
+        repo = make_repo(repo_dir)
+        backend = BACKENDS[name](repo, repo_dir)
+        start = time.perf_counter()
+        if getattr(backend, 'batch', False):
+            plan = []
+            for i in range(commits):
+                now = datetime.now()
+                plan.append((f'Benchmark commit {i}', now.isoformat(), int(now.timestamp())))
+            backend.commit_many(plan)
+        else:
+            for i in range(commits):
+                backend.commit(f'Benchmark commit {i}', datetime.now().isoformat())
+        elapsed = time.perf_counter() - start
+        repo.close()
+    return commits / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--commits', type=int, default=500)
+    args = parser.parse_args()
+
+    results = {name: bench_backend(name, args.commits) for name in BACKENDS}
+    baseline = results['index']
+    for name, rate in results.items():
+        print(f"{name:>11}: {rate:8.1f} commits/sec  ({rate / baseline:.1f}x index)")
+
+
+if __name__ == '__main__':
+    main()
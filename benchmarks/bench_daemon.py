@@ -0,0 +1,69 @@
+"""Benchmark a commit through the daemon against a fresh process per commit.
+
+Usage: python benchmarks/bench_daemon.py [--runs N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import git
+
+from github_auto_commit.config import Config
+from github_auto_commit.daemon import Daemon, DaemonClient
+from bench_commit_backends import make_repo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        os.environ['HOME'] = str(root)
+        config = Config()
+        config.update(github_username='bench', github_token='bench')
+        repo = make_repo(root / 'repo')
+        git.Repo.init(root / 'remote.git', bare=True)
+        repo.create_remote('origin', str(root / 'remote.git'))
+
+        command = [sys.executable, '-m', 'github_auto_commit', 'commit', '-n', '1',
+                   '--repo', str(root / 'repo')]
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        process = (time.perf_counter() - start) / args.runs
+
+        daemon = Daemon(config)
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        client = DaemonClient(daemon.path)
+        while not (daemon.path.exists() and client.running()):
+            time.sleep(0.01)
+        client.request('commit', repo=str(root / 'repo'), count=1)  # open the repository
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            client.request('commit', repo=str(root / 'repo'), count=1)
+        warm = (time.perf_counter() - start) / args.runs
+
+        command[3:4] = ['daemon', 'commit']
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        thin = (time.perf_counter() - start) / args.runs
+        daemon.stop()
+        thread.join()
+
+    print(f"  new process per commit: {process * 1000:7.1f} ms")
+    print(f"  thin client via daemon: {thin * 1000:7.1f} ms  ({process / thin:.1f}x)")
+    print(f"socket request to daemon: {warm * 1000:7.1f} ms  ({process / warm:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
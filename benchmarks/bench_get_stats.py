@@ -0,0 +1,72 @@
+"""Benchmark get_stats on a synthetic history against full GitPython iteration.
+
+Usage: python benchmarks/bench_get_stats.py [--commits N] [--days D ...]
+
+The history is written with the fast-import backend, one commit every
+five minutes ending now.
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from github_auto_commit.auto_commit import scan_history
+from github_auto_commit.backends import FastImportBackend
+from bench_commit_backends import make_repo
+
+
+def build_history(path: Path, commits: int):
+    """Create a repository with ``commits`` commits spaced five minutes apart."""
+    repo = make_repo(path)
+    now = int(time.time())
+    plan = [(f'Synthetic commit {i}', str(i), now - (commits - i) * 300) for i in range(commits)]
+    FastImportBackend(repo, path).commit_many(plan)
+    return repo
+
+
+def gitpython_stats(repo, days):
+    """Count the window by walking full Commit objects, as get_stats used to (uncapped)."""
+    total = 0
+    for commit in repo.iter_commits('HEAD'):
+        if (datetime.now() - datetime.fromtimestamp(commit.committed_date)).days > days:
+            break
+        total += 1
+    return total
+
+
+def measure(func, *args):
+    """Return (seconds, peak traced bytes, result) for one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--commits', type=int, default=100_000)
+    parser.add_argument('--days', type=int, nargs='+', default=[30, 365])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        start = time.perf_counter()
+        repo = build_history(Path(temp_dir), args.commits)
+        print(f"built {args.commits} commits in {time.perf_counter() - start:.1f}s")
+
+        for days in args.days:
+            t_new, m_new, stats = measure(scan_history, repo, days)
+            t_old, m_old, total = measure(gitpython_stats, repo, days)
+            assert stats['total_commits'] == total, (stats['total_commits'], total)
+            print(f"{days:>4} days: {total:6d} commits | streaming {t_new:6.2f}s "
+                  f"{m_new / 1024:7.0f} KiB | GitPython {t_old:6.2f}s {m_old / 1024:7.0f} KiB")
+        repo.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark the message store against a message list kept in config.json.
+
+Usage: python benchmarks/bench_messages.py [--sizes N ...] [--samples S]
+
+For each corpus size, times opening the store (or parsing the JSON) and
+picking one message, as a single commit does, then the cost per sample
+and of adding one message.
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from github_auto_commit.messages import MessageStore
+
+
+def timed(func):
+    """Return (seconds, result) for one call."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def bench_json(path: Path, corpus, samples: int):
+    path.write_text(json.dumps({'commit_messages': corpus}))
+
+    def open_and_pick():
+        return random.choice(json.loads(path.read_text())['commit_messages'])
+
+    t_open, _ = timed(open_and_pick)
+    messages = json.loads(path.read_text())['commit_messages']
+    t_sample, _ = timed(lambda: [random.choice(messages) for _ in range(samples)])
+
+    def add_one():
+        config = json.loads(path.read_text())
+        config['commit_messages'].append('One more message')
+        path.write_text(json.dumps(config))
+
+    t_add, _ = timed(add_one)
+    return t_open, t_sample / samples, t_add
+
+
+def bench_store(directory: Path, corpus, samples: int):
+    with MessageStore(directory) as store:
+        store.add_many((message, random.uniform(0.5, 2.0)) for message in corpus)
+        # Build and save the alias table, as the first commit after an edit does
+        store.sample()
+
+    def open_and_pick():
+        with MessageStore(directory) as store:
+            return store.sample()
+
+    t_open, _ = timed(open_and_pick)
+    with MessageStore(directory) as store:
+        t_sample, _ = timed(lambda: [store.sample() for _ in range(samples)])
+        t_add, _ = timed(lambda: store.add('One more message'))
+        t_rebuild, _ = timed(store.sample)
+    return t_open, t_sample / samples, t_add, t_rebuild
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--samples', type=int, default=10_000)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        corpus = [f'Synthetic commit message number {i} with some text' for i in range(size)]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            j_open, j_sample, j_add = bench_json(root / 'config.json', corpus, args.samples)
+            s_open, s_sample, s_add, s_rebuild = bench_store(root / 'messages', corpus, args.samples)
+        print(f"{size:>7} messages | open+pick: json {j_open * 1e3:7.2f}ms store {s_open * 1e3:6.2f}ms"
+              f" | sample: json {j_sample * 1e6:5.2f}us store {s_sample * 1e6:5.2f}us"
+              f" | add: json {j_add * 1e3:7.2f}ms store {s_add * 1e3:5.2f}ms"
+              f" (+{s_rebuild * 1e3:.1f}ms alias rebuild on next sample)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark total commit throughput across several repositories.
+
+Usage: python benchmarks/bench_multi_repo.py [--repos N] [--commits N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import git
+
+from github_auto_commit.config import Config
+from github_auto_commit.executor import commit_to_repos
+from bench_commit_backends import make_repo
+
+
+def make_repos(root: Path, count: int):
+    """Create ``count`` repositories, each with a bare ``origin`` under ``root``."""
+    paths = []
+    for i in range(count):
+        path = root / f'repo{i}'
+        repo = make_repo(path)
+        git.Repo.init(root / f'repo{i}.git', bare=True)
+        repo.create_remote('origin', str(root / f'repo{i}.git'))
+        paths.append(path)
+    return paths
+
+
+def bench(config: Config, repos: int, commits: int, workers: int) -> float:
+    """Return total commits/sec making ``commits`` commits in each of ``repos`` repositories."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = make_repos(Path(temp_dir), repos)
+        start = time.perf_counter()
+        commit_to_repos(config, [(p, commits) for p in paths], max_workers=workers)
+        return repos * commits / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repos', type=int, default=8)
+    parser.add_argument('--commits', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ['HOME'] = home
+        config = Config()
+        config.update(github_username='bench', github_token='bench')
+        sequential = bench(config, args.repos, args.commits, workers=1)
+        parallel = bench(config, args.repos, args.commits, workers=args.repos)
+    print(f"  1 worker : {sequential:8.1f} commits/sec")
+    print(f"{args.repos:>3} workers: {parallel:8.1f} commits/sec  ({parallel / sequential:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
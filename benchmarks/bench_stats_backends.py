@@ -0,0 +1,36 @@
+"""Compare request count and latency of the REST and GraphQL stats backends.
+
+Usage: python benchmarks/bench_stats_backends.py [--repos N] [--latency SECONDS]
+
+The stub answers at most 99 repositories over GraphQL, so keep --repos
+below 100 for the two backends to see the same data.
+"""
+
+import argparse
+import time
+
+from github_auto_commit.stats import ContributionStats
+from stub_api import StubAPI
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repos', type=int, default=60)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+
+    results = {}
+    with StubAPI(repos=args.repos, latency=args.latency) as stub:
+        for backend in ('rest', 'graphql'):
+            client = ContributionStats('bench-token', api_url=stub.url, cache=False, backend=backend)
+            stub.request_count = 0
+            start = time.perf_counter()
+            stats, repo_stats = client.get_user_stats('bench-user', days=30)
+            results[backend] = (time.perf_counter() - start, stub.request_count, sum(stats.values()))
+
+    for backend, (elapsed, requests, commits) in results.items():
+        print(f"{backend:>8}: {requests:4d} requests  {elapsed:6.2f}s  {commits} commits")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""Benchmark serial vs concurrent repository fetching in ContributionStats.
+
+Usage: python benchmarks/bench_stats_fetch.py [--repos N] [--latency SECONDS] [--workers N]
+"""
+
+import argparse
+import time
+
+from github_auto_commit.stats import ContributionStats
+from stub_api import StubAPI
+
+
+def timed_fetch(url: str, workers: int):
+    """Fetch stats with ``workers`` threads and return (seconds, result)."""
+    client = ContributionStats('bench-token', api_url=url, max_workers=workers, cache=False)
+    start = time.perf_counter()
+    result = client.get_user_stats('bench-user', days=30)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repos', type=int, default=150)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    with StubAPI(repos=args.repos, latency=args.latency) as stub:
+        serial_time, serial = timed_fetch(stub.url, 1)
+        concurrent_time, concurrent = timed_fetch(stub.url, args.workers)
+
+    assert serial == concurrent, "concurrent fetch returned different results"
+    print(f"serial:     {serial_time:6.2f}s")
+    print(f"{args.workers} workers:  {concurrent_time:6.2f}s  ({serial_time / concurrent_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
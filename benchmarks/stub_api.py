@@ -0,0 +1,78 @@
+"""Local stand-in for the GitHub REST API used by the benchmarks."""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+class StubAPI:
+    """Serve ``repos`` repositories with ``commits`` recent commits each.
+
+    Every response is delayed by ``latency`` seconds to stand in for the
+    round trip to api.github.com.
+    """
+
+    def __init__(self, repos: int = 150, commits: int = 20, latency: float = 0.05):
+        self.latency = latency
+        self.request_count = 0
+        now = datetime.utcnow()
+        dates = [(now - timedelta(hours=6 * i)).strftime('%Y-%m-%dT%H:%M:%SZ')
+                 for i in range(commits)]
+        self.repo_list = json.dumps([{'name': f'repo-{i}'} for i in range(repos)]).encode()
+        self.commit_list = json.dumps([{'commit': {'author': {'date': d}}} for d in dates]).encode()
+        days = {}
+        for d in dates:
+            days[d[:10]] = days.get(d[:10], 0) + 1
+        nodes = [{'occurredAt': f'{day}T00:00:00Z', 'commitCount': n} for day, n in days.items()]
+        # GraphQL caps repositories at 100, like the real API
+        self.contributions = json.dumps({'data': {'user': {'contributionsCollection': {
+            'commitContributionsByRepository': [
+                {'repository': {'name': f'repo-{i}', 'owner': {'login': 'bench-user'}},
+                 'contributions': {'pageInfo': {'hasNextPage': False}, 'nodes': nodes}}
+                for i in range(min(repos, 99))
+            ]}}}}).encode()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub.request_count += 1
+                time.sleep(stub.latency)
+                path = urlparse(self.path).path
+                body = stub.repo_list if path.endswith('/repos') else stub.commit_list
+                self._send(body)
+
+            def do_POST(self):
+                stub.request_count += 1
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                time.sleep(stub.latency)
+                self._send(stub.contributions)
+
+            def _send(self, body):
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,217 @@
+"""Run the benchmark suite and save the results as JSON, or compare two result files.
+
+Usage:
+    python benchmarks/suite.py [--quick] [--output FILE]
+    python benchmarks/suite.py --compare OLD.json NEW.json [--threshold 0.10]
+
+Everything runs against throwaway repositories: commits are pushed to a
+local bare repository as ``origin`` and the GitHub API is the local stub
+server, so results depend only on this machine. Metrics whose name ends in
+``_per_sec`` are better when higher; ``seconds`` metrics when lower.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import git
+
+from github_auto_commit import __version__
+from github_auto_commit.auto_commit import GitHubAutoCommit, scan_history
+from github_auto_commit.config import Config
+from github_auto_commit.metrics import metrics
+from github_auto_commit.stats import ContributionStats
+from bench_commit_backends import make_repo
+from bench_get_stats import build_history
+from stub_api import StubAPI
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+RUN_SIZES = (10, 100, 500)
+QUICK_RUN_SIZES = (10, 50)
+HISTORY_SIZES = (10_000, 100_000)
+QUICK_HISTORY_SIZES = (10_000,)
+PUSH_RUN = 20
+
+
+def add_origin(repo: git.Repo, root: Path) -> None:
+    """Give ``repo`` a fresh bare repository under ``root`` as ``origin``."""
+    remote_dir = root / 'origin.git'
+    git.Repo.init(remote_dir, bare=True)
+    repo.create_remote('origin', str(remote_dir))
+
+
+def bench_make_commits(config: Config, sizes) -> dict:
+    """Time make_commits for each backend and run size, pushing once per run."""
+    results = {}
+    for backend in ('index', 'object', 'fast-import'):
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                root = Path(temp_dir)
+                repo = make_repo(root / 'work')
+                add_origin(repo, root)
+                auto_commit = GitHubAutoCommit(config, backend=backend, repo_dir=root / 'work')
+                start = time.perf_counter()
+                auto_commit.run_commits(size, push_every=0)
+                elapsed = time.perf_counter() - start
+                repo.close()
+            results[f'make_commits/{backend}/n={size}'] = {
+                'seconds': elapsed,
+                'commits_per_sec': size / elapsed,
+            }
+    return results
+
+
+def bench_pushes(config: Config, size: int) -> dict:
+    """Time a run that pushes after every commit; pushes/sec comes from the push timings."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        repo = make_repo(root / 'work')
+        add_origin(repo, root)
+        auto_commit = GitHubAutoCommit(config, repo_dir=root / 'work')
+        # The first push sets up the upstream branch; don't count it
+        auto_commit.run_commits(1, push_every=1)
+        metrics.reset()
+        start = time.perf_counter()
+        result = auto_commit.run_commits(size, push_every=1)
+        elapsed = time.perf_counter() - start
+        repo.close()
+    push_time = sum(h['sum'] for h in metrics.to_dict()['histograms'] if h['name'] == 'push_seconds')
+    return {f'make_commits/push_every=1/n={size}': {
+        'seconds': elapsed,
+        'commits_per_sec': size / elapsed,
+        'pushes_per_sec': result['pushes'] / push_time,
+    }}
+
+
+def bench_get_stats(config: Config, sizes) -> dict:
+    """Time get_stats (cold index build, then warm) and a direct history scan."""
+    results = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            repo = build_history(root / 'work', size)
+            add_origin(repo, root)
+            auto_commit = GitHubAutoCommit(config, repo_dir=root / 'work')
+            timings = {}
+            for name, func in (('index_cold', lambda: auto_commit.get_stats(30)),
+                               ('index_warm', lambda: auto_commit.get_stats(30)),
+                               ('scan_30d', lambda: scan_history(repo, 30)),
+                               ('scan_365d', lambda: scan_history(repo, 365))):
+                start = time.perf_counter()
+                func()
+                timings[name] = time.perf_counter() - start
+            repo.close()
+        for name, seconds in timings.items():
+            results[f'get_stats/{name}/commits={size}'] = {'seconds': seconds}
+    return results
+
+
+def bench_contribution_stats(repos: int = 150, latency: float = 0.02) -> dict:
+    """Time ContributionStats against the stub API for each backend and worker count."""
+    results = {}
+    with StubAPI(repos=repos, latency=latency) as stub:
+        for name, backend, workers in (('rest/workers=1', 'rest', 1),
+                                       ('rest/workers=8', 'rest', 8),
+                                       ('graphql', 'graphql', 8)):
+            client = ContributionStats('bench-token', api_url=stub.url, max_workers=workers,
+                                       cache=False, backend=backend)
+            stub.request_count = 0
+            start = time.perf_counter()
+            client.get_user_stats('bench-user', days=30)
+            elapsed = time.perf_counter() - start
+            results[f'contribution_stats/{name}'] = {
+                'seconds': elapsed,
+                'requests': stub.request_count,
+                'requests_per_sec': stub.request_count / elapsed,
+            }
+    return results
+
+
+def source_revision() -> str:
+    """Return the git revision of the checkout being benchmarked, if any."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_suite(quick: bool) -> dict:
+    """Run every benchmark and return the results document."""
+    results = {}
+    with tempfile.TemporaryDirectory() as home:
+        os.environ['HOME'] = home
+        config = Config()
+        config.update(github_username='bench-user', github_token='bench-token')
+        steps = (
+            ('make_commits', lambda: bench_make_commits(config, QUICK_RUN_SIZES if quick else RUN_SIZES)),
+            ('pushes', lambda: bench_pushes(config, PUSH_RUN)),
+            ('get_stats', lambda: bench_get_stats(config, QUICK_HISTORY_SIZES if quick else HISTORY_SIZES)),
+            ('contribution_stats', bench_contribution_stats),
+        )
+        for name, step in steps:
+            print(f"running {name}...", file=sys.stderr)
+            results.update(step())
+    return {
+        'version': __version__,
+        'revision': source_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'quick': quick,
+        'results': results,
+    }
+
+
+def compare(old: dict, new: dict, threshold: float) -> bool:
+    """Print each shared metric's change from ``old`` to ``new``; return True if any regressed."""
+    regressed = False
+    print(f"{old['version']} ({old['revision']}) -> {new['version']} ({new['revision']})")
+    for name in sorted(set(old['results']) & set(new['results'])):
+        for metric, before in old['results'][name].items():
+            after = new['results'][name].get(metric)
+            if after is None or not before or metric == 'requests':
+                continue
+            change = (after - before) / before
+            worse = -change if metric.endswith('_per_sec') else change
+            flag = ''
+            if worse > threshold:
+                flag = '  REGRESSION'
+                regressed = True
+            elif worse < -threshold:
+                flag = '  improved'
+            print(f"{name:48} {metric:17} {before:12.4f} -> {after:12.4f} {change:+8.1%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='smaller run sizes and only the 10k history')
+    parser.add_argument('--output', type=Path, help='results file (default: benchmarks/results/...)')
+    parser.add_argument('--compare', nargs=2, type=Path, metavar=('OLD', 'NEW'))
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative change counted as a regression (default: 0.10)')
+    args = parser.parse_args()
+
+    if args.compare:
+        old, new = (json.loads(path.read_text()) for path in args.compare)
+        sys.exit(1 if compare(old, new, args.threshold) else 0)
+
+    document = run_suite(args.quick)
+    output = args.output or RESULTS_DIR / f"{document['version']}-{document['revision']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(document, indent=4))
+    for name, values in document['results'].items():
+        print(f"{name:48} " + "  ".join(f"{k}={v:.4g}" for k, v in values.items()))
+    print(f"results saved to {output}")
+
+
+if __name__ == '__main__':
+    main()
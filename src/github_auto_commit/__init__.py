@@ -2,7 +2,16 @@
 
 __version__ = "1.1.0"
 
-from .auto_commit import GitHubAutoCommit
-from .config import Config
-
 __all__ = ['GitHubAutoCommit', 'Config']
+
+
+def __getattr__(name):
+    # Imported on first use: GitHubAutoCommit pulls in GitPython, which the CLI
+    # should only pay for when a command needs a repository
+    if name == 'GitHubAutoCommit':
+        from .auto_commit import GitHubAutoCommit
+        return GitHubAutoCommit
+    if name == 'Config':
+        from .config import Config
+        return Config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,29 +2,113 @@
 
 import os
 import random
+import sqlite3
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 import git
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 
+from .backends import PlannedCommit, get_backend
+from .commit_index import RECENT_MESSAGES, CommitIndex, window_start
+from .journal import Journal, JournalRun, RunState
+from .metrics import metrics
+from .push import BackgroundPusher, PushError, Pusher
+
+if TYPE_CHECKING:
+    from .messages import MessageStore
+
 console = Console()
 
+DEFAULT_MESSAGES = [
+    "Update documentation",
+    "Fix typo",
+    "Update README",
+    "Add new feature",
+    "Improve performance",
+    "Fix bug",
+    "Clean up code",
+    "Refactor code",
+    "Update dependencies",
+    "Add tests"
+]
+
 class GitHubAutoCommit:
     """Handles GitHub auto-commit functionality."""
     
-    def __init__(self, config):
-        """Initialize with configuration."""
+    def __init__(self, config, backend: Optional[str] = None, repo_dir: Optional[Path] = None):
+        """Initialize with configuration.
+
+        ``backend`` selects how commits are written: ``index`` (default) goes
+        through the working tree and index, ``object`` writes objects directly
+        into the object database and ``fast-import`` streams a whole run into
+        ``git fast-import``. Defaults to the ``commit_backend`` config value.
+        ``repo_dir`` is the repository to commit to (default: the current
+        directory).
+        """
         self.config = config
-        self.repo_dir = Path.cwd()
+        self.repo_dir = Path(repo_dir) if repo_dir else Path.cwd()
         try:
             self.repo = git.Repo(self.repo_dir)
             self._validate_repo()
-        except git.exc.InvalidGitRepositoryError:
+        except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError):
             raise Exception("Not a valid Git repository. Please run this from a Git repository.")
+        self.backend = get_backend(backend or config.get('commit_backend', 'index'),
+                                   self.repo, self.repo_dir)
+        self._pusher: Optional[Pusher] = None
+        self._messages: Optional['MessageStore'] = None
+        self._journal: Optional[Journal] = None
+
+    @property
+    def messages(self) -> 'MessageStore':
+        """The user's commit message store, opened on first use."""
+        if self._messages is None:
+            from .messages import MessageStore
+            self._messages = MessageStore.for_config(self.config, DEFAULT_MESSAGES)
+        return self._messages
+
+    @property
+    def journal(self) -> Journal:
+        """This repository's run journal."""
+        if self._journal is None:
+            self._journal = Journal.for_repo(self.repo, self.config.config_dir)
+        return self._journal
+
+    def interrupted_run(self) -> Optional[RunState]:
+        """Return the journaled run that stopped before finishing, ready to resume, or None.
+
+        Commits on top of the run's last journaled commit are taken to be
+        the run's own, made just before it stopped and not yet recorded.
+        """
+        state = self.journal.last_run()
+        if state is None or state.status == 'done':
+            return None
+        try:
+            branch = self.repo.active_branch.name
+        except TypeError:
+            branch = None
+        if branch != state.branch:
+            raise Exception(f"The interrupted run was on branch '{state.branch}'; "
+                            "check it out to resume the run.")
+        head = self.repo.head.commit.hexsha
+        if head != state.tip:
+            if state.tip and not self.repo.is_ancestor(state.tip, head):
+                raise Exception("The branch has been rewritten since the run stopped, "
+                                "so it can't be resumed.")
+            unrecorded = self.repo.git.log(f'{state.tip}..{head}' if state.tip else head,
+                                           '--first-parent', '--reverse', '--format=%H%x09%s')
+            unrecorded = unrecorded.splitlines()[:state.remaining]
+            if unrecorded:
+                run = self.journal.resume_run(state)
+                for line in unrecorded:
+                    sha, _, subject = line.partition('\t')
+                    run.commit(sha, subject, 0.0, recovered=True)
+                run.finish('interrupted')
+                self.journal.close()
+        return state
     
     def _validate_repo(self) -> None:
         """Validate repository configuration."""
@@ -35,21 +119,26 @@ class GitHubAutoCommit:
             raise Exception("GitHub credentials not configured. Please run setup first.")
 
     def make_commits(self, count: int, delay: int = 0, message: Optional[str] = None,
-                    dry_run: bool = False) -> None:
-        """Make specified number of commits."""
-        messages = self.config.get('commit_messages', [
-            "Update documentation",
-            "Fix typo",
-            "Update README",
-            "Add new feature",
-            "Improve performance",
-            "Fix bug",
-            "Clean up code",
-            "Refactor code",
-            "Update dependencies",
-            "Add tests"
-        ])
-        
+                    dry_run: bool = False, push_every: Optional[int] = None,
+                    resume: Optional[RunState] = None) -> Dict[str, int]:
+        """Make specified number of commits.
+
+        Commits are made locally and a push is requested every ``push_every``
+        commits, with a final push for any remainder. Pushes run in the
+        background while later commits are made; commits made during a push
+        go out together in the next one. ``push_every=1`` keeps the original
+        behaviour: each commit is pushed before the next one is made.
+        ``push_every=0`` pushes once at the end. When not given, the
+        ``push_every`` configuration value is used.
+
+        Batch backends such as ``fast-import`` write the whole run at once,
+        update the branch once and push once; ``delay`` and ``push_every``
+        do not apply to them.
+
+        Each run is recorded in the repository's journal. To finish an
+        interrupted run, pass the state from :meth:`interrupted_run` as
+        ``resume`` and its ``remaining`` commits as ``count``.
+        """
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -57,79 +146,227 @@ class GitHubAutoCommit:
             TimeElapsedColumn(),
         ) as progress:
             task = progress.add_task(f"Making {count} commits...", total=count)
-            
-            try:
+            result = self.run_commits(
+                count, delay, message, dry_run, push_every, resume=resume,
+                on_progress=lambda advance, description: progress.update(
+                    task, advance=advance, description=description))
+        
+        if not dry_run:
+            console.print("\n[green]✓ All commits pushed successfully![/green]")
+            console.print(f"[cyan]Pushed {result['pushes']} time(s) for {result['commits']} commits "
+                          f"({result['pushes_saved']} pushes saved)[/cyan]")
+        else:
+            console.print("\n[yellow]Dry run completed. No actual commits were made.[/yellow]")
+        return result
+
+    def run_commits(self, count: int, delay: int = 0, message: Optional[str] = None,
+                    dry_run: bool = False, push_every: Optional[int] = None,
+                    on_progress: Optional[Callable[[int, str], None]] = None,
+                    resume: Optional[RunState] = None) -> Dict[str, int]:
+        """Do the work of :meth:`make_commits` without displaying anything.
+
+        ``on_progress(advance, description)`` is called as commits are made
+        and pushed, for callers that draw their own progress display.
+        """
+        if push_every is None:
+            push_every = self.config.get('push_every', 0)
+        if push_every < 0:
+            raise ValueError("push_every must be 0 or a positive number of commits")
+        report = on_progress or (lambda advance, description: None)
+        # Resolve the push target afresh for each run; the branch may have changed in between
+        self._pusher = None
+        
+        committed = 0
+        pushes = 0
+        # A resumed run may have made commits that never got pushed
+        unpushed = resume.committed - resume.pushed if resume else 0
+        pusher: Optional[BackgroundPusher] = None
+        journal_run: Optional[JournalRun] = None
+        if not dry_run:
+            journal_run = self._journal_run(count, message, push_every, resume)
+        # Commits the run had made before this call
+        done = journal_run.state.committed if journal_run else 0
+        outcome, error = 'interrupted', None
+
+        def on_push(pushed: int) -> None:
+            journal_run.push(done + pushed)
+            report(0, status())
+
+        def status() -> str:
+            pushed = pusher.pushed if pusher else committed - unpushed
+            return f"Committed {committed}/{count}, pushed {pushed}"
+        
+        try:
+            if getattr(self.backend, 'batch', False) and not dry_run:
+                if delay or push_every:
+                    console.print(f"[yellow]The {self.backend.name} backend writes all commits "
+                                  "at once; delay and push interval are ignored.[/yellow]")
+                plan = self.plan_commits(count, message)
+                report(0, f"Importing {count} commits...")
+                start = time.perf_counter()
+                shas = self.backend.commit_many(plan)
+                elapsed = (time.perf_counter() - start) / max(count, 1)
+                for sha, (commit_message, _, _) in zip(shas, plan):
+                    journal_run.commit(sha, commit_message, elapsed)
+                committed = count
+                unpushed += count
+                report(count, f"Imported {count} commits")
+            else:
+                if push_every > 1 and not dry_run:
+                    # Push in the background while the next commits are made
+                    pusher = BackgroundPusher(self._push_commits, on_push=on_push)
+                requested = 0
                 for i in range(count):
-                    commit_message = message or random.choice(messages)
+                    commit_message = message or self.messages.sample()
                     if not dry_run:
-                        self._make_single_commit(commit_message)
-                        self._push_commits()
-                    progress.update(task, advance=1, description=f"Commit {i+1}/{count}: {commit_message}")
+                        start = time.perf_counter()
+                        sha = self._make_single_commit(commit_message)
+                        committed += 1
+                        journal_run.commit(sha, commit_message, time.perf_counter() - start)
+                        if pusher:
+                            pusher.check()
+                            if committed - requested >= push_every:
+                                pusher.request(committed)
+                                requested = committed
+                        else:
+                            unpushed += 1
+                            if push_every == 1:
+                                self._push_commits()
+                                journal_run.push(done + committed)
+                                pushes += 1
+                                unpushed = 0
+                        report(1, f"{status()}: {commit_message}")
+                    else:
+                        report(1, f"Commit {i+1}/{count}: {commit_message}")
                     if delay and i < count - 1:
                         time.sleep(delay)
+                if pusher:
+                    report(0, f"{status()}, pushing the rest...")
+                    pusher.request(committed)
+                    pusher.close()
+                    pushes = pusher.pushes
+                    if committed:
+                        # The pushes sent the tip, so earlier unpushed commits went too
+                        unpushed = 0
+            
+            if unpushed:
+                report(0, f"Pushing {unpushed} commits...")
+                self._push_commits()
+                journal_run.push(done + committed)
+                pushes += 1
+                unpushed = 0
+            outcome = 'done'
                 
-                if not dry_run:
-                    console.print("\n[green]✓ All commits pushed successfully![/green]")
-                else:
-                    console.print("\n[yellow]Dry run completed. No actual commits were made.[/yellow]")
-                    
-            except Exception as e:
-                console.print(f"\n[red]Error during commit process: {str(e)}[/red]")
-                raise
-
-    def _make_single_commit(self, message: str) -> None:
-        """Make a single commit with the given message."""
-        timestamp_file = self.repo_dir / '.timestamp'
-        
-        # Create or update timestamp file
-        with open(timestamp_file, 'w') as f:
-            f.write(datetime.now().isoformat())
+        except Exception as e:
+            outcome, error = 'failed', str(e)
+            if pusher:
+                try:
+                    pusher.close(flush=False)
+                except Exception:
+                    # Already being raised, or superseded by the error that stopped the run
+                    pass
+                pushes = pusher.pushes
+                unpushed = journal_run.state.committed - journal_run.state.pushed
+            if unpushed:
+                console.print(f"\n[yellow]{unpushed} commit(s) were made locally but not pushed.[/yellow]")
+            console.print(f"\n[red]Error during commit process: {str(e)}[/red]")
+            raise
+        finally:
+            metrics.increment('commits_total', committed)
+            metrics.increment('pushes_total', pushes)
+            if journal_run:
+                journal_run.finish(outcome, error)
+                # Long-lived instances (daemon, scheduler) would otherwise hold the file open
+                self.journal.close()
         
-        # Stage and commit
-        self.repo.index.add([str(timestamp_file)])
-        self.repo.index.commit(message)
+        return {
+            'commits': committed,
+            'pushes': pushes,
+            'pushes_saved': committed - pushes,
+        }
+
+    def _journal_run(self, count: int, message: Optional[str], push_every: int,
+                     resume: Optional[RunState]) -> JournalRun:
+        """Start recording a run in the journal, or carry on recording ``resume``."""
+        if resume is not None:
+            return self.journal.resume_run(resume)
+        try:
+            branch = self.repo.active_branch.name
+        except TypeError:
+            branch = None
+        try:
+            base = self.repo.head.commit.hexsha
+        except ValueError:
+            # No commits yet
+            base = ''
+        return self.journal.start_run(repo=str(self.repo_dir.resolve()), branch=branch,
+                                      base=base, count=count,
+                                      message=message, push_every=push_every)
+
+    def plan_commits(self, count: int, message: Optional[str] = None,
+                     messages: Optional[List[str]] = None) -> List[PlannedCommit]:
+        """Choose the message, timestamp file content and date of each of ``count`` commits.
+
+        Messages are sampled from the message store unless ``message`` is
+        given, or ``messages`` to choose from uniformly.
+        """
+        plan = []
+        for _ in range(count):
+            now = datetime.now()
+            if message:
+                chosen = message
+            elif messages is not None:
+                chosen = random.choice(messages)
+            else:
+                chosen = self.messages.sample()
+            plan.append((chosen, now.isoformat(), int(now.timestamp())))
+        return plan
+
+    def _make_single_commit(self, message: str) -> str:
+        """Make a single commit with the given message and return its SHA."""
+        return self.backend.commit(message, datetime.now().isoformat())
 
     def _push_commits(self) -> None:
-        """Push commits to remote repository."""
+        """Push commits to remote repository.
+
+        The push target is resolved on the first push of a run and reused
+        for the rest of it; see :class:`~.push.Pusher` for retries.
+        """
+        if self._pusher is None:
+            self._pusher = Pusher(self.repo)
         try:
-            origin = self.repo.remote('origin')
-            current = self.repo.active_branch
-            
-            # First try to push normally
-            try:
-                origin.push()
-                return
-            except git.exc.GitCommandError:
-                pass
-            
-            # If normal push fails, try to set up tracking
-            try:
-                origin.push([current.name], u=True)
-            except git.exc.GitCommandError:
-                # If that fails too, try to manually set tracking
-                remote_branch = origin.refs[current.name]
-                current.set_tracking_branch(remote_branch)
-                origin.push()
-                
-        except Exception as e:
-            raise Exception(f"Failed to push commits: {str(e)}")
+            with metrics.timer('push_seconds'):
+                self._pusher.push()
+        except PushError as e:
+            raise PushError(e.kind, f"Failed to push commits: {str(e)}")
 
     def get_stats(self, days: int = 30) -> Dict[str, Any]:
-        """Get commit statistics for the specified number of days."""
-        try:
-            current = self.repo.active_branch
-            commits = list(self.repo.iter_commits(current.name, max_count=100))
-            recent_commits = [c for c in commits if (datetime.now() - datetime.fromtimestamp(c.committed_date)).days <= days]
-            
-            active_days = set(datetime.fromtimestamp(c.committed_date).date() for c in recent_commits)
-            
+        """Get commit statistics for the specified number of days.
+
+        Answers come from the repository's commit index in the config
+        directory, which is first refreshed with any new commits. If the
+        index can't be used, a warning is shown and history is scanned directly.
+        """
+        if not self.repo.head.is_valid():
+            # No commits yet
             return {
-                'total_commits': len(recent_commits),
-                'days_active': len(active_days),
-                'average_commits_per_day': round(len(recent_commits) / days, 2) if days > 0 else 0,
-                'messages': [c.message.strip() for c in recent_commits[:10]],
-                'last_commit': datetime.fromtimestamp(commits[0].committed_date).isoformat() if commits else None
+                'total_commits': 0,
+                'days_active': 0,
+                'average_commits_per_day': 0,
+                'messages': [],
+                'last_commit': None
             }
+        try:
+            index = CommitIndex(self.repo, self.config.config_dir / 'index')
+            try:
+                index.refresh()
+                return index.stats(days)
+            finally:
+                index.close()
+        except (sqlite3.Error, OSError, git.GitCommandError) as e:
+            console.print(f"[yellow]Commit index unavailable ({e}); scanning history instead.[/yellow]")
+        try:
+            return scan_history(self.repo, days)
         except Exception as e:
             console.print(f"[red]Error getting stats: {str(e)}[/red]")
             return {
@@ -139,3 +376,62 @@ class GitHubAutoCommit:
                 'messages': [],
                 'last_commit': None
             }
+
+
+def scan_history(repo: git.Repo, days: int, rev: str = 'HEAD') -> Dict[str, Any]:
+    """Compute commit statistics for the last ``days`` days of ``rev``.
+
+    The window is the same as :meth:`CommitIndex.stats` uses: today and the
+    ``days`` calendar days before it, counting every ancestor committed in
+    it. Where git supports it the window is filtered by ``git log
+    --since-as-filter``, and only the commit time and subject of each commit
+    are read from a streamed compact log, so there is no cap on the number
+    of commits and memory does not grow with history length.
+    """
+    return scan_history_days(repo, days, rev)[0]
+
+
+def scan_history_days(repo: git.Repo, days: int, rev: str = 'HEAD'):
+    """Like :func:`scan_history`, but return ``(stats, active_days)``.
+
+    ``active_days`` is the set of local dates with commits, for callers that
+    combine several repositories' active days.
+    """
+    since = window_start(days)
+    # Plain --since stops at the first run of older commits, missing newer ones behind them
+    window = [f'--since-as-filter={since}'] if repo.git.version_info >= (2, 37) else []
+    
+    total = 0
+    active_days = set()
+    # Local-day bounds of the last date seen; history is mostly date-ordered,
+    # so most commits fall in the same day as the previous one
+    day_start = day_end = 0
+    proc = repo.git.log(rev, *window, '--format=%ct', as_process=True)
+    try:
+        for line in proc.stdout:
+            committed = int(line)
+            if committed < since:
+                continue
+            total += 1
+            if not day_start <= committed < day_end:
+                day = datetime.fromtimestamp(committed).date()
+                active_days.add(day)
+                day_start = int(datetime.combine(day, datetime.min.time()).timestamp())
+                day_end = int((datetime.combine(day, datetime.min.time()) + timedelta(days=1)).timestamp())
+    finally:
+        proc.stdout.close()
+        proc.wait()
+    
+    # Like the index: the newest commits in log order, those in the window listed
+    newest = [line.split('\t', 1) for line in
+              repo.git.log(rev, f'-{RECENT_MESSAGES}', '--format=%ct%x09%s').splitlines()]
+    messages = [subject for committed, subject in newest if int(committed) >= since]
+    last_commit = int(newest[0][0]) if newest else None
+    
+    return {
+        'total_commits': total,
+        'days_active': len(active_days),
+        'average_commits_per_day': round(total / days, 2) if days > 0 else 0,
+        'messages': messages,
+        'last_commit': datetime.fromtimestamp(last_commit).isoformat() if last_commit else None
+    }, active_days
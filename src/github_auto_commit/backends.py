@@ -0,0 +1,295 @@
+"""Commit backends for GitHub Auto Commit."""
+
+import os
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+from subprocess import PIPE
+from typing import Iterable, List, Optional, Tuple
+
+import git
+from git.objects.fun import tree_entries_from_data, tree_to_stream
+from gitdb.base import IStream
+from gitdb.db import LooseObjectDB
+from gitdb.util import bin_to_hex, hex_to_bin
+
+from .metrics import metrics
+
+TIMESTAMP_FILE = '.timestamp'
+FILE_MODE = 0o100644
+TREE_MODE = 0o040000
+
+# A planned commit: (message, timestamp file content, unix time)
+PlannedCommit = Tuple[str, str, int]
+
+
+def local_offset(when: int) -> int:
+    """Return the local UTC offset for ``when`` in seconds west of UTC, as git stores it."""
+    if time.daylight and time.localtime(when).tm_isdst > 0:
+        return time.altzone
+    return time.timezone
+
+
+def git_date(when: int) -> str:
+    """Format ``when`` in git's internal ``<seconds> <+hhmm>`` date format."""
+    offset = -local_offset(when)
+    sign = '+' if offset >= 0 else '-'
+    hours, minutes = divmod(abs(offset) // 60, 60)
+    return f"{when} {sign}{hours:02d}{minutes:02d}"
+
+
+class IndexBackend:
+    """Commit by writing the timestamp file and going through the index."""
+
+    name = 'index'
+
+    def __init__(self, repo: git.Repo, repo_dir: Path):
+        """Initialize with the repository to commit to."""
+        self.repo = repo
+        self.repo_dir = repo_dir
+
+    def commit(self, message: str, content: str, when: Optional[int] = None) -> str:
+        """Write ``content`` to the timestamp file, commit it and return the new SHA."""
+        timestamp_file = self.repo_dir / TIMESTAMP_FILE
+
+        # Create or update timestamp file
+        with metrics.timer('commit_phase_seconds', backend=self.name, phase='write_file'):
+            with open(timestamp_file, 'w') as f:
+                f.write(content)
+
+        # Stage and commit
+        date = git_date(when) if when is not None else None
+        with metrics.timer('commit_phase_seconds', backend=self.name, phase='index_add'):
+            self.repo.index.add([str(timestamp_file)])
+        with metrics.timer('commit_phase_seconds', backend=self.name, phase='index_commit'):
+            return self.repo.index.commit(message, author_date=date, commit_date=date).hexsha
+
+    def commit_many(self, plan: Iterable[PlannedCommit]) -> List[str]:
+        """Make one commit per planned entry and return their SHAs in order."""
+        return [self.commit(message, content, when) for message, content, when in plan]
+
+
+class ObjectBackend:
+    """Commit by writing objects straight into the object database.
+
+    The blob, tree and commit objects are written as loose objects and the
+    current branch ref is advanced to the new commit. The working tree and
+    index are never touched, so the checked-out copy of the timestamp file is
+    left as it was; ``git reset`` brings both back in sync with the branch.
+    """
+
+    name = 'object'
+
+    def __init__(self, repo: git.Repo, repo_dir: Path):
+        """Initialize with the repository to commit to."""
+        self.repo = repo
+        self.repo_dir = repo_dir
+        self.odb = LooseObjectDB(os.path.join(repo.common_dir, 'objects'))
+        reader = repo.config_reader()
+        self.author = git.Actor.author(reader)
+        self.committer = git.Actor.committer(reader)
+        self.encoding = reader.get_value('i18n', 'commitencoding', git.Commit.default_encoding)
+        self._tip: Optional[bytes] = None
+        self._entries: List[Tuple[bytes, int, str]] = []
+        self._resolve_ref()
+
+    def _resolve_ref(self) -> None:
+        """Point at the branch HEAD names now; a long-lived backend outlives checkouts."""
+        self.ref_path = 'HEAD' if self.repo.head.is_detached else self.repo.head.ref.path
+        ref_dir = self.repo.git_dir if self.ref_path == 'HEAD' else self.repo.common_dir
+        self.ref_file = Path(ref_dir, self.ref_path)
+        self.ref_logs = {Path(ref_dir, 'logs', self.ref_path), Path(self.repo.git_dir, 'logs', 'HEAD')}
+
+    def _store(self, type_: bytes, data: bytes) -> bytes:
+        """Store raw object data and return its binary SHA."""
+        return self.odb.store(IStream(type_, len(data), BytesIO(data))).binsha
+
+    def _read_tip(self) -> Optional[bytes]:
+        """Return the binary SHA the branch points to, or None for an unborn branch."""
+        try:
+            return hex_to_bin(self.ref_file.read_text().strip())
+        except (FileNotFoundError, ValueError):
+            # Packed or symbolic ref; let GitPython resolve it
+            if not self.repo.head.is_valid():
+                return None
+            return self.repo.head.commit.binsha
+
+    def _parent(self) -> Optional[bytes]:
+        """Return the branch tip, reloading tree entries if it moved under us."""
+        tip = self._read_tip()
+        if tip is None:
+            self._entries = []
+        elif tip != self._tip:
+            tree_sha = self.repo.commit(bin_to_hex(tip).decode()).tree.binsha
+            self._entries = tree_entries_from_data(self.repo.odb.stream(tree_sha).read())
+        self._tip = tip
+        return tip
+
+    def _advance_ref(self, old: Optional[bytes], new: bytes, message: str) -> None:
+        """Move the branch from ``old`` to ``new`` and record the update in the reflogs.
+
+        Like ``git update-ref <ref> <new> <old>``: the ref is locked by
+        creating ``<ref>.lock`` exclusively, and the update fails if the
+        branch no longer points at ``old``.
+        """
+        self.ref_file.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = self.ref_file.with_name(self.ref_file.name + '.lock')
+        try:
+            fd = os.open(lock_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            raise Exception(f"Unable to lock {self.ref_path}: {lock_file} exists. Another git "
+                            "process seems to be running in this repository; if not, remove the file.")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                current = self._read_tip()
+                if current != old:
+                    found = bin_to_hex(current).decode() if current else "no commit"
+                    raise Exception(f"{self.ref_path} moved to {found} while committing; "
+                                    "another process updated the branch.")
+                f.write(bin_to_hex(new).decode() + '\n')
+
+            summary = message.splitlines()[0] if message else ''
+            logmsg = f"commit: {summary}" if old else f"commit (initial): {summary}"
+            for log_file in self.ref_logs:
+                git.RefLog.append_entry(self.committer, log_file,
+                                        old or git.Commit.NULL_BIN_SHA, new, logmsg)
+            os.replace(lock_file, self.ref_file)
+        except BaseException:
+            lock_file.unlink()
+            raise
+
+    def commit(self, message: str, content: str, when: Optional[int] = None) -> str:
+        """Commit ``content`` as the timestamp file and return the new SHA."""
+        with metrics.timer('commit_phase_seconds', backend=self.name, phase='read_tip'):
+            self._resolve_ref()
+            parent = self._parent()
+        with metrics.timer('commit_phase_seconds', backend=self.name, phase='write_objects'):
+            commit_sha = self._write_objects(parent, message, content, when)
+        with metrics.timer('commit_phase_seconds', backend=self.name, phase='update_ref'):
+            self._advance_ref(parent, commit_sha, message)
+        self._tip = commit_sha
+        return bin_to_hex(commit_sha).decode()
+
+    def _write_objects(self, parent: Optional[bytes], message: str, content: str,
+                       when: Optional[int]) -> bytes:
+        """Store the blob, tree and commit objects and return the commit's binary SHA."""
+        blob_sha = self._store(git.Blob.type, content.encode('utf-8'))
+
+        entries = [e for e in self._entries if e[2] != TIMESTAMP_FILE]
+        entries.append((blob_sha, FILE_MODE, TIMESTAMP_FILE))
+        # Git orders tree entries as if directory names had a trailing slash
+        entries.sort(key=lambda e: e[2] + '/' if e[1] == TREE_MODE else e[2])
+        stream = BytesIO()
+        tree_to_stream(entries, stream.write)
+        tree_sha = self._store(git.Tree.type, stream.getvalue())
+
+        when = int(time.time()) if when is None else when
+        offset = local_offset(when)
+        parents = [git.Commit(self.repo, parent)] if parent is not None else []
+        new_commit = git.Commit(self.repo, git.Commit.NULL_BIN_SHA, git.Tree(self.repo, tree_sha),
+                                self.author, when, offset, self.committer, when, offset,
+                                message, parents, self.encoding)
+        stream = BytesIO()
+        new_commit._serialize(stream)
+        self._entries = entries
+        return self._store(git.Commit.type, stream.getvalue())
+
+    def commit_many(self, plan: Iterable[PlannedCommit]) -> List[str]:
+        """Make one commit per planned entry and return their SHAs in order."""
+        return [self.commit(message, content, when) for message, content, when in plan]
+
+
+class FastImportBackend:
+    """Commit a whole planned sequence through a single ``git fast-import`` process.
+
+    The branch is updated once, when the import finishes. Like the object
+    backend, the working tree and index are left untouched. Given the same
+    plan, the commits are byte-for-byte identical to those the index and
+    object backends produce.
+    """
+
+    name = 'fast-import'
+    batch = True
+
+    def __init__(self, repo: git.Repo, repo_dir: Path):
+        """Initialize with the repository to commit to."""
+        self.repo = repo
+        self.repo_dir = repo_dir
+        reader = repo.config_reader()
+        self.author = git.Actor.author(reader)
+        self.committer = git.Actor.committer(reader)
+        self._resolve_ref()
+
+    def _resolve_ref(self) -> None:
+        """Point at the branch HEAD names now; a long-lived backend outlives checkouts."""
+        if self.repo.head.is_detached:
+            raise Exception("The fast-import backend needs a checked-out branch, not a detached HEAD.")
+        self.ref_path = self.repo.head.ref.path
+
+    @staticmethod
+    def _data(text: str) -> bytes:
+        """Encode ``text`` as a fast-import ``data`` command."""
+        raw = text.encode('utf-8')
+        return b'data %d\n%s\n' % (len(raw), raw)
+
+    def _stream(self, plan: Iterable[PlannedCommit], parent: Optional[str]):
+        """Yield the fast-import command stream for ``plan``."""
+        ref = self.ref_path.encode()
+        for mark, (message, content, when) in enumerate(plan, 1):
+            date = git_date(when).encode()
+            yield b'commit %s\nmark :%d\n' % (ref, mark)
+            yield b'author %s <%s> %s\n' % (self.author.name.encode('utf-8'),
+                                            self.author.email.encode('utf-8'), date)
+            yield b'committer %s <%s> %s\n' % (self.committer.name.encode('utf-8'),
+                                               self.committer.email.encode('utf-8'), date)
+            yield self._data(message)
+            if mark == 1 and parent:
+                yield b'from %s\n' % parent.encode()
+            yield b'M %o inline %s\n' % (FILE_MODE, TIMESTAMP_FILE.encode())
+            yield self._data(content)
+            yield b'\n'
+        yield b'done\n'
+
+    def commit(self, message: str, content: str, when: Optional[int] = None) -> str:
+        """Commit a single entry; prefer :meth:`commit_many` for whole runs."""
+        when = int(time.time()) if when is None else when
+        return self.commit_many([(message, content, when)])[-1]
+
+    def commit_many(self, plan: Iterable[PlannedCommit]) -> List[str]:
+        """Import every planned commit in one process and return their SHAs in order."""
+        self._resolve_ref()
+        parent = self.repo.head.commit.hexsha if self.repo.head.is_valid() else None
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                metrics.timer('commit_phase_seconds', backend=self.name, phase='fast_import'):
+            marks_file = Path(temp_dir) / 'marks'
+            proc = self.repo.git.fast_import('--quiet', '--done', f'--export-marks={marks_file}',
+                                             as_process=True, istream=PIPE)
+            try:
+                for chunk in self._stream(plan, parent):
+                    proc.stdin.write(chunk)
+            finally:
+                proc.stdin.close()
+            proc.wait()
+
+            marks = {}
+            for line in marks_file.read_text().splitlines():
+                mark, sha = line.split()
+                marks[int(mark[1:])] = sha
+        return [marks[mark] for mark in sorted(marks)]
+
+
+BACKENDS = {
+    IndexBackend.name: IndexBackend,
+    ObjectBackend.name: ObjectBackend,
+    FastImportBackend.name: FastImportBackend,
+}
+
+
+def get_backend(name: str, repo: git.Repo, repo_dir: Path):
+    """Create the commit backend registered under ``name``."""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown commit backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    return backend_class(repo, repo_dir)
@@ -1,31 +1,27 @@
-"""Command-line interface for GitHub Auto Commit."""
+"""Command-line interface for GitHub Auto Commit.
+
+Run without a command for the interactive menu, or with a subcommand and
+flags to run headless (e.g. from cron). The command implementations are
+imported by the subcommand that runs them; questionary and pyfiglet are
+only imported for the interactive menu, and GitPython only by commands
+that touch a repository.
+"""
 
-import os
 import sys
+from pathlib import Path
+
 import click
-import questionary
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-import pyfiglet
 
 from . import __version__
-from .config import Config
-from .auto_commit import GitHubAutoCommit
-from .commands import (
-    setup_command,
-    quick_commit_command,
-    scheduled_commit_command,
-    bulk_commit_command,
-    customize_messages,
-    stats_command,
-    show_help
-)
 
 console = Console()
 
 def print_banner():
     """Print the application banner."""
+    import pyfiglet
+    from rich.panel import Panel
+
     ascii_art = pyfiglet.figlet_format("GitHub Auto-Commit")
     console.print(Panel(
         f"[bold green]{ascii_art}[/bold green]\n"
@@ -37,10 +33,13 @@ def print_banner():
 
 def create_main_menu():
     """Create the main menu table."""
+    from rich.panel import Panel
+    from rich.table import Table
+
     table = Table(show_header=False, box=None)
     table.add_column("Command", style="cyan")
     table.add_column("Description", style="white")
-    
+
     table.add_row("🔧 setup", "Configure GitHub credentials")
     table.add_row("🚀 quick-commit", "Make immediate contributions")
     table.add_row("⏰ scheduled", "Schedule automated commits")
@@ -49,15 +48,18 @@ def create_main_menu():
     table.add_row("📊 stats", "View contribution statistics")
     table.add_row("❓ help", "Show detailed help")
     table.add_row("🚪 exit", "Exit the application")
-    
+
     return Panel(table, title="Available Commands", border_style="blue")
 
 def main_loop():
     """Main application loop."""
+    import questionary
+    from . import commands
+
     while True:
         print_banner()
         console.print(create_main_menu())
-        
+
         choice = questionary.select(
             "What would you like to do?",
             choices=[
@@ -71,42 +73,298 @@ def main_loop():
                 "🚪 exit"
             ],
         ).ask()
-        
+
         if choice == "🚪 exit":
             console.print("\n[yellow]Thanks for using GitHub Auto-Commit! 👋[/yellow]")
             sys.exit(0)
-        
+
         elif choice == "🔧 setup":
-            setup_command()
-        
+            commands.setup_command()
+
         elif choice == "🚀 quick-commit":
-            quick_commit_command()
-            
+            commands.quick_commit_command()
+
         elif choice == "⏰ scheduled":
-            scheduled_commit_command()
-            
+            commands.scheduled_commit_command()
+
         elif choice == "📦 bulk":
-            bulk_commit_command()
-        
+            commands.bulk_commit_command()
+
         elif choice == "✏️  messages":
-            customize_messages()
-        
+            commands.customize_messages()
+
         elif choice == "📊 stats":
-            stats_command()
-            
+            commands.stats_command()
+
         elif choice == "❓ help":
-            show_help()
-        
+            commands.show_help()
+
         input("\nPress Enter to continue...")
         console.clear()
 
-def main():
-    """Main entry point for the CLI."""
-    try:
+class _Group(click.Group):
+    """Click group that reports errors the way the interactive menu always has."""
+
+    def invoke(self, ctx):
+        try:
+            return super().invoke(ctx)
+        except (click.ClickException, click.exceptions.Exit, click.Abort):
+            raise
+        except KeyboardInterrupt:
+            console.print("\n[yellow]Thanks for using GitHub Auto-Commit! 👋[/yellow]")
+            sys.exit(0)
+        except Exception as e:
+            console.print(f"\n[red]Error: {str(e)}[/red]")
+            sys.exit(1)
+
+def _write_metrics():
+    """Export the metrics recorded during this run."""
+    from .metrics import default_dir, metrics
+
+    if metrics:
+        json_path, prom_path = metrics.write(default_dir())
+        console.print(f"[cyan]Metrics written to {json_path} and {prom_path}[/cyan]")
+
+def _start_profile():
+    """Profile the rest of the run with cProfile; return a callback that saves the results."""
+    import cProfile
+    import pstats
+    import time
+
+    from .metrics import default_dir
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    def save():
+        profiler.disable()
+        directory = default_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / time.strftime('profile-%Y%m%d-%H%M%S.prof')
+        profiler.dump_stats(str(path))
+        with open(path.with_suffix('.txt'), 'w') as f:
+            pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats(40)
+        console.print(f"[cyan]Profile written to {path} (summary in {path.with_suffix('.txt').name})[/cyan]")
+
+    return save
+
+@click.group(cls=_Group, invoke_without_command=True)
+@click.version_option(__version__)
+@click.option('--metrics', 'export_metrics', is_flag=True,
+              help='Write phase timings to ~/.github_auto_commit/metrics as JSON and Prometheus text.')
+@click.option('--profile', is_flag=True,
+              help='Run under cProfile and save the profile to ~/.github_auto_commit/metrics.')
+@click.pass_context
+def main(ctx, export_metrics, profile):
+    """Automate GitHub contributions.
+
+    Run without a command for the interactive menu.
+    """
+    # Close callbacks run in reverse order: stop the profiler before exporting metrics
+    if export_metrics:
+        ctx.call_on_close(_write_metrics)
+    if profile:
+        ctx.call_on_close(_start_profile())
+    if ctx.invoked_subcommand is None:
         main_loop()
-    except KeyboardInterrupt:
-        console.print("\n[yellow]Thanks for using GitHub Auto-Commit! 👋[/yellow]")
-        sys.exit(0)
-    except Exception as e:
-        console.print(f"\n[red]Error: {str(e)}[/red]")
+
+@main.command()
+@click.option('--username', help='GitHub username.')
+@click.option('--token', help='GitHub personal access token.')
+def setup(username, token):
+    """Configure GitHub credentials."""
+    from . import commands
+    commands.setup_command(username, token)
+
+@main.command()
+@click.option('-n', '--count', type=click.IntRange(min=1), help='Commits to make.')
+@click.option('-m', '--message', help='Commit message (default: random from your messages).')
+@click.option('--delay', type=click.IntRange(min=0), default=0, help='Seconds between commits.')
+@click.option('--push-every', type=click.IntRange(min=0),
+              help='Push after this many commits (0 = once at the end).')
+@click.option('--dry-run', is_flag=True, help='Show what would be done without committing.')
+@click.option('--repo', type=click.Path(file_okay=False, path_type=Path),
+              help='Repository to commit to (default: current directory).')
+@click.option('--all-under', type=click.Path(exists=True, file_okay=False, path_type=Path),
+              help='Commit to every repository under this directory.')
+@click.option('--backend', type=click.Choice(['index', 'object', 'fast-import']),
+              help='How commits are written.')
+@click.option('--resume', is_flag=True,
+              help='Finish the interrupted run in this repository (with its count and options).')
+@click.option('--simulate', is_flag=True,
+              help='Time a sample of the commits on a throwaway copy and project the whole run.')
+@click.option('--sample', type=click.IntRange(min=1),
+              help='Commits the simulation makes (default: 100).')
+@click.option('--push-latency', type=click.FloatRange(min=0), default=0.0,
+              help='Seconds of network time the simulation adds to each push.')
+def commit(count, message, delay, push_every, dry_run, repo, all_under, backend, resume,
+           simulate, sample, push_latency):
+    """Make commits now."""
+    if count is None and not resume:
+        raise click.UsageError("Missing option '-n' / '--count'.")
+    from . import commands
+    commands.quick_commit_command(count=count, delay=delay, message=message, push_every=push_every,
+                                  dry_run=dry_run, repo=repo, all_under=all_under, backend=backend,
+                                  resume=resume, simulate=simulate, sample=sample,
+                                  push_latency=push_latency)
+
+@main.group()
+def schedule():
+    """Manage scheduled commits."""
+
+@schedule.command('add')
+@click.argument('cron')
+@click.option('-n', '--count', type=click.IntRange(min=1), default=1, help='Commits per run.')
+@click.option('--repo', type=click.Path(exists=True, file_okay=False, path_type=Path),
+              help='Repository to commit to (default: current directory).')
+@click.option('--start/--no-start', default=False, help='Run the scheduler in the foreground after adding.')
+def schedule_add(cron, count, repo, start):
+    """Schedule COUNT commits whenever the cron expression CRON matches."""
+    from . import commands
+    commands.scheduled_commit_command(cron=cron, count=count, repo=repo, start=start)
+
+@schedule.command('list')
+def schedule_list():
+    """Show scheduled jobs."""
+    from . import commands
+    commands.list_jobs_command()
+
+@schedule.command('remove')
+@click.argument('job_id')
+def schedule_remove(job_id):
+    """Remove the scheduled job JOB_ID."""
+    from . import commands
+    commands.remove_job_command(job_id)
+
+@schedule.command('run')
+def schedule_run():
+    """Run the scheduler in the foreground."""
+    from . import commands
+    commands.run_scheduler_command()
+
+@main.command()
+@click.option('-n', '--total', type=click.IntRange(min=1), required=True, help='Total commits.')
+@click.option('--days', type=click.IntRange(min=1), default=7, show_default=True,
+              help='Days to spread them over.')
+@click.option('--pattern', type=click.Choice(['Even', 'Random', 'Front-loaded', 'Back-loaded']),
+              default='Even', show_default=True, help='Distribution over the days.')
+@click.option('--push-every', type=click.IntRange(min=0),
+              help='Push after this many commits (0 = once per run).')
+@click.option('--dry-run', is_flag=True, help='Only show the plan.')
+def bulk(total, days, pattern, push_every, dry_run):
+    """Spread commits over the coming days."""
+    from . import commands
+    commands.bulk_commit_command(total=total, days=days, pattern=pattern,
+                                 push_every=push_every, dry_run=dry_run)
+
+@main.command()
+@click.option('--add', 'add', multiple=True, help='Add a message (repeatable).')
+@click.option('--weight', type=click.FloatRange(min=0), default=1.0, show_default=True,
+              help='Weight of the messages added with --add.')
+@click.option('--import', 'import_file', type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              help='Add every line of a file (optionally "WEIGHT<TAB>MESSAGE").')
+@click.option('--remove', 'remove', type=int, multiple=True, help='Remove message number N (repeatable).')
+@click.option('--compact', is_flag=True, help='Reclaim space left by removed and edited messages.')
+def messages(add, weight, import_file, remove, compact):
+    """List or change commit messages."""
+    from . import commands
+    commands.customize_messages(add=add, remove=remove, interactive=False, weight=weight,
+                                import_file=import_file, compact=compact)
+
+@main.command()
+@click.option('--days', type=click.IntRange(min=1), default=30, show_default=True,
+              help='Days to analyze.')
+@click.option('--all-under', type=click.Path(exists=True, file_okay=False, path_type=Path),
+              help='Combine every repository under this directory.')
+@click.option('--github', is_flag=True,
+              help='Count commits across your GitHub repositories through the API.')
+@click.option('--backend', type=click.Choice(['rest', 'graphql']),
+              help='GitHub API to use with --github (default: the stats_backend setting, rest).')
+def stats(days, all_under, github, backend):
+    """Show contribution statistics."""
+    if backend and not github:
+        raise click.UsageError("--backend only applies to --github.")
+    if github and all_under:
+        raise click.UsageError("--github and --all-under can't be combined.")
+    from . import commands
+    commands.stats_command(days=days, all_under=all_under, github=github, backend=backend)
+
+@main.command()
+@click.option('--days', type=click.IntRange(min=1), default=30, show_default=True,
+              help='Days to report on.')
+@click.option('--repo', type=click.Path(exists=True, file_okay=False, path_type=Path),
+              help='Only this repository (default: every repository the tool committed to).')
+def journal(days, repo):
+    """Show what the tool did, from its run journals."""
+    from . import commands
+    commands.journal_command(days=days, repo=repo)
+
+@main.group()
+def daemon():
+    """Run or talk to the resident daemon.
+
+    The client subcommands import nothing beyond the socket client, so a
+    request costs little more than a socket round trip.
+    """
+
+@daemon.command('start')
+def daemon_start():
+    """Run the daemon in the foreground (also runs scheduled jobs)."""
+    from . import commands
+    commands.daemon_command()
+
+@daemon.command('stop')
+def daemon_stop():
+    """Stop the running daemon."""
+    from .daemon import DaemonClient
+    DaemonClient().request('shutdown')
+    console.print("[green]✓ Daemon stopped[/green]")
+
+@daemon.command('status')
+def daemon_status():
+    """Show whether the daemon is running."""
+    from .daemon import DaemonClient, DaemonNotRunning
+    try:
+        status = DaemonClient(timeout=5).request('ping')
+    except DaemonNotRunning:
+        console.print("[yellow]Daemon is not running[/yellow]")
         sys.exit(1)
+    console.print(f"[green]Daemon running[/green] (pid {status['pid']}, up {status['uptime']:.0f}s, "
+                  f"{status['requests']} requests, {status['repositories']} open repositories, "
+                  f"{status['jobs']} scheduled jobs)")
+
+@daemon.command('metrics')
+def daemon_metrics():
+    """Export the daemon's metrics since it started."""
+    from .daemon import DaemonClient
+    paths = DaemonClient().request('metrics', write=True)
+    console.print(f"[cyan]Metrics written to {paths['json']} and {paths['prometheus']}[/cyan]")
+
+@daemon.command('commit')
+@click.option('-n', '--count', type=click.IntRange(min=1), required=True, help='Commits to make.')
+@click.option('-m', '--message', help='Commit message (default: random from your messages).')
+@click.option('--push-every', type=click.IntRange(min=0),
+              help='Push after this many commits (0 = once at the end).')
+@click.option('--repo', type=click.Path(exists=True, file_okay=False, path_type=Path),
+              help='Repository to commit to (default: current directory).')
+@click.option('--backend', type=click.Choice(['index', 'object', 'fast-import']),
+              help='How commits are written.')
+def daemon_commit(count, message, push_every, repo, backend):
+    """Make commits through the daemon."""
+    from .daemon import DaemonClient
+    result = DaemonClient().request('commit', repo=str((repo or Path.cwd()).resolve()), count=count,
+                                    message=message, push_every=push_every, backend=backend)
+    console.print(f"[green]✓ {result['commits']} commit(s), {result['pushes']} push(es)[/green]")
+
+@daemon.command('stats')
+@click.option('--days', type=click.IntRange(min=1), default=30, show_default=True,
+              help='Days to analyze.')
+@click.option('--repo', type=click.Path(exists=True, file_okay=False, path_type=Path),
+              help='Repository to analyze (default: current directory).')
+def daemon_stats(days, repo):
+    """Show this repository's statistics through the daemon."""
+    from .daemon import DaemonClient
+    stats = DaemonClient().request('stats', repo=str((repo or Path.cwd()).resolve()), days=days)
+    console.print(f"Total Commits: {stats['total_commits']}")
+    console.print(f"Active Days: {stats['days_active']}")
+    console.print(f"Last Commit: {stats['last_commit'] or 'N/A'}")
@@ -1,166 +1,550 @@
-"""Command implementations for GitHub Auto Commit."""
+"""Command implementations for GitHub Auto Commit.
+
+Every command takes its inputs as arguments, which the CLI subcommands fill
+from flags. Called without them (as the interactive menu does), a command
+asks for each input with questionary. questionary and GitPython are slow to
+import, so they and the modules built on GitPython are imported inside the
+functions that use them.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Sequence
 
-import click
 from rich.console import Console
-import questionary
 from rich.table import Table
 from rich.panel import Panel
 
 from .config import Config
-from .auto_commit import GitHubAutoCommit
+from .planner import PATTERNS, CommitPlan, run_plan
+from .scheduler import Job, JobStore, Scheduler, notify_scheduler, parse_cron, run_job
 
 console = Console()
 
-@click.command()
-def setup_command():
+def _ask_push_every(config: Config) -> int:
+    """Ask how many commits to batch into each push."""
+    import questionary
+    push_every = questionary.text(
+        "Push every how many commits? (0 = once at the end, 1 = after every commit)",
+        default=str(config.get('push_every', 0)),
+        validate=lambda x: x.isdigit(),
+    ).ask()
+    return int(push_every)
+
+def _ask_scope() -> bool:
+    """Ask whether to work on this repository or all under a directory; True for all."""
+    import questionary
+    scope = questionary.select(
+        "Which repositories?",
+        choices=[
+            "This repository",
+            "All repositories under a directory"
+        ]
+    ).ask()
+    return scope == "All repositories under a directory"
+
+def _ask_directory() -> Path:
+    """Ask for a directory to scan for repositories."""
+    import questionary
+    root = questionary.path(
+        "Directory to scan:",
+        default=str(Path.cwd()),
+        only_directories=True,
+    ).ask()
+    return Path(root).expanduser()
+
+def setup_command(username: Optional[str] = None, token: Optional[str] = None):
     """Configure GitHub credentials."""
     config = Config()
     
-    console.print("\n[bold cyan]GitHub Configuration[/bold cyan]")
-    
-    username = questionary.text(
-        "Enter your GitHub username:",
-        validate=lambda x: len(x) > 0,
-    ).ask()
-    
-    token = questionary.password(
-        "Enter your GitHub Personal Access Token:",
-        validate=lambda x: len(x) > 0,
-    ).ask()
+    if username is None or token is None:
+        import questionary
+        console.print("\n[bold cyan]GitHub Configuration[/bold cyan]")
+        
+        if username is None:
+            username = questionary.text(
+                "Enter your GitHub username:",
+                validate=lambda x: len(x) > 0,
+            ).ask()
+        
+        if token is None:
+            token = questionary.password(
+                "Enter your GitHub Personal Access Token:",
+                validate=lambda x: len(x) > 0,
+            ).ask()
     
-    config.set("github_username", username)
-    config.set("github_token", token)
+    config.update(github_username=username, github_token=token)
     
     console.print("\n[green]✓ Configuration saved successfully![/green]")
 
-@click.command()
-def quick_commit_command():
-    """Make a quick commit."""
+def quick_commit_command(count: Optional[int] = None, delay: int = 0, message: Optional[str] = None,
+                         push_every: Optional[int] = None, dry_run: bool = False,
+                         repo: Optional[Path] = None, all_under: Optional[Path] = None,
+                         backend: Optional[str] = None, resume: bool = False,
+                         simulate: bool = False, sample: Optional[int] = None,
+                         push_latency: float = 0.0):
+    """Make a quick commit.
+
+    Without ``count`` every option is asked for interactively. ``all_under``
+    commits ``count`` times to every repository under that directory.
+    ``resume`` finishes the repository's interrupted run instead.
+    ``simulate`` makes ``sample`` of the commits on a throwaway copy and shows
+    what the whole run would take, leaving the repository alone.
+    """
     config = Config()
-    auto_commit = GitHubAutoCommit(config)
-    
-    count = questionary.text(
-        "How many commits would you like to make?",
-        validate=lambda x: x.isdigit() and int(x) > 0,
-    ).ask()
     
-    delay = questionary.text(
-        "Delay between commits (in seconds, 0 for no delay):",
-        default="0",
-        validate=lambda x: x.isdigit(),
-    ).ask()
+    if resume:
+        from .auto_commit import GitHubAutoCommit
+        auto_commit = GitHubAutoCommit(config, backend=backend, repo_dir=repo)
+        state = auto_commit.interrupted_run()
+        if state is None:
+            console.print("[yellow]No interrupted run to resume[/yellow]")
+            return
+        _resume_run(auto_commit, state, delay)
+        return
     
-    message = questionary.text(
-        "Custom commit message (press Enter for random):",
-    ).ask()
-    
-    dry_run = questionary.confirm(
-        "Would you like to do a dry run first?",
-        default=False,
-    ).ask()
+    if count is None:
+        import questionary
+        
+        if _ask_scope():
+            _multi_repo_commit(config, _ask_directory())
+            return
+        
+        from .auto_commit import GitHubAutoCommit
+        auto_commit = GitHubAutoCommit(config, backend=backend, repo_dir=repo)
+        try:
+            state = auto_commit.interrupted_run()
+        except Exception as e:
+            console.print(f"[yellow]Can't resume the last run: {str(e)}[/yellow]")
+            state = None
+        if state and questionary.confirm(
+            f"The last run stopped after {state.committed} of {state.count} commits "
+            f"({state.pushed} pushed). Resume it?",
+            default=True,
+        ).ask():
+            _resume_run(auto_commit, state)
+            return
+        
+        count = int(questionary.text(
+            "How many commits would you like to make?",
+            validate=lambda x: x.isdigit() and int(x) > 0,
+        ).ask())
+        
+        delay = int(questionary.text(
+            "Delay between commits (in seconds, 0 for no delay):",
+            default="0",
+            validate=lambda x: x.isdigit(),
+        ).ask())
+        
+        message = questionary.text(
+            "Custom commit message (press Enter for random):",
+        ).ask() or None
+        
+        push_every = _ask_push_every(config)
+        
+        if questionary.confirm(
+            "Simulate the run on a throwaway copy first?",
+            default=False,
+        ).ask():
+            _show_projection(_simulate(config, count, delay, push_every, backend, message, repo))
+            if not questionary.confirm("Go ahead with the real run?", default=True).ask():
+                return
+        
+        dry_run = questionary.confirm(
+            "Would you like to do a dry run first?",
+            default=False,
+        ).ask()
+    elif all_under is not None:
+        _multi_repo_commit(config, all_under, count, message, push_every, backend)
+        return
+    elif simulate:
+        _show_projection(_simulate(config, count, delay, push_every, backend, message, repo,
+                                   sample, push_latency))
+        return
     
+    from .auto_commit import GitHubAutoCommit
+    auto_commit = GitHubAutoCommit(config, backend=backend, repo_dir=repo)
     auto_commit.make_commits(
-        count=int(count),
-        delay=int(delay),
-        message=message if message else None,
+        count=count,
+        delay=delay,
+        message=message,
         dry_run=dry_run,
+        push_every=push_every,
     )
 
-@click.command()
-def scheduled_commit_command():
-    """Schedule automated commits."""
-    config = Config()
-    auto_commit = GitHubAutoCommit(config)
+def _simulate(config: Config, count: int, delay: int, push_every: Optional[int],
+              backend: Optional[str], message: Optional[str], repo: Optional[Path],
+              sample: Optional[int] = None, push_latency: float = 0.0):
+    """Run the simulation with a spinner and return its projection."""
+    from .simulate import SAMPLE_COMMITS, simulate
+    sample = sample or SAMPLE_COMMITS
+    with console.status(f"[cyan]Simulating {min(count, sample)} of {count} commits...[/cyan]"):
+        return simulate(config, count, delay=delay, push_every=push_every, backend=backend,
+                        message=message, repo_dir=repo, sample=sample, push_latency=push_latency)
+
+def _format_duration(seconds: float) -> str:
+    """Format ``seconds`` as e.g. ``1h 02m 05s``."""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, secs = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m {secs:02d}s" if hours else f"{minutes}m {secs:02d}s"
+
+def _format_size(size: float) -> str:
+    """Format a byte count in KiB, MiB or GiB."""
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+def _show_projection(projection):
+    """Show what a simulated run measured and projects for the full run."""
+    table = Table(title=f"Projected Run ({projection.count} commits, {projection.backend} backend)")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green")
+    table.add_row("Sampled Commits", str(projection.sampled))
+    table.add_row("Time per Commit", f"{projection.commit_seconds * 1000:.1f} ms")
+    table.add_row("Time per Push", f"{projection.push_seconds * 1000:.1f} ms "
+                                   f"+ {projection.push_seconds_per_commit * 1000:.2f} ms per commit")
+    table.add_row("Pushes", str(projection.pushes))
+    table.add_row("Duration", _format_duration(projection.seconds))
+    table.add_row("Repository Growth", f"{_format_size(projection.local_bytes)} "
+                                       f"({projection.objects_per_commit:.1f} objects per commit)")
+    table.add_row("Remote Growth", _format_size(projection.remote_bytes))
+    console.print(Panel(table, border_style="blue"))
+    console.print("[dim]Measured on a throwaway copy with a local remote; add network time "
+                  "with --push-latency. Loose objects shrink once git gc packs them.[/dim]")
+
+def _resume_run(auto_commit, state, delay: int = 0):
+    """Finish the interrupted run ``state``."""
+    console.print(f"[cyan]Resuming run: {state.committed}/{state.count} commits made, "
+                  f"{state.pushed} pushed[/cyan]")
+    auto_commit.make_commits(
+        count=state.remaining,
+        delay=delay,
+        message=state.message,
+        push_every=state.push_every,
+        resume=state,
+    )
+
+def _multi_repo_commit(config: Config, root: Path, count: Optional[int] = None,
+                       message: Optional[str] = None, push_every: Optional[int] = None,
+                       backend: Optional[str] = None):
+    """Make commits in every repository under ``root`` at once."""
+    from .executor import commit_to_repos
+    from .scanner import find_repos
     
-    frequency = questionary.select(
-        "Select commit frequency:",
-        choices=[
-            "Hourly",
-            "Daily",
-            "Weekly",
-            "Custom"
-        ]
-    ).ask()
+    repos = find_repos(root)
+    if not repos:
+        console.print(f"[yellow]No git repositories found under {root}.[/yellow]")
+        return
+    console.print(f"[cyan]Found {len(repos)} repositories under {root}[/cyan]")
+    
+    if count is None:
+        import questionary
+        count = int(questionary.text(
+            "How many commits per repository?",
+            validate=lambda x: x.isdigit() and int(x) > 0,
+        ).ask())
+        
+        message = questionary.text(
+            "Custom commit message (press Enter for random):",
+        ).ask() or None
+        
+        push_every = _ask_push_every(config)
+    
+    results = commit_to_repos(config, [(repo, count) for repo in repos],
+                              message=message, push_every=push_every, backend=backend)
     
-    if frequency == "Custom":
-        cron = questionary.text(
-            "Enter cron expression (e.g., '0 9 * * *' for daily at 9 AM):",
-            validate=lambda x: len(x) > 0
+    table = Table(title="Commits per Repository")
+    table.add_column("Repository", style="cyan")
+    table.add_column("Commits", style="green", justify="right")
+    table.add_column("Pushes", style="green", justify="right")
+    for path, result in sorted(results.items()):
+        if 'error' in result:
+            table.add_row(path, "-", "-")
+            console.print(f"[red]{path}: {result['error']}[/red]")
+        else:
+            table.add_row(path, str(result['commits']), str(result['pushes']))
+    console.print(Panel(table, border_style="blue"))
+
+def scheduled_commit_command(cron: Optional[str] = None, count: int = 1,
+                             repo: Optional[Path] = None, start: Optional[bool] = None):
+    """Schedule automated commits.
+
+    Without ``cron`` the frequency and count are asked for interactively.
+    ``start`` runs the scheduler in the foreground afterwards; when not
+    given it is asked, unless a running scheduler picked up the job.
+    """
+    config = Config()
+    repo = Path(repo or Path.cwd()).resolve()
+    
+    if cron is None:
+        import questionary
+        frequency = questionary.select(
+            "Select commit frequency:",
+            choices=[
+                "Hourly",
+                "Daily",
+                "Weekly",
+                "Custom"
+            ]
         ).ask()
-    else:
-        cron_map = {
-            "Hourly": "0 * * * *",
-            "Daily": "0 9 * * *",
-            "Weekly": "0 9 * * MON"
-        }
-        cron = cron_map[frequency]
-    
-    count = questionary.text(
-        "How many commits per run?",
-        default="1",
-        validate=lambda x: x.isdigit() and int(x) > 0
-    ).ask()
+        
+        if frequency == "Custom":
+            cron = questionary.text(
+                "Enter cron expression (e.g., '0 9 * * *' for daily at 9 AM):",
+                validate=lambda x: len(x) > 0
+            ).ask()
+        else:
+            cron_map = {
+                "Hourly": "0 * * * *",
+                "Daily": "0 9 * * *",
+                "Weekly": "0 9 * * MON"
+            }
+            cron = cron_map[frequency]
+        
+        count = int(questionary.text(
+            "How many commits per run?",
+            default="1",
+            validate=lambda x: x.isdigit() and int(x) > 0
+        ).ask())
+    
+    try:
+        parse_cron(cron)
+    except ValueError as e:
+        console.print(f"[red]{str(e)}[/red]")
+        return
+    
+    # Fail now, rather than at the first run, if the repository can't be committed to
+    from .auto_commit import GitHubAutoCommit
+    GitHubAutoCommit(config, repo_dir=repo)
     
-    console.print(f"\n[green]✓ Scheduled {count} commits {frequency.lower()}![/green]")
+    scheduler = Scheduler(JobStore(config.config_dir), run_job)
+    job = scheduler.add(Job(cron=cron, repo=str(repo), count=count))
+    
+    console.print(f"\n[green]✓ Scheduled {count} commit(s), job {job.id}[/green]")
     console.print(f"[cyan]Cron expression: {cron}[/cyan]")
+    console.print(f"[cyan]Next run: {datetime.fromtimestamp(job.next_run):%Y-%m-%d %H:%M}[/cyan]")
+    
+    if notify_scheduler(config.config_dir):
+        console.print("[green]✓ The running scheduler picked up the new job[/green]")
+        return
+    if start is None:
+        import questionary
+        start = questionary.confirm(
+            f"Start the scheduler now? ({len(scheduler.jobs)} job(s); Ctrl+C to stop)",
+            default=True,
+        ).ask()
+    if start:
+        _run_scheduler(scheduler)
+
+def _run_scheduler(scheduler: Scheduler):
+    """Run ``scheduler`` in the foreground until interrupted."""
+    console.print(f"[cyan]Scheduler running with {len(scheduler.jobs)} job(s); Ctrl+C to stop[/cyan]")
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+        console.print("\n[yellow]Scheduler stopped[/yellow]")
 
-@click.command()
-def bulk_commit_command():
-    """Make multiple commits in bulk."""
+def list_jobs_command():
+    """Show the scheduled jobs."""
     config = Config()
-    auto_commit = GitHubAutoCommit(config)
+    jobs = JobStore(config.config_dir).load()
     
-    total = questionary.text(
-        "Total number of commits:",
-        validate=lambda x: x.isdigit() and int(x) > 0
-    ).ask()
+    table = Table(title="Scheduled Jobs")
+    table.add_column("ID", style="cyan")
+    table.add_column("Cron", style="green")
+    table.add_column("Commits", justify="right")
+    table.add_column("Repository")
+    table.add_column("Next Run", style="yellow")
+    for job in sorted(jobs.values(), key=lambda job: job.next_run or 0):
+        next_run = f"{datetime.fromtimestamp(job.next_run):%Y-%m-%d %H:%M}" if job.next_run else "-"
+        table.add_row(job.id, job.cron, str(job.count), job.repo, next_run)
+    console.print(Panel(table, border_style="blue"))
+
+def remove_job_command(job_id: str):
+    """Remove a scheduled job."""
+    config = Config()
+    store = JobStore(config.config_dir)
+    with store.locked():
+        jobs = store.load()
+        if jobs.pop(job_id, None) is None:
+            raise Exception(f"No scheduled job with id {job_id}")
+        store.save(jobs)
+    notify_scheduler(config.config_dir)
+    console.print(f"[green]✓ Removed job {job_id}[/green]")
+
+def run_scheduler_command():
+    """Run the scheduler in the foreground."""
+    config = Config()
+    _run_scheduler(Scheduler(JobStore(config.config_dir), run_job))
+
+def daemon_command():
+    """Run the daemon in the foreground until stopped."""
+    from .daemon import Daemon
     
-    days = questionary.text(
-        "Spread over how many days?",
-        validate=lambda x: x.isdigit() and int(x) > 0
-    ).ask()
+    daemon = Daemon(Config())
+    console.print(f"[cyan]Daemon listening on {daemon.path} with {len(daemon.scheduler.jobs)} "
+                  "scheduled job(s); Ctrl+C to stop[/cyan]")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        daemon.stop()
+    console.print("\n[yellow]Daemon stopped[/yellow]")
+
+def bulk_commit_command(total: Optional[int] = None, days: int = 7, pattern: str = 'Even',
+                        push_every: Optional[int] = None, dry_run: bool = False):
+    """Make multiple commits in bulk.
+
+    Without ``total`` every option is asked for interactively. A
+    non-interactive dry run only prints the plan.
+    """
+    config = Config()
+    interactive = total is None
     
-    pattern = questionary.select(
-        "Distribution pattern:",
-        choices=[
-            "Even",
-            "Random",
-            "Front-loaded",
-            "Back-loaded"
-        ]
-    ).ask()
+    if interactive:
+        import questionary
+        total = int(questionary.text(
+            "Total number of commits:",
+            validate=lambda x: x.isdigit() and int(x) > 0
+        ).ask())
+        
+        days = int(questionary.text(
+            "Spread over how many days?",
+            validate=lambda x: x.isdigit() and int(x) > 0
+        ).ask())
+        
+        pattern = questionary.select(
+            "Distribution pattern:",
+            choices=list(PATTERNS)
+        ).ask()
+        
+        push_every = _ask_push_every(config)
+        
+        dry_run = questionary.confirm(
+            "Would you like to do a dry run first?",
+            default=True
+        ).ask()
     
-    dry_run = questionary.confirm(
-        "Would you like to do a dry run first?",
-        default=True
-    ).ask()
+    plan = CommitPlan(total, days, pattern)
     
     console.print(f"\n[green]✓ Bulk commit plan created![/green]")
     console.print(f"[cyan]• {total} commits over {days} days[/cyan]")
     console.print(f"[cyan]• {pattern} distribution[/cyan]")
+    if push_every:
+        console.print(f"[cyan]• Push every {push_every} commit(s)[/cyan]")
+    else:
+        console.print("[cyan]• Push once at the end of each run[/cyan]")
+    
+    if dry_run:
+        console.print(plan.histogram())
+        if not interactive or not questionary.confirm("Start executing this plan?", default=False).ask():
+            return
+    
+    from .auto_commit import GitHubAutoCommit
+    auto_commit = GitHubAutoCommit(config)
+    console.print("[cyan]Running the plan; keep this terminal open (Ctrl+C to stop).[/cyan]")
+    try:
+        result = run_plan(auto_commit, plan, push_every=push_every)
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Bulk commit plan stopped[/yellow]")
+        return
+    console.print(f"\n[green]✓ Bulk commit plan finished: {result['commits']} commits[/green]")
 
-@click.command()
-def customize_messages():
-    """Customize commit messages."""
-    config = Config()
+MESSAGES_SHOWN = 50
+
+def _open_messages(config: Config):
+    """Open the message store, seeded with the default messages if it is new."""
+    from .auto_commit import DEFAULT_MESSAGES
+    from .messages import MessageStore
+    return MessageStore.for_config(config, DEFAULT_MESSAGES)
+
+def _show_messages(store, limit: int = MESSAGES_SHOWN):
+    """Print up to ``limit`` commit messages as a numbered table."""
+    table = Table(title=f"Current Commit Messages ({len(store)})")
+    table.add_column("#", style="cyan")
+    table.add_column("Message", style="green")
+    table.add_column("Weight", style="yellow")
+    
+    for shown, (number, msg, weight) in enumerate(store):
+        if shown == limit:
+            table.add_row("…", f"{len(store) - limit} more", "")
+            break
+        table.add_row(str(number), msg, f"{weight:g}")
+    
+    console.print(Panel(table, border_style="blue"))
+
+def _read_corpus(path: Path):
+    """Yield ``(message, weight)`` from a file of one message per line, optionally ``weight<TAB>message``."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line.strip():
+                continue
+            weight, tab, message = line.partition('\t')
+            try:
+                yield (message, float(weight)) if tab else (line, 1.0)
+            except ValueError:
+                yield line, 1.0
+
+def _ask_message_number(store, prompt: str) -> int:
+    """Ask which message to change, by menu for a short list or by number for a long one."""
+    import questionary
+    if len(store) <= MESSAGES_SHOWN:
+        choice = questionary.select(
+            prompt,
+            choices=[f"{number}. {msg}" for number, msg, _ in store]
+        ).ask()
+        return int(choice.split('.')[0])
+    return int(questionary.text(
+        f"{prompt} (number)",
+        validate=lambda x: x.isdigit()
+    ).ask())
+
+def customize_messages(add: Sequence[str] = (), remove: Sequence[int] = (), interactive: bool = True,
+                       weight: float = 1.0, import_file: Optional[Path] = None, compact: bool = False):
+    """Customize commit messages.
+
+    ``add`` adds messages with ``weight``, ``import_file`` adds every line
+    of a file and ``remove`` deletes messages by number; ``compact``
+    reclaims the space left by removed and edited messages (renumbering
+    them). When none is given and ``interactive`` is set, an editing menu
+    is shown; otherwise the messages are just listed.
+    """
+    store = _open_messages(Config())
     
+    if add or remove or import_file or compact:
+        if remove:
+            store.remove_many(remove)
+        if add:
+            store.add_many((msg, weight) for msg in add)
+        if import_file:
+            added = store.add_many(_read_corpus(import_file))
+            console.print(f"[cyan]Imported {len(added)} messages from {import_file}[/cyan]")
+        if compact:
+            saved = store.compact()
+            console.print(f"[cyan]Compacted the message store ({saved} bytes freed)[/cyan]")
+        console.print("\n[green]✓ Commit messages updated![/green]")
+        _show_messages(store)
+        return
+    
+    if not interactive:
+        _show_messages(store)
+        return
+    
+    import questionary
     while True:
-        messages = config.get('commit_messages', [])
-        
-        table = Table(title="Current Commit Messages")
-        table.add_column("#", style="cyan")
-        table.add_column("Message", style="green")
-        
-        for i, msg in enumerate(messages, 1):
-            table.add_row(str(i), msg)
-        
-        console.print(Panel(table, border_style="blue"))
+        _show_messages(store)
         
         action = questionary.select(
             "Message Options:",
             choices=[
                 "➕ Add message",
                 "✏️  Edit message",
+                "⚖️  Change weight",
                 "❌ Remove message",
                 "🔙 Back"
             ]
@@ -174,44 +558,72 @@ def customize_messages():
                 "Enter new commit message:",
                 validate=lambda x: len(x) > 0
             ).ask()
-            messages.append(new_msg)
+            store.add(new_msg)
             
         elif action == "✏️  Edit message":
-            idx = questionary.select(
-                "Select message to edit:",
-                choices=[f"{i+1}. {msg}" for i, msg in enumerate(messages)]
-            ).ask()
-            idx = int(idx.split('.')[0]) - 1
+            number = _ask_message_number(store, "Select message to edit:")
             new_msg = questionary.text(
                 "Enter new message:",
-                default=messages[idx]
+                default=store.get(number)[0]
             ).ask()
-            messages[idx] = new_msg
+            store.edit(number, message=new_msg)
             
-        elif action == "❌ Remove message":
-            idx = questionary.select(
-                "Select message to remove:",
-                choices=[f"{i+1}. {msg}" for i, msg in enumerate(messages)]
+        elif action == "⚖️  Change weight":
+            number = _ask_message_number(store, "Select message to reweight:")
+            new_weight = questionary.text(
+                "Enter new weight (relative to 1 for a normal message):",
+                default=f"{store.get(number)[1]:g}",
+                validate=lambda x: x.replace('.', '', 1).isdigit()
             ).ask()
-            idx = int(idx.split('.')[0]) - 1
-            messages.pop(idx)
+            store.edit(number, weight=float(new_weight))
+            
+        elif action == "❌ Remove message":
+            number = _ask_message_number(store, "Select message to remove:")
+            store.remove(number)
         
-        config.set('commit_messages', messages)
         console.print("\n[green]✓ Commit messages updated![/green]")
 
-@click.command()
-def stats_command():
-    """Show contribution statistics."""
+def stats_command(days: Optional[int] = None, all_under: Optional[Path] = None,
+                  github: bool = False, backend: Optional[str] = None):
+    """Show contribution statistics.
+
+    Without ``days`` the scope and window are asked for interactively.
+    ``github`` counts commits across the user's GitHub repositories through
+    the API instead, with ``backend`` (``rest`` or ``graphql``; default: the
+    ``stats_backend`` config value).
+    """
     config = Config()
-    auto_commit = GitHubAutoCommit(config)
     
-    days = questionary.text(
-        "Number of days to analyze:",
-        default="30",
-        validate=lambda x: x.isdigit() and int(x) > 0,
-    ).ask()
+    if days is None:
+        import questionary
+        scope = questionary.select(
+            "Which statistics?",
+            choices=[
+                "This repository",
+                "All repositories under a directory",
+                "My GitHub account",
+            ]
+        ).ask()
+        if scope == "All repositories under a directory":
+            all_under = _ask_directory()
+        github = scope == "My GitHub account"
+        
+        days = int(questionary.text(
+            "Number of days to analyze:",
+            default="30",
+            validate=lambda x: x.isdigit() and int(x) > 0,
+        ).ask())
     
-    stats = auto_commit.get_stats(days=int(days))
+    if github:
+        _show_github_stats(config, days, backend)
+        return
+    if all_under is not None:
+        _show_multi_repo_stats(config, Path(all_under).expanduser(), days)
+        return
+    
+    from .auto_commit import GitHubAutoCommit
+    auto_commit = GitHubAutoCommit(config)
+    stats = auto_commit.get_stats(days=days)
     
     table = Table(title=f"Contribution Statistics (Last {days} days)")
     table.add_column("Metric", style="cyan")
@@ -223,7 +635,88 @@ def stats_command():
     
     console.print(Panel(table, border_style="blue"))
 
-@click.command()
+def _show_github_stats(config: Config, days: int, backend: Optional[str] = None):
+    """Show the user's contributions across their GitHub repositories."""
+    from .stats import ContributionStats
+    
+    username, token = config.get('github_username'), config.get('github_token')
+    if not username or not token:
+        raise Exception("GitHub credentials not configured. Please run setup first.")
+    backend = backend or config.get('stats_backend', 'rest')
+    ContributionStats(token, backend=backend).display_stats(username, days)
+
+def _show_multi_repo_stats(config: Config, root: Path, days: int):
+    """Scan every repository under ``root`` and show combined and per-repo stats."""
+    from .scanner import scan_repos
+    
+    with console.status(f"[cyan]Scanning repositories under {root}..."):
+        per_repo, combined = scan_repos(root, days, index_dir=config.config_dir / 'index')
+    
+    if not per_repo:
+        console.print(f"[yellow]No git repositories found under {root}.[/yellow]")
+        return
+    
+    summary = Table(title=f"Combined Statistics (Last {days} days)")
+    summary.add_column("Metric", style="cyan")
+    summary.add_column("Value", style="green")
+    summary.add_row("Repositories", str(combined['repositories']))
+    summary.add_row("Total Commits", str(combined['total_commits']))
+    summary.add_row("Active Days", str(combined['days_active']))
+    summary.add_row("Average Commits/Day", f"{combined['average_commits_per_day']:.2f}")
+    summary.add_row("Last Commit", combined['last_commit'] or "N/A")
+    console.print(Panel(summary, border_style="blue"))
+    
+    table = Table(title="Per-Repository Breakdown")
+    table.add_column("Repository", style="cyan")
+    table.add_column("Commits", style="green", justify="right")
+    table.add_column("Active Days", style="green", justify="right")
+    table.add_column("Last Commit", style="yellow")
+    ordered = sorted(per_repo.items(), key=lambda item: item[1].get('total_commits', -1), reverse=True)
+    for path, stats in ordered:
+        name = str(path.relative_to(root)) if path != root else path.name
+        if 'error' in stats:
+            table.add_row(name, "-", "-", f"[red]{stats['error']}[/red]")
+        else:
+            table.add_row(name, str(stats['total_commits']), str(stats['days_active']),
+                          stats['last_commit'] or "N/A")
+    console.print(Panel(table, border_style="blue"))
+
+def journal_command(days: int = 30, repo: Optional[Path] = None):
+    """Show what the tool did in the last ``days`` days, from the run journals.
+
+    Covers every repository the tool has committed to, or only ``repo``.
+    """
+    from .journal import Journal, all_journals, summarize
+    
+    config = Config()
+    if repo is not None:
+        import git
+        journals = [Journal.for_repo(git.Repo(repo), config.config_dir)]
+    else:
+        journals = all_journals(config.config_dir)
+    summary = summarize(journals, days)
+    
+    table = Table(title=f"Tool Activity (Last {days} days)")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green")
+    table.add_row("Runs", f"{summary['runs']} ({summary['completed']} completed, "
+                          f"{summary['failed']} failed, {summary['unfinished']} unfinished)")
+    table.add_row("Commits", str(summary['commits']))
+    table.add_row("Pushes", str(summary['pushes']))
+    table.add_row("Active Days", str(summary['days_active']))
+    table.add_row("Average Commits/Day", f"{summary['average_commits_per_day']:.2f}")
+    table.add_row("Average Commit Time", f"{summary['average_commit_seconds'] * 1000:.1f} ms")
+    table.add_row("Last Run", summary['last_run'] or "N/A")
+    console.print(Panel(table, border_style="blue"))
+    
+    if len(summary['repositories']) > 1:
+        repos = Table(title="Commits per Repository")
+        repos.add_column("Repository", style="cyan")
+        repos.add_column("Commits", style="green", justify="right")
+        for path, commits in sorted(summary['repositories'].items(), key=lambda item: -item[1]):
+            repos.add_row(str(path), str(commits))
+        console.print(Panel(repos, border_style="blue"))
+
 def show_help():
     """Show help information."""
     help_text = """
@@ -243,6 +736,7 @@ def show_help():
    - Hourly, Daily, or Weekly options
    - Custom cron expressions
    - Multiple commits per run
+   - Jobs are saved and survive restarts
 
 📦 [bold cyan]Bulk Commit[/bold cyan]
    Plan and execute multiple commits:
@@ -0,0 +1,150 @@
+"""Incremental on-disk index of local commit history."""
+
+import hashlib
+import os
+import sqlite3
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+import git
+
+RECENT_MESSAGES = 10
+# Seconds to wait for another process's refresh to finish
+LOCK_TIMEOUT = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS days (day TEXT PRIMARY KEY, commits INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS recent (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                   committed INTEGER NOT NULL, subject TEXT NOT NULL);
+"""
+
+
+def repo_key(repo: git.Repo) -> str:
+    """Return a short stable key for ``repo``, shared by its worktrees."""
+    return hashlib.sha256(os.path.realpath(repo.common_dir).encode('utf-8')).hexdigest()[:16]
+
+
+def window_start(days: int) -> int:
+    """Return the timestamp a ``days``-day stats window starts at.
+
+    A window is today plus the ``days`` local calendar days before it, so it
+    starts at local midnight ``days`` days ago.
+    """
+    return int(datetime.combine(date.today() - timedelta(days=days), time.min).timestamp())
+
+
+class CommitIndex:
+    """Per-repository SQLite index of daily commit counts and recent messages.
+
+    The index remembers the commit it was last refreshed at. A refresh walks
+    only the commits added since then, or rebuilds from scratch when that
+    commit is no longer an ancestor of the branch (history was rewritten).
+    Days are local calendar dates at the time the commit was indexed.
+    Processes sharing an index refresh it one at a time.
+    """
+
+    def __init__(self, repo: git.Repo, index_dir: Path):
+        """Open (creating if needed) the index for ``repo`` under ``index_dir``."""
+        self.repo = repo
+        index_dir.mkdir(parents=True, exist_ok=True)
+        self.path = index_dir / f'{repo_key(repo)}.sqlite'
+        # Transactions are explicit, so a refresh can hold the write lock from start to end
+        self.conn = sqlite3.connect(str(self.path), timeout=LOCK_TIMEOUT, isolation_level=None)
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def refresh(self, rev: str = 'HEAD') -> int:
+        """Bring the index up to date with ``rev`` and return how many commits were walked."""
+        # Reading the indexed tip and moving it happen under one write lock, so two
+        # processes refreshing at once can't both add the same commits
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            walked = self._refresh(rev)
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        self.conn.execute('COMMIT')
+        return walked
+
+    def _refresh(self, rev: str) -> int:
+        head = self.repo.git.rev_parse(rev)
+        tip = self._meta('tip')
+        if tip == head:
+            return 0
+
+        incremental = False
+        if tip:
+            try:
+                incremental = self.repo.is_ancestor(tip, head)
+            except git.exc.GitCommandError:
+                # The old tip no longer exists
+                incremental = False
+
+        days: Dict[str, int] = {}
+        recent = []
+        walked = 0
+        proc = self.repo.git.log(f'{tip}..{head}' if incremental else head,
+                                 '--format=%ct%x09%s', as_process=True)
+        try:
+            for line in proc.stdout:
+                timestamp, _, subject = line.partition(b'\t')
+                committed = int(timestamp)
+                day = datetime.fromtimestamp(committed).date().isoformat()
+                days[day] = days.get(day, 0) + 1
+                if len(recent) < RECENT_MESSAGES:
+                    recent.append((committed, subject.rstrip(b'\n').decode('utf-8', 'replace')))
+                walked += 1
+        finally:
+            proc.stdout.close()
+            proc.wait()
+
+        if not incremental:
+            self.conn.execute('DELETE FROM days')
+            self.conn.execute('DELETE FROM recent')
+        self.conn.executemany(
+            'INSERT INTO days (day, commits) VALUES (?, ?) '
+            'ON CONFLICT(day) DO UPDATE SET commits = commits + excluded.commits',
+            days.items())
+        # Oldest first, so a higher id is always a newer commit
+        self.conn.executemany('INSERT INTO recent (committed, subject) VALUES (?, ?)',
+                              reversed(recent))
+        self.conn.execute('DELETE FROM recent WHERE id NOT IN '
+                          '(SELECT id FROM recent ORDER BY id DESC LIMIT ?)', (RECENT_MESSAGES,))
+        self._set_meta('tip', head)
+        if recent:
+            self._set_meta('last_commit', str(recent[0][0]))
+        return walked
+
+    def active_dates(self, days: int) -> Set[date]:
+        """Return the dates with commits among today and the ``days`` days before it."""
+        start = (date.today() - timedelta(days=days)).isoformat()
+        return {date.fromisoformat(row[0]) for row in
+                self.conn.execute('SELECT day FROM days WHERE day >= ?', (start,))}
+
+    def stats(self, days: int) -> Dict[str, Any]:
+        """Return ``get_stats`` metrics for today and the ``days`` calendar days before it."""
+        start = (date.today() - timedelta(days=days)).isoformat()
+        total, active = self.conn.execute(
+            'SELECT COALESCE(SUM(commits), 0), COUNT(*) FROM days WHERE day >= ?', (start,)).fetchone()
+        messages = [row[0] for row in self.conn.execute(
+            'SELECT subject FROM recent WHERE committed >= ? ORDER BY id DESC', (window_start(days),))]
+        last_commit = self._meta('last_commit')
+        return {
+            'total_commits': total,
+            'days_active': active,
+            'average_commits_per_day': round(total / days, 2) if days > 0 else 0,
+            'messages': messages,
+            'last_commit': datetime.fromtimestamp(int(last_commit)).isoformat() if last_commit else None
+        }
@@ -1,26 +1,88 @@
 """Configuration management for GitHub Auto Commit."""
 
+import copy
 import json
 import os
 import shutil
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_FILE = 'config.lock'
+
+
+def _lock(f) -> None:
+    """Block until ``f`` is locked exclusively."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            # LK_LOCK gives up after ten seconds
+            continue
+
+
+def _unlock(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
 
 class Config:
-    """Manages configuration settings."""
+    """Manages configuration settings.
+
+    The parsed file is kept in memory and only re-read when its mtime, size
+    or inode changes, so repeated ``get`` calls cost a ``stat``. Writes go to
+    a temporary file that is renamed over ``config.json``, so other processes
+    sharing the file never see a partial write. Changes hold a lock on
+    ``config.lock`` and re-read the file first, so concurrent updates from
+    several processes are all kept.
+
+    ``commit_messages`` only seeds the message store the first time it is
+    opened; later changes to the key are ignored, and messages are changed
+    with the ``messages`` command instead.
+    """
     
     def __init__(self):
         """Initialize configuration."""
         self.config_dir = Path.home() / '.github_auto_commit'
         self.config_file = self.config_dir / 'config.json'
+        self._cache: Optional[Dict[str, Any]] = None
+        self._cache_key: Optional[Tuple] = None
         self._ensure_config_exists()
         
     def _ensure_config_exists(self):
         """Ensure configuration directory and file exist."""
         self.config_dir.mkdir(parents=True, exist_ok=True)
         if not self.config_file.exists():
-            self._save_config(self._get_default_config())
+            with self._locked():
+                if not self.config_file.exists():
+                    self._save_config(self._get_default_config())
+
+    @contextmanager
+    def _locked(self):
+        """Hold the lock that serializes changes to the config file."""
+        with open(self.config_dir / LOCK_FILE, 'a+') as lock_file:
+            _lock(lock_file)
+            try:
+                yield
+            finally:
+                _unlock(lock_file)
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration."""
@@ -38,37 +100,71 @@ class Config:
                 "Refactor code",
                 "Update dependencies",
                 "Add tests"
-            ]
+            ],
+            'push_every': 0,
+            'commit_backend': 'index',
+            'stats_backend': 'rest'
         }
     
+    def _file_key(self) -> Optional[Tuple]:
+        """Identify the current version of the config file, or None if it is missing."""
+        try:
+            st = os.stat(self.config_file)
+        except OSError:
+            return None
+        return (str(self.config_file), st.st_ino, st.st_mtime_ns, st.st_size)
+    
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from file."""
+        """Load configuration from file, reusing the cached copy if the file is unchanged."""
+        key = self._file_key()
+        if key is not None and key == self._cache_key:
+            return self._cache
         try:
             with open(self.config_file, 'r') as f:
-                return json.load(f)
+                config = json.load(f)
         except Exception as e:
             print(f"Error loading config: {e}")
             return self._get_default_config()
+        self._cache, self._cache_key = config, key
+        return config
     
     def _save_config(self, config: Dict[str, Any]):
-        """Save configuration to file."""
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f, indent=4)
+        """Atomically save configuration to file; the caller holds :meth:`_locked`."""
+        fd, temp_path = tempfile.mkstemp(dir=self.config_file.parent, prefix='.config-',
+                                         suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(config, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.config_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._cache, self._cache_key = config, self._file_key()
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get a configuration value."""
         config = self._load_config()
-        return config.get(key, default)
+        # Hand out copies so callers can't mutate the cache
+        return copy.deepcopy(config.get(key, default))
     
     def set(self, key: str, value: Any):
         """Set a configuration value."""
-        config = self._load_config()
-        config[key] = value
-        self._save_config(config)
+        self.update(**{key: value})
+    
+    def update(self, **values: Any):
+        """Set several configuration values with a single write."""
+        with self._locked():
+            # Picks up changes other processes made since our last read
+            config = dict(self._load_config())
+            config.update(copy.deepcopy(values))
+            self._save_config(config)
     
     def reset(self):
         """Reset configuration to defaults."""
-        self._save_config(self._get_default_config())
+        with self._locked():
+            self._save_config(self._get_default_config())
     
     def backup(self) -> str:
         """Backup the configuration file."""
@@ -81,4 +177,14 @@ class Config:
         """Restore configuration from backup."""
         if not os.path.exists(backup_file):
             raise FileNotFoundError(f"Backup file not found: {backup_file}")
-        shutil.copy2(backup_file, self.config_file)
+        fd, temp_path = tempfile.mkstemp(dir=self.config_file.parent, prefix='.config-',
+                                         suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copy2(backup_file, temp_path)
+            with self._locked():
+                os.replace(temp_path, self.config_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._cache, self._cache_key = None, None
@@ -0,0 +1,244 @@
+"""Resident daemon answering commit and stats requests over a Unix socket.
+
+The protocol is one JSON object per line: the client sends
+``{"op": ..., **params}`` and reads back ``{"ok": true, "result": ...}`` or
+``{"ok": false, "error": "..."}``. Only the standard library is imported at
+module level so the client stays cheap to start; the server side imports
+the rest when a daemon is created.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+SOCKET_NAME = 'daemon.sock'
+CONNECT_TIMEOUT = 5
+
+
+def socket_path(config_dir: Optional[Path] = None) -> Path:
+    """Return the daemon's socket path for ``config_dir`` (default: ~/.github_auto_commit)."""
+    return Path(config_dir or Path.home() / '.github_auto_commit') / SOCKET_NAME
+
+
+class DaemonNotRunning(Exception):
+    """No daemon is listening on the socket."""
+
+
+class DaemonClient:
+    """Send requests to a running daemon."""
+
+    def __init__(self, path: Optional[Path] = None, timeout: Optional[float] = None):
+        """Initialize with the socket path; ``timeout`` bounds each reply (default: none)."""
+        self.path = Path(path or socket_path())
+        self.timeout = timeout
+
+    def request(self, op: str, **params: Any) -> Any:
+        """Run ``op`` in the daemon and return its result, raising its error on failure."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            try:
+                sock.connect(str(self.path))
+            except (FileNotFoundError, ConnectionRefusedError):
+                raise DaemonNotRunning(f"No daemon is listening on {self.path}. "
+                                       "Start one with 'github-auto-commit daemon start'.")
+            sock.settimeout(self.timeout)
+            sock.sendall(json.dumps({'op': op, **params}).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as reply_file:
+                reply = reply_file.readline()
+        if not reply:
+            raise Exception("The daemon closed the connection without replying")
+        response = json.loads(reply)
+        if not response['ok']:
+            raise Exception(response['error'])
+        return response['result']
+
+    def running(self) -> bool:
+        """Return True if a daemon answers on the socket."""
+        try:
+            self.request('ping')
+        except (DaemonNotRunning, OSError):
+            return False
+        return True
+
+
+class Daemon:
+    """Long-running process that keeps configuration, repositories and HTTP sessions warm.
+
+    Each repository is opened once and reused (GitPython keeps its
+    ``git cat-file`` helpers running between requests); requests for the
+    same repository are serialized. The daemon also runs the scheduler, so
+    scheduled jobs use the same warm handles.
+    """
+
+    def __init__(self, config=None, path: Optional[Path] = None):
+        """Initialize with a Config (default: the user's) and the socket path."""
+        from .config import Config
+        from .scheduler import JobStore, Scheduler
+
+        self.config = config or Config()
+        self.path = Path(path or socket_path(self.config.config_dir))
+        self.scheduler = Scheduler(JobStore(self.config.config_dir), self._run_job)
+        self.started = time.time()
+        self.requests_served = 0
+        self._repos: Dict[tuple, Any] = {}
+        self._repo_locks = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+        self._github = None
+        self._server = None
+        # Open client connections, so stopping doesn't wait on idle clients
+        self._connections = set()
+        self._closing = False
+
+    def _repo(self, repo: str, backend: Optional[str] = None):
+        """Return the cached GitHubAutoCommit for ``repo`` and its lock."""
+        from .auto_commit import GitHubAutoCommit
+
+        path = os.path.realpath(repo)
+        with self._lock:
+            handle = self._repos.get((path, backend))
+            if handle is None:
+                handle = GitHubAutoCommit(self.config, backend=backend, repo_dir=Path(path))
+                self._repos[(path, backend)] = handle
+            return handle, self._repo_locks[path]
+
+    def _github_stats(self):
+        """Return the shared GitHub API client, created on first use."""
+        from .stats import ContributionStats
+
+        with self._lock:
+            if self._github is None:
+                token = self.config.get('github_token')
+                if not token:
+                    raise Exception("GitHub credentials not configured. Please run setup first.")
+                self._github = ContributionStats(token,
+                                                 backend=self.config.get('stats_backend', 'rest'))
+            return self._github
+
+    def _run_job(self, job) -> None:
+        handle, lock = self._repo(job.repo)
+        with lock:
+            handle.run_commits(job.count)
+
+    def handle(self, request: Dict[str, Any]) -> Any:
+        """Run one request and return its result."""
+        op = request.get('op')
+        if op == 'ping':
+            return {
+                'pid': os.getpid(),
+                'uptime': round(time.time() - self.started, 1),
+                'requests': self.requests_served,
+                'repositories': len(self._repos),
+                'jobs': len(self.scheduler.jobs),
+            }
+        if op == 'commit':
+            handle, lock = self._repo(request['repo'], request.get('backend'))
+            with lock:
+                return handle.run_commits(int(request.get('count', 1)),
+                                          message=request.get('message'),
+                                          push_every=request.get('push_every'))
+        if op == 'stats':
+            handle, lock = self._repo(request['repo'])
+            with lock:
+                return handle.get_stats(int(request.get('days', 30)))
+        if op == 'github_stats':
+            stats, repo_stats = self._github_stats().get_user_stats(
+                self.config.get('github_username'), days=int(request.get('days', 30)),
+                backend=request.get('backend'))
+            return {'days': dict(stats), 'repositories': dict(repo_stats)}
+        if op == 'metrics':
+            from .metrics import default_dir, metrics
+
+            if request.get('write'):
+                json_path, prom_path = metrics.write(default_dir(self.config.config_dir))
+                return {'json': str(json_path), 'prometheus': str(prom_path)}
+            return metrics.to_dict()
+        if op == 'reload':
+            self.scheduler.reload()
+            return None
+        if op == 'shutdown':
+            self.stop()
+            return None
+        raise ValueError(f"Unknown daemon request '{op}'")
+
+    def _bind(self):
+        import socketserver
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def setup(self):
+                super().setup()
+                with daemon._lock:
+                    daemon._connections.add(self.connection)
+                    closing = daemon._closing
+                if closing:
+                    daemon._hang_up(self.connection)
+
+            def finish(self):
+                with daemon._lock:
+                    daemon._connections.discard(self.connection)
+                super().finish()
+
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        result = {'ok': True, 'result': daemon.handle(json.loads(line))}
+                    except Exception as e:
+                        result = {'ok': False, 'error': str(e)}
+                    with daemon._lock:
+                        daemon.requests_served += 1
+                    self.wfile.write(json.dumps(result).encode('utf-8') + b'\n')
+
+        if self.path.exists():
+            if DaemonClient(self.path).running():
+                raise Exception(f"A daemon is already listening on {self.path}")
+            # Left behind by a daemon that didn't shut down cleanly
+            self.path.unlink()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Create the socket owner-only; a chmod after bind leaves a window where anyone can connect
+        umask = os.umask(0o077)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(str(self.path), Handler)
+        finally:
+            os.umask(umask)
+        # Let in-flight requests (including a shutdown request) send their reply before exit
+        server.daemon_threads = False
+        return server
+
+    @staticmethod
+    def _hang_up(connection) -> None:
+        """Stop reading from ``connection``; a reply being written still goes out."""
+        try:
+            connection.shutdown(socket.SHUT_RD)
+        except OSError:
+            pass
+
+    def serve_forever(self) -> None:
+        """Serve requests and run scheduled jobs until :meth:`stop` is called."""
+        self._server = self._bind()
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            self.scheduler.run_forever()
+        finally:
+            self._server.shutdown()
+            # Idle clients would otherwise keep their handler threads, and server_close, waiting
+            with self._lock:
+                self._closing = True
+                connections = list(self._connections)
+            for connection in connections:
+                self._hang_up(connection)
+            self._server.server_close()
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    def stop(self) -> None:
+        """Ask :meth:`serve_forever` to return."""
+        self.scheduler.stop()
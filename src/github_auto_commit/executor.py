@@ -0,0 +1,80 @@
+"""Make commits in several repositories at once."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from rich.console import Console
+from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
+from .auto_commit import GitHubAutoCommit
+
+console = Console()
+
+DEFAULT_WORKERS = 8
+
+RepoCounts = Union[Dict[Any, int], Iterable[Tuple[Any, int]]]
+
+
+def _unique_repos(repos: RepoCounts) -> Dict[Path, int]:
+    """Merge entries that point at the same repository, summing their counts."""
+    items = repos.items() if isinstance(repos, dict) else repos
+    merged: Dict[Path, int] = {}
+    for path, count in items:
+        path = Path(os.path.realpath(Path(path).expanduser()))
+        merged[path] = merged.get(path, 0) + count
+    return merged
+
+
+def commit_to_repos(config, repos: RepoCounts, message: Optional[str] = None,
+                    push_every: Optional[int] = None, backend: Optional[str] = None,
+                    max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """Make ``count`` commits in each ``(path, count)`` of ``repos`` concurrently.
+
+    Each repository gets exactly one worker, so its index and refs are only
+    ever touched by one thread; at most ``max_workers`` repositories are
+    worked on at a time. Progress is shown as one overall bar plus a bar per
+    repository. Returns the ``make_commits`` result for each repository path,
+    or ``{'error': message}`` for one that failed; failures don't stop the
+    other repositories.
+    """
+    repos = _unique_repos(repos)
+    if not repos:
+        return {}
+    workers = max(1, min(max_workers or DEFAULT_WORKERS, len(repos)))
+    results: Dict[str, Dict[str, Any]] = {}
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("{task.completed}/{task.total}"),
+        TimeElapsedColumn(),
+    ) as progress:
+        overall = progress.add_task(f"[bold]{len(repos)} repositories", total=sum(repos.values()))
+
+        def work(path: Path, count: int) -> Dict[str, Any]:
+            task = progress.add_task(path.name, total=count)
+
+            def report(advance: int, description: str) -> None:
+                progress.update(task, advance=advance, description=f"{path.name}: {description}")
+                if advance:
+                    progress.advance(overall, advance)
+
+            try:
+                auto_commit = GitHubAutoCommit(config, backend=backend, repo_dir=path)
+                result = auto_commit.run_commits(count, message=message, push_every=push_every,
+                                                 on_progress=report)
+                progress.update(task, description=f"[green]{path.name}: done")
+                return result
+            except Exception as e:
+                progress.update(task, description=f"[red]{path.name}: failed")
+                return {'error': str(e)}
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(work, path, count): path for path, count in repos.items()}
+            for future in as_completed(futures):
+                results[str(futures[future])] = future.result()
+
+    return results
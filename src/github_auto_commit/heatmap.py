@@ -0,0 +1,86 @@
+"""GitHub-style contribution heatmap rendering."""
+
+from bisect import bisect_left
+from datetime import date, timedelta
+from typing import List, Mapping, Optional
+
+from rich.console import Group
+from rich.text import Text
+
+# GitHub's dark-theme contribution colours, from no contributions to the busiest quartile
+LEVEL_COLORS = ["#161b22", "#0e4429", "#006d32", "#26a641", "#39d353"]
+CELL = "■ "
+BLANK = "  "
+WEEKDAY_LABELS = ["Mon", "", "Wed", "", "Fri", "", "Sun"]
+# Weeks per block; a year fits in about 110 terminal columns
+WEEKS_PER_BLOCK = 53
+
+
+def level_thresholds(counts: List[int]) -> List[int]:
+    """Return the upper bounds of levels 1-3: the quartiles of the non-zero ``counts``."""
+    nonzero = sorted(c for c in counts if c > 0)
+    if not nonzero:
+        return [0, 0, 0]
+    return [nonzero[(len(nonzero) - 1) * q // 4] for q in (1, 2, 3)]
+
+
+def count_level(count: int, thresholds: List[int]) -> int:
+    """Map a day's commit count to a colour level from 0 (none) to 4 (busiest)."""
+    if count <= 0:
+        return 0
+    return 1 + bisect_left(thresholds, count)
+
+
+def render_heatmap(stats: Mapping[str, int], days: int, end: Optional[date] = None) -> Group:
+    """Render ``{'YYYY-MM-DD': commits}`` for the ``days`` days up to ``end`` as one renderable.
+
+    Dates are bucketed into a weekday x week grid in a single pass over the
+    (sparse) ``stats``, rather than walking every calendar day. Long windows
+    are split into blocks of a year's worth of weeks, stacked vertically.
+    """
+    end = end or date.today()
+    start = end - timedelta(days=days)
+    grid_start = start - timedelta(days=start.weekday())
+    weeks = (end - grid_start).days // 7 + 1
+
+    grid = [[0] * weeks for _ in range(7)]
+    first, last = (start - grid_start).days, (end - grid_start).days
+    for day, count in stats.items():
+        offset = (date.fromisoformat(day[:10]) - grid_start).days
+        if first <= offset <= last:
+            grid[offset % 7][offset // 7] += count
+
+    thresholds = level_thresholds([c for row in grid for c in row])
+
+    blocks = []
+    for block_start in range(0, weeks, WEEKS_PER_BLOCK):
+        block_end = min(block_start + WEEKS_PER_BLOCK, weeks)
+        # Month names over the first week of each month, skipped where they would overlap
+        header = [" "] * (len(CELL) * (block_end - block_start) + 1)
+        previous_month = None
+        free_from = 0
+        for week in range(block_start, block_end):
+            month = (grid_start + timedelta(weeks=week)).month
+            pos = len(CELL) * (week - block_start)
+            if month != previous_month and pos >= free_from:
+                header[pos:pos + 3] = date(2000, month, 1).strftime("%b")
+                free_from = pos + 4
+            previous_month = month
+        rows = [Text("    " + "".join(header).rstrip(), style="dim")]
+        for weekday in range(7):
+            row = Text(f"{WEEKDAY_LABELS[weekday]:<4}", style="dim")
+            counts = grid[weekday]
+            for week in range(block_start, block_end):
+                offset = week * 7 + weekday
+                if first <= offset <= last:
+                    row.append(CELL, style=LEVEL_COLORS[count_level(counts[week], thresholds)])
+                else:
+                    row.append(BLANK)
+            rows.append(row)
+        blocks.append(Text("\n").join(rows) + Text("\n"))
+
+    legend = Text("Less ", style="dim")
+    for color in LEVEL_COLORS:
+        legend.append(CELL, style=color)
+    legend.append("More", style="dim")
+    return Group(*blocks, legend)
@@ -0,0 +1,115 @@
+"""On-disk HTTP response cache for the GitHub API."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of API responses and their validators.
+
+    Each entry is a JSON file named after a hash of the URL and query
+    parameters, holding the response body, the ``next`` page link and the
+    ``ETag``/``Last-Modified`` validators used to make conditional requests.
+    A file's mtime records when it was last used; when the cache grows past
+    ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the cache, creating its directory if needed."""
+        self.cache_dir = Path(cache_dir or Path.home() / '.github_auto_commit' / 'http_cache')
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._sizes = {p.name: p.stat().st_size for p in self.cache_dir.glob('*.json')}
+        self._total = sum(self._sizes.values())
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]] = None, scope: str = '') -> str:
+        """Return the cache key for a request.
+
+        ``scope`` keeps apart responses that differ for the same URL, such as
+        those made with different credentials; only its hash is stored.
+        """
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f'{scope}\0{url}?{query}'.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.json'
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for ``key`` and mark it as recently used."""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def store(self, key: str, entry: Dict[str, Any]) -> None:
+        """Atomically write ``entry`` under ``key`` and evict old entries if over budget."""
+        data = json.dumps(entry).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        name = self._path(key).name
+        with self._lock:
+            self._total += len(data) - self._sizes.get(name, 0)
+            self._sizes[name] = len(data)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache is under 90% of its budget."""
+        def last_used(name):
+            try:
+                return (self.cache_dir / name).stat().st_mtime
+            except OSError:
+                return 0
+
+        for name in sorted(self._sizes, key=last_used):
+            if self._total <= self.max_bytes * 0.9:
+                break
+            try:
+                (self.cache_dir / name).unlink()
+            except OSError:
+                pass
+            self._total -= self._sizes.pop(name)
+            self.evictions += 1
+
+    def record(self, hit: bool) -> None:
+        """Count a request served from the cache (``hit``) or from the network."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def report(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current cache size."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._sizes),
+            'bytes': self._total,
+        }
@@ -0,0 +1,340 @@
+"""Append-only journal of commit runs, for resuming them and reporting on them.
+
+Each repository has a JSON-lines file ``journal/<key>.jsonl`` in the config
+directory (``key`` as for the commit index). A run appends:
+
+- ``run``: what it was asked to do, the branch and the tip it started from
+- ``commit``: each commit's number in the run, SHA, message and duration
+- ``push``: how many of the run's commits are on the remote after a push
+- ``end``: ``done``, ``failed`` or ``interrupted``
+
+A resumed run appends ``resume`` and carries on numbering its commits.
+Records are written to the file as they happen, so a process that dies
+loses nothing; the file is fsynced every ``sync_every`` records or
+``sync_interval`` seconds, and at every push and run end, which bounds
+what a power loss can take. Records are in time order, so reports for
+recent days seek straight to where the window starts.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .metrics import metrics
+
+SYNC_EVERY = 64
+SYNC_INTERVAL = 1.0
+BLOCK_SIZE = 64 * 1024
+# Every record is written with its type first, so run records can be found without parsing
+RUN_MARKER = b'{"type":"run",'
+
+
+def journal_dir(config_dir: Path) -> Path:
+    """Return the directory holding the journals."""
+    return Path(config_dir) / 'journal'
+
+
+@dataclass
+class RunState:
+    """Where a journaled run got to."""
+
+    id: str
+    repo: str
+    branch: str
+    base: str
+    count: int
+    message: Optional[str] = None
+    push_every: int = 0
+    committed: int = 0
+    pushed: int = 0
+    last_sha: Optional[str] = None
+    status: Optional[str] = None
+    shas: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def remaining(self) -> int:
+        """Commits still to make."""
+        return max(0, self.count - self.committed)
+
+    @property
+    def tip(self) -> str:
+        """The last commit the run is known to have made, or where it started."""
+        return self.last_sha or self.base
+
+
+class JournalRun:
+    """Records one run's progress in a :class:`Journal`."""
+
+    def __init__(self, journal: 'Journal', state: RunState):
+        self.journal = journal
+        self.state = state
+
+    def commit(self, sha: str, message: str, seconds: float, recovered: bool = False) -> None:
+        """Record the run's next commit."""
+        state = self.state
+        state.committed += 1
+        state.last_sha = sha
+        state.shas[state.committed] = sha
+        record = {'type': 'commit', 'run': state.id, 'time': time.time(), 'n': state.committed,
+                  'sha': sha, 'message': message, 'seconds': round(seconds, 6)}
+        if recovered:
+            record['recovered'] = True
+        self.journal.append(record)
+
+    def push(self, commits: int) -> None:
+        """Record that the first ``commits`` commits of the run are on the remote."""
+        state = self.state
+        state.pushed = max(state.pushed, commits)
+        self.journal.append({'type': 'push', 'run': state.id, 'time': time.time(),
+                             'commits': commits, 'sha': state.shas.get(commits)}, sync=True)
+
+    def finish(self, status: str, error: Optional[str] = None) -> None:
+        """Record how the run ended."""
+        self.state.status = status
+        record = {'type': 'end', 'run': self.state.id, 'time': time.time(), 'status': status,
+                  'commits': self.state.committed, 'pushed': self.state.pushed}
+        if error:
+            record['error'] = error
+        self.journal.append(record, sync=True)
+
+
+class Journal:
+    """One repository's journal file."""
+
+    def __init__(self, path: Path, sync_every: int = SYNC_EVERY,
+                 sync_interval: float = SYNC_INTERVAL):
+        """Use the journal at ``path``; it is created on the first record."""
+        self.path = Path(path)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._file = None
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def for_repo(cls, repo, config_dir: Path) -> 'Journal':
+        """Return the journal of ``repo`` in ``config_dir``."""
+        from .commit_index import repo_key
+        return cls(journal_dir(config_dir) / f'{repo_key(repo)}.jsonl')
+
+    # Writing
+
+    def append(self, record: Dict[str, Any], sync: bool = False) -> None:
+        """Write ``record`` now; fsync if asked to or if a batch is due."""
+        line = json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8') + b'\n'
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # Unbuffered append: each record is a single write(2) at the end of the file
+                self._file = open(self.path, 'ab', buffering=0)
+            self._file.write(line)
+            self._unsynced += 1
+            if (sync or self._unsynced >= self.sync_every
+                    or time.monotonic() - self._last_sync >= self.sync_interval):
+                self._sync()
+
+    def _sync(self) -> None:
+        with metrics.timer('journal_fsync_seconds'):
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        """Flush outstanding records to disk."""
+        with self._lock:
+            if self._file is not None and self._unsynced:
+                self._sync()
+
+    def close(self) -> None:
+        """Sync and close the file."""
+        with self._lock:
+            if self._file is not None:
+                if self._unsynced:
+                    self._sync()
+                self._file.close()
+                self._file = None
+
+    def start_run(self, repo: str, branch: str, base: str, count: int,
+                  message: Optional[str] = None, push_every: int = 0) -> JournalRun:
+        """Record the start of a run and return its recorder."""
+        now = time.time()
+        state = RunState(id=f'{now:.6f}-{os.getpid()}', repo=repo, branch=branch, base=base,
+                         count=count, message=message, push_every=push_every)
+        self.append({'type': 'run', 'run': state.id, 'time': now, 'repo': repo, 'branch': branch,
+                     'base': base, 'count': count, 'message': message, 'push_every': push_every},
+                    sync=True)
+        return JournalRun(self, state)
+
+    def resume_run(self, state: RunState) -> JournalRun:
+        """Record that the run in ``state`` carries on, and return its recorder."""
+        state.status = None
+        self.append({'type': 'resume', 'run': state.id, 'time': time.time(), 'pid': os.getpid(),
+                     'commits': state.committed, 'pushed': state.pushed}, sync=True)
+        return JournalRun(self, state)
+
+    # Reading
+
+    def _last_run_offset(self) -> Optional[int]:
+        """Return the file offset of the last run record, reading backwards from the end."""
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return None
+        with f:
+            marker = b'\n' + RUN_MARKER
+            pos = f.seek(0, os.SEEK_END)
+            overlap = b''
+            while pos > 0:
+                start = max(0, pos - BLOCK_SIZE)
+                f.seek(start)
+                chunk = f.read(pos - start) + overlap
+                found = chunk.rfind(marker)
+                if found >= 0:
+                    return start + found + 1
+                if start == 0 and chunk.startswith(RUN_MARKER):
+                    return 0
+                overlap = chunk[:len(marker) - 1]
+                pos = start
+        return None
+
+    def _read_from(self, offset: int) -> Iterator[Dict[str, Any]]:
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A record cut short by a crash
+                    continue
+
+    def last_run(self) -> Optional[RunState]:
+        """Return the state of the most recent run, or None if there is none."""
+        offset = self._last_run_offset()
+        if offset is None:
+            return None
+        state = None
+        for record in self._read_from(offset):
+            kind = record.get('type')
+            if kind == 'run' and state is None:
+                state = RunState(id=record['run'], repo=record['repo'], branch=record['branch'],
+                                 base=record['base'], count=record['count'],
+                                 message=record.get('message'),
+                                 push_every=record.get('push_every', 0))
+            elif state is None or record.get('run') != state.id:
+                continue
+            elif kind == 'commit':
+                state.committed = record['n']
+                state.last_sha = record['sha']
+                state.shas[record['n']] = record['sha']
+            elif kind == 'push':
+                state.pushed = max(state.pushed, record['commits'])
+            elif kind == 'end':
+                state.status = record['status']
+            elif kind == 'resume':
+                state.status = None
+        return state
+
+    def _line_start(self, f, pos: int) -> int:
+        """Move ``f`` to the first line starting at or after ``pos`` and return its offset."""
+        if pos == 0:
+            return f.seek(0)
+        f.seek(pos - 1)
+        f.readline()
+        return f.tell()
+
+    def _offset_for(self, f, since: float, size: int) -> int:
+        """Binary-search the offset of the first record at or after ``since``."""
+        def at_or_after(pos: int) -> bool:
+            self._line_start(f, pos)
+            line = f.readline()
+            if not line:
+                return True
+            try:
+                return json.loads(line)['time'] >= since
+            except (ValueError, KeyError):
+                return False
+
+        low, high = 0, size
+        while low < high:
+            middle = (low + high) // 2
+            if at_or_after(middle):
+                high = middle
+            else:
+                low = middle + 1
+        return self._line_start(f, low)
+
+    def records(self, since: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the records, only those from ``since`` (a timestamp) on if given."""
+        try:
+            with open(self.path, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                offset = self._offset_for(f, since, size) if since else 0
+        except FileNotFoundError:
+            return
+        yield from self._read_from(offset)
+
+    def repo(self) -> Optional[str]:
+        """Return the repository path recorded in the journal's first record."""
+        try:
+            with open(self.path, 'rb') as f:
+                return json.loads(f.readline()).get('repo')
+        except (FileNotFoundError, ValueError):
+            return None
+
+
+def summarize(journals: List[Journal], days: int = 30) -> Dict[str, Any]:
+    """Report what the tool did in the last ``days`` days from ``journals``."""
+    since = time.time() - days * 86400
+    runs: Dict[str, str] = {}
+    per_day: Dict[str, int] = {}
+    per_repo: Dict[str, int] = {}
+    commits = pushes = 0
+    commit_seconds = 0.0
+    last_run = None
+    for journal in journals:
+        repo = journal.repo()
+        for record in journal.records(since):
+            kind = record.get('type')
+            if kind == 'run':
+                runs[record['run']] = 'running'
+                repo = record.get('repo', repo)
+                last_run = max(last_run or 0, record['time'])
+            elif kind == 'resume':
+                runs[record['run']] = 'running'
+            elif kind == 'end':
+                runs[record['run']] = record['status']
+            elif kind == 'commit':
+                commits += 1
+                commit_seconds += record.get('seconds', 0)
+                day = datetime.fromtimestamp(record['time']).date().isoformat()
+                per_day[day] = per_day.get(day, 0) + 1
+                per_repo[repo] = per_repo.get(repo, 0) + 1
+            elif kind == 'push':
+                pushes += 1
+    statuses = list(runs.values())
+    return {
+        'runs': len(runs),
+        'completed': statuses.count('done'),
+        'failed': statuses.count('failed'),
+        'unfinished': statuses.count('interrupted') + statuses.count('running'),
+        'commits': commits,
+        'pushes': pushes,
+        'days_active': len(per_day),
+        'average_commits_per_day': round(commits / days, 2) if days > 0 else 0,
+        'average_commit_seconds': round(commit_seconds / commits, 6) if commits else 0.0,
+        'commits_per_day': dict(sorted(per_day.items())),
+        'repositories': per_repo,
+        'last_run': datetime.fromtimestamp(last_run).isoformat() if last_run else None,
+    }
+
+
+def all_journals(config_dir: Path) -> List[Journal]:
+    """Return the journal of every repository the tool has committed to."""
+    directory = journal_dir(config_dir)
+    return [Journal(path) for path in sorted(directory.glob('*.jsonl'))] if directory.is_dir() else []
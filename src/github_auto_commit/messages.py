@@ -0,0 +1,460 @@
+"""On-disk commit message store with weighted sampling in constant time.
+
+A store is a directory holding three files:
+
+- ``messages.dat``: the message texts, UTF-8, appended one after another.
+- ``messages.idx``: a header (generation, slot count, live count) and one
+  fixed-size entry per message slot: offset and length of its text in
+  ``messages.dat``, flags and weight.
+- ``messages.alias``: a Vose alias table over the slots, stamped with the
+  index generation it was built from.
+
+All three are memory-mapped, so opening a store reads only headers and a
+sample reads two table cells and one message, whatever the corpus size.
+Adding appends to the data and index files, editing appends the new text
+and rewrites one index entry in place, and removing flags an entry; none
+of them rewrites the corpus. Each change bumps the index generation, and
+the alias table is rebuilt on the first sample after a change. Messages
+are numbered by slot, so numbers stay put when others are removed until
+:meth:`MessageStore.compact` reclaims the space.
+"""
+
+import math
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+INDEX_MAGIC = b'GACMIDX1'
+ALIAS_MAGIC = b'GACMALS1'
+# magic, generation, slots, live messages
+INDEX_HEADER = struct.Struct('<8sQQQ')
+# text offset, text length, flags, weight
+ENTRY = struct.Struct('<QIId')
+# magic, generation, slots, total weight
+ALIAS_HEADER = struct.Struct('<8sQQd')
+PROBABILITY = struct.Struct('<d')
+ALIAS = struct.Struct('<I')
+REMOVED = 1
+
+Weighted = Union[str, Tuple[str, float]]
+
+
+def build_alias(weights: Sequence[float]) -> Tuple[array, array]:
+    """Build Vose's alias table for ``weights``: ``(probability, alias)`` per slot.
+
+    Slot ``i`` is sampled by picking ``i`` uniformly and keeping it with
+    probability ``probability[i]``, otherwise taking ``alias[i]``.
+    """
+    n = len(weights)
+    total = math.fsum(weights)
+    probability = array('d', bytes(8 * n))
+    alias = array('I', range(n))
+    if not total:
+        return probability, alias
+    scaled = [w * n / total for w in weights]
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        probability[less] = scaled[less]
+        alias[less] = more
+        scaled[more] += scaled[less] - 1.0
+        (small if scaled[more] < 1.0 else large).append(more)
+    # Whatever is left is 1 up to rounding; zero-weight slots are skipped when sampled
+    for i in large + small:
+        probability[i] = 1.0 if weights[i] else 0.0
+        alias[i] = i
+    return probability, alias
+
+
+def _check_weight(weight: float) -> float:
+    weight = float(weight)
+    if not math.isfinite(weight) or weight < 0:
+        raise ValueError(f"Message weight must be a non-negative number, not {weight}")
+    return weight
+
+
+def _lock(f, shared: bool) -> None:
+    """Block until ``f`` is locked, shared or exclusive."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        return
+    # msvcrt has no shared locks, so readers take the exclusive lock too
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            # LK_LOCK gives up after ten seconds
+            continue
+
+
+def _unlock(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _map(f, access=mmap.ACCESS_READ) -> Optional[mmap.mmap]:
+    size = os.fstat(f.fileno()).st_size
+    return mmap.mmap(f.fileno(), size, access=access) if size else None
+
+
+class MessageStore:
+    """Commit messages with weights, stored in ``directory``.
+
+    Several processes may use the same store: changes are made under an
+    exclusive lock on ``lock`` and picked up by other open stores through
+    the generation in the index header.
+    """
+
+    def __init__(self, directory: Path):
+        """Open the store in ``directory``, creating an empty one if needed."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / 'messages.idx'
+        self.data_path = self.directory / 'messages.dat'
+        self.alias_path = self.directory / 'messages.alias'
+        self._lock_file = open(self.directory / 'lock', 'a+b')
+        self._lock_depth = 0
+        self._index_file = self._data_file = None
+        self._index = self._data = self._alias = None
+        self._generation = -1
+        with self._locked():
+            if not self.index_path.exists():
+                self.data_path.touch()
+                self._write_file(self.index_path, INDEX_HEADER.pack(INDEX_MAGIC, 0, 0, 0))
+        with self._locked(shared=True):
+            self._open()
+
+    @classmethod
+    def for_config(cls, config, default: Sequence[str] = ()) -> 'MessageStore':
+        """Open the user's store, seeding a new one from ``commit_messages`` in the config.
+
+        The config key is only read when the store is created; after that the
+        store is the only copy of the messages.
+        """
+        store = cls(config.config_dir / 'messages')
+        if not store.slots:
+            with store._locked():
+                store._sync()
+                if not store.slots:
+                    store._append(config.get('commit_messages') or list(default))
+        return store
+
+    # Files and locking
+
+    @contextmanager
+    def _locked(self, shared: bool = False):
+        """Hold the store's lock, exclusive unless ``shared``; nested uses keep the outermost lock."""
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        _lock(self._lock_file, shared)
+        self._lock_depth = 1
+        try:
+            yield
+        finally:
+            self._lock_depth = 0
+            _unlock(self._lock_file)
+
+    def _write_file(self, path: Path, *chunks: bytes) -> None:
+        """Atomically replace ``path`` with ``chunks``."""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _open(self) -> None:
+        self._close_files()
+        self._index_file = open(self.index_path, 'r+b')
+        self._data_file = open(self.data_path, 'r+b')
+        self._index = _map(self._index_file, mmap.ACCESS_WRITE)
+        magic = INDEX_HEADER.unpack_from(self._index)[0]
+        if magic != INDEX_MAGIC:
+            raise Exception(f"{self.index_path} is not a message index")
+        self._data = _map(self._data_file)
+        self._index_inode = os.fstat(self._index_file.fileno()).st_ino
+        self._generation = self.generation
+
+    def _close_files(self) -> None:
+        for name in ('_alias', '_index', '_data', '_index_file', '_data_file'):
+            handle = getattr(self, name)
+            if handle is not None:
+                handle.close()
+                setattr(self, name, None)
+
+    def close(self) -> None:
+        """Unmap and close the store's files."""
+        self._close_files()
+        self._lock_file.close()
+
+    def __enter__(self) -> 'MessageStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _remap(self) -> None:
+        """Extend the mappings over anything appended since they were made."""
+        if os.fstat(self._index_file.fileno()).st_size > len(self._index):
+            self._index.close()
+            self._index = _map(self._index_file, mmap.ACCESS_WRITE)
+        size = os.fstat(self._data_file.fileno()).st_size
+        if size > (len(self._data) if self._data is not None else 0):
+            if self._data is not None:
+                self._data.close()
+            self._data = _map(self._data_file)
+
+    def _sync(self) -> None:
+        """Pick up changes made through other open stores."""
+        if self.generation == self._generation:
+            return
+        if os.stat(self.index_path).st_ino != self._index_inode:
+            # Compacted: the files were replaced
+            with self._locked(shared=True):
+                self._open()
+            return
+        self._remap()
+        self._generation = self.generation
+
+    # Header and entries
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every change to the store."""
+        return INDEX_HEADER.unpack_from(self._index)[1]
+
+    @property
+    def slots(self) -> int:
+        """Number of message slots, including removed messages."""
+        return INDEX_HEADER.unpack_from(self._index)[2]
+
+    def __len__(self) -> int:
+        """Return the number of messages (not counting removed ones)."""
+        self._sync()
+        return INDEX_HEADER.unpack_from(self._index)[3]
+
+    def _set_header(self, slots: int, live: int) -> None:
+        INDEX_HEADER.pack_into(self._index, 0, INDEX_MAGIC, self.generation + 1, slots, live)
+        self._generation = self.generation
+
+    def _entry(self, slot: int) -> Tuple[int, int, int, float]:
+        return ENTRY.unpack_from(self._index, INDEX_HEADER.size + slot * ENTRY.size)
+
+    def _slot(self, number: int) -> int:
+        """Return the slot of the live message ``number`` (1-based)."""
+        slot = number - 1
+        if not 0 <= slot < self.slots or self._entry(slot)[2] & REMOVED:
+            raise Exception(f"No commit message number {number}")
+        return slot
+
+    def _text(self, offset: int, length: int) -> str:
+        return self._data[offset:offset + length].decode('utf-8')
+
+    # Reading
+
+    def get(self, number: int) -> Tuple[str, float]:
+        """Return ``(message, weight)`` for message ``number``."""
+        self._sync()
+        offset, length, _, weight = self._entry(self._slot(number))
+        return self._text(offset, length), weight
+
+    def __iter__(self) -> Iterator[Tuple[int, str, float]]:
+        """Yield ``(number, message, weight)`` for each message in order."""
+        self._sync()
+        for slot in range(self.slots):
+            offset, length, flags, weight = self._entry(slot)
+            if not flags & REMOVED:
+                yield slot + 1, self._text(offset, length), weight
+
+    def messages(self) -> List[str]:
+        """Return the message texts in order."""
+        return [message for _, message, _ in self]
+
+    def sample(self, rng: random.Random = random) -> str:
+        """Return a message chosen with probability proportional to its weight."""
+        self._sync()
+        alias = self._current_alias()
+        slots = ALIAS_HEADER.unpack_from(alias)[2]
+        if not ALIAS_HEADER.unpack_from(alias)[3]:
+            raise Exception("No commit messages to choose from. "
+                            "Add some with 'github-auto-commit messages --add'.")
+        while True:
+            slot = rng.randrange(slots)
+            if rng.random() >= PROBABILITY.unpack_from(alias, ALIAS_HEADER.size + 8 * slot)[0]:
+                slot = ALIAS.unpack_from(alias, ALIAS_HEADER.size + 8 * slots + 4 * slot)[0]
+            offset, length, flags, weight = self._entry(slot)
+            if weight and not flags & REMOVED:
+                return self._text(offset, length)
+
+    # Alias table
+
+    def _load_alias(self) -> bool:
+        """Map the saved alias table if it matches the current generation."""
+        if self._alias is not None:
+            self._alias.close()
+            self._alias = None
+        try:
+            with open(self.alias_path, 'rb') as f:
+                alias = _map(f)
+        except FileNotFoundError:
+            return False
+        if alias is None:
+            return False
+        magic, generation, slots, _ = ALIAS_HEADER.unpack_from(alias)
+        if magic != ALIAS_MAGIC or generation != self.generation or slots != self.slots:
+            alias.close()
+            return False
+        self._alias = alias
+        return True
+
+    def _current_alias(self) -> mmap.mmap:
+        if self._alias is not None and ALIAS_HEADER.unpack_from(self._alias)[1] == self.generation:
+            return self._alias
+        if not self._load_alias():
+            with self._locked():
+                self._sync()
+                if not self._load_alias():
+                    self._build_alias()
+        return self._alias
+
+    def _build_alias(self) -> None:
+        """Rebuild and save the alias table from the current weights."""
+        slots = self.slots
+        entries = self._index[INDEX_HEADER.size:INDEX_HEADER.size + slots * ENTRY.size]
+        weights = [0.0 if flags & REMOVED else weight
+                   for _, _, flags, weight in ENTRY.iter_unpack(entries)]
+        probability, alias = build_alias(weights)
+        if sys.byteorder == 'big':
+            probability.byteswap()
+            alias.byteswap()
+        header = ALIAS_HEADER.pack(ALIAS_MAGIC, self.generation, slots, math.fsum(weights))
+        self._write_file(self.alias_path, header, probability.tobytes(), alias.tobytes())
+        self._load_alias()
+
+    # Changes
+
+    def _append(self, items: Iterable[Weighted]) -> List[int]:
+        """Append messages (texts or ``(text, weight)`` pairs); the caller holds the lock."""
+        self._data_file.seek(0, os.SEEK_END)
+        offset = self._data_file.tell()
+        texts = bytearray()
+        entries = bytearray()
+        for item in items:
+            message, weight = (item, 1.0) if isinstance(item, str) else item
+            if not message:
+                raise ValueError("Commit messages can't be empty")
+            raw = message.encode('utf-8')
+            entries += ENTRY.pack(offset + len(texts), len(raw), 0, _check_weight(weight))
+            texts += raw
+        added = len(entries) // ENTRY.size
+        if not added:
+            return []
+        # Text, then entries, then the header, so other stores never see a partial message
+        self._data_file.write(texts)
+        self._data_file.flush()
+        slots = self.slots
+        self._index_file.seek(INDEX_HEADER.size + slots * ENTRY.size)
+        self._index_file.write(entries)
+        self._index_file.flush()
+        self._remap()
+        self._set_header(slots + added, INDEX_HEADER.unpack_from(self._index)[3] + added)
+        return list(range(slots + 1, slots + added + 1))
+
+    def add(self, message: str, weight: float = 1.0) -> int:
+        """Add a message and return its number."""
+        return self.add_many([(message, weight)])[0]
+
+    def add_many(self, items: Iterable[Weighted]) -> List[int]:
+        """Add messages (texts or ``(text, weight)`` pairs) and return their numbers."""
+        with self._locked():
+            self._sync()
+            return self._append(items)
+
+    def edit(self, number: int, message: Optional[str] = None,
+             weight: Optional[float] = None) -> None:
+        """Change the text and/or weight of message ``number``."""
+        with self._locked():
+            self._sync()
+            slot = self._slot(number)
+            offset, length, flags, old_weight = self._entry(slot)
+            if message is not None:
+                if not message:
+                    raise ValueError("Commit messages can't be empty")
+                raw = message.encode('utf-8')
+                self._data_file.seek(0, os.SEEK_END)
+                offset, length = self._data_file.tell(), len(raw)
+                self._data_file.write(raw)
+                self._data_file.flush()
+                self._remap()
+            new_weight = old_weight if weight is None else _check_weight(weight)
+            ENTRY.pack_into(self._index, INDEX_HEADER.size + slot * ENTRY.size,
+                            offset, length, flags, new_weight)
+            self._set_header(self.slots, INDEX_HEADER.unpack_from(self._index)[3])
+
+    def remove(self, number: int) -> None:
+        """Remove message ``number``; the numbers of other messages don't change."""
+        self.remove_many([number])
+
+    def remove_many(self, numbers: Iterable[int]) -> None:
+        """Remove several messages at once."""
+        with self._locked():
+            self._sync()
+            slots = [self._slot(number) for number in set(numbers)]
+            for slot in slots:
+                offset, length, flags, _ = self._entry(slot)
+                ENTRY.pack_into(self._index, INDEX_HEADER.size + slot * ENTRY.size,
+                                offset, length, flags | REMOVED, 0.0)
+            self._set_header(self.slots, INDEX_HEADER.unpack_from(self._index)[3] - len(slots))
+
+    def compact(self) -> int:
+        """Rewrite the store without removed messages and old texts; return bytes saved.
+
+        Messages are renumbered consecutively.
+        """
+        with self._locked():
+            self._sync()
+            before = len(self._index) + (len(self._data) if self._data is not None else 0)
+            texts = bytearray()
+            entries = bytearray()
+            for _, message, weight in self:
+                raw = message.encode('utf-8')
+                entries += ENTRY.pack(len(texts), len(raw), 0, weight)
+                texts += raw
+            live = len(entries) // ENTRY.size
+            generation = self.generation + 1
+            self._write_file(self.data_path, texts)
+            self._write_file(self.index_path,
+                             INDEX_HEADER.pack(INDEX_MAGIC, generation, live, live), entries)
+            # Tell stores still mapping the old files to reopen
+            INDEX_HEADER.pack_into(self._index, 0, INDEX_MAGIC, generation, self.slots,
+                                   INDEX_HEADER.unpack_from(self._index)[3])
+            self._open()
+        return before - (INDEX_HEADER.size + len(entries) + len(texts))
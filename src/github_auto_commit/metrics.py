@@ -0,0 +1,180 @@
+"""In-process latency histograms and counters, exported as JSON and Prometheus text."""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+# Upper bounds in seconds, from a fast index write up to a slow push
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PREFIX = 'github_auto_commit'
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        """Initialize empty, with ``buckets`` as the bucket upper bounds."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        """Yield ``(le, count)`` pairs, ending with ``+Inf``."""
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield ('+Inf' if bound == float('inf') else repr(bound)), total
+
+    def to_dict(self) -> Dict:
+        """Return the histogram as plain data."""
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'max': round(self.max, 6),
+            'buckets': dict(self.cumulative()),
+        }
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+
+class Metrics:
+    """Thread-safe registry of histograms and counters keyed by name and labels."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record ``value`` (seconds) in the histogram ``name``."""
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+        """Add ``amount`` to the counter ``name``."""
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str, **labels: str):
+        """Time the ``with`` block into the histogram ``name``, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    @contextmanager
+    def isolated(self):
+        """Record into an empty registry for the ``with`` block, then put back what was there.
+
+        Everything recorded inside the block, from any thread, is dropped.
+        """
+        with self._lock:
+            saved = self.histograms, self.counters
+            self.histograms, self.counters = {}, {}
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.histograms, self.counters = saved
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def __bool__(self) -> bool:
+        return bool(self.histograms or self.counters)
+
+    def to_dict(self) -> Dict:
+        """Return ``{'histograms': [...], 'counters': [...]}`` as plain data."""
+        with self._lock:
+            return {
+                'histograms': [dict(name=name, labels=dict(labels), **histogram.to_dict())
+                               for (name, labels), histogram in sorted(self.histograms.items())],
+                'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                             for (name, labels), value in sorted(self.counters.items())],
+            }
+
+    def to_prometheus(self, prefix: str = PREFIX) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                full = f'{prefix}_{name}'
+                if full not in typed:
+                    lines.append(f'# TYPE {full} histogram')
+                    typed.add(full)
+                for le, count in histogram.cumulative():
+                    lines.append(f'{full}_bucket{_format_labels(labels, (("le", le),))} {count}')
+                lines.append(f'{full}_sum{_format_labels(labels)} {histogram.sum:.6f}')
+                lines.append(f'{full}_count{_format_labels(labels)} {histogram.count}')
+            for (name, labels), value in sorted(self.counters.items()):
+                full = f'{prefix}_{name}'
+                if full not in typed:
+                    lines.append(f'# TYPE {full} counter')
+                    typed.add(full)
+                lines.append(f'{full}{_format_labels(labels)} {value:g}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory: Path) -> Tuple[Path, Path]:
+        """Atomically write ``metrics.json`` and ``metrics.prom`` into ``directory``."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        outputs = ((directory / 'metrics.json', json.dumps(self.to_dict(), indent=4)),
+                   (directory / 'metrics.prom', self.to_prometheus()))
+        for path, text in outputs:
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(text)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        return outputs[0][0], outputs[1][0]
+
+
+# Process-wide registry the instrumented code records into
+metrics = Metrics()
+
+
+def default_dir(config_dir: Optional[Path] = None) -> Path:
+    """Return where metrics and profiles are written by default."""
+    return Path(config_dir or Path.home() / '.github_auto_commit') / 'metrics'
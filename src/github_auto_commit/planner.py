@@ -0,0 +1,147 @@
+"""Bulk commit planning: spread a number of commits over days."""
+
+import random
+import time
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+PATTERNS = ('Even', 'Random', 'Front-loaded', 'Back-loaded')
+DAY_SECONDS = 86400
+# Histogram rows; longer plans are bucketed into groups of days
+MAX_HISTOGRAM_ROWS = 30
+HISTOGRAM_WIDTH = 40
+
+
+def day_weights(days: int, pattern: str, rng: random.Random) -> List[float]:
+    """Return the relative share of commits for each of ``days`` days."""
+    if pattern == 'Even':
+        return [1.0] * days
+    if pattern == 'Random':
+        return [rng.random() + 1e-9 for _ in range(days)]
+    if pattern == 'Front-loaded':
+        return [float(days - i) for i in range(days)]
+    if pattern == 'Back-loaded':
+        return [float(i + 1) for i in range(days)]
+    raise ValueError(f"Unknown distribution pattern '{pattern}'. Choose from: {', '.join(PATTERNS)}")
+
+
+def apportion(total: int, weights: Sequence[float]) -> array:
+    """Split ``total`` into integer counts proportional to ``weights`` (largest remainder).
+
+    Extra commits that tie on remainder (every day of an even plan with
+    fewer commits than days) are spread evenly across the tied days rather
+    than given to the first ones.
+    """
+    scale = total / sum(weights)
+    quotas = [w * scale for w in weights]
+    counts = array('L', (int(q) for q in quotas))
+    short = total - sum(counts)
+    if short:
+        # Rounded so that remainders equal but for float error tie
+        remainders = [round(q - c, 9) for q, c in zip(quotas, counts)]
+        cutoff = sorted(remainders, reverse=True)[short - 1]
+        tied = []
+        for i, remainder in enumerate(remainders):
+            if remainder > cutoff:
+                counts[i] += 1
+                short -= 1
+            elif remainder == cutoff:
+                tied.append(i)
+        # The middle of each of ``short`` equal runs of tied days
+        for j in range(short):
+            counts[tied[(2 * j + 1) * len(tied) // (2 * short)]] += 1
+    return counts
+
+
+class CommitPlan:
+    """A bulk commit schedule held as two flat arrays.
+
+    ``counts[d]`` is the number of commits on day ``d`` and ``times`` holds
+    every commit's epoch time in ascending order. Each day is split into as
+    many equal slots as it has commits and every commit lands at a random
+    point in its own slot, so times come out sorted without a sort and the
+    whole plan is built in a single pass. A 100k-commit plan takes well
+    under a second and about 800 KB.
+    """
+
+    def __init__(self, total: int, days: int, pattern: str = 'Even',
+                 start: Optional[float] = None, seed: Optional[int] = None):
+        """Plan ``total`` commits over ``days`` days from ``start`` (default: now)."""
+        if total < 0 or days < 1:
+            raise ValueError("A plan needs a non-negative commit count and at least one day")
+        rng = random.Random(seed)
+        self.total = total
+        self.days = days
+        self.pattern = pattern
+        self.start = time.time() if start is None else start
+        self.counts = apportion(total, day_weights(days, pattern, rng)) if total else array('L', [0] * days)
+
+        uniform = rng.random
+        times = array('d')
+        for day, count in enumerate(self.counts):
+            if not count:
+                continue
+            slot = DAY_SECONDS / count
+            day_start = self.start + day * DAY_SECONDS
+            times.extend(day_start + (i + uniform()) * slot for i in range(count))
+        self.times = times
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def due(self, done: int, now: float) -> int:
+        """Return how many commits after the first ``done`` are due at ``now``."""
+        return bisect_right(self.times, now, lo=done) - done
+
+    def histogram(self, max_rows: int = MAX_HISTOGRAM_ROWS) -> Table:
+        """Render commits per day (or per group of days) as a bar chart table."""
+        group = -(-self.days // max_rows)
+        buckets = [sum(self.counts[i:i + group]) for i in range(0, self.days, group)]
+        peak = max(buckets) or 1
+
+        table = Table(title=f"{self.total} commits over {self.days} days ({self.pattern})")
+        table.add_column("Day" if group == 1 else "Days", style="cyan")
+        table.add_column("Commits", justify="right", style="green")
+        table.add_column("")
+        for row, count in enumerate(buckets):
+            first = datetime.fromtimestamp(self.start + row * group * DAY_SECONDS)
+            label = first.strftime('%Y-%m-%d')
+            if group > 1:
+                last_day = min((row + 1) * group, self.days) - 1
+                last = datetime.fromtimestamp(self.start + last_day * DAY_SECONDS)
+                label += f" – {last:%m-%d}"
+            table.add_row(label, str(count), "█" * round(count * HISTOGRAM_WIDTH / peak))
+        return table
+
+
+def run_plan(auto_commit, plan: CommitPlan, push_every: Optional[int] = None,
+             sleep: Callable[[float], None] = time.sleep,
+             clock: Callable[[], float] = time.time) -> Dict[str, int]:
+    """Make the commits of ``plan`` as their times come, sleeping in between.
+
+    Commits whose time has already passed (e.g. after the machine slept)
+    are made together in one run with a single push.
+    """
+    done = 0
+    totals = {'commits': 0, 'pushes': 0, 'pushes_saved': 0}
+    while done < len(plan):
+        now = clock()
+        due = plan.due(done, now)
+        if not due:
+            next_at = datetime.fromtimestamp(plan.times[done])
+            console.print(f"[dim]Next commit at {next_at:%Y-%m-%d %H:%M:%S} "
+                          f"({done}/{len(plan)} done)[/dim]")
+            sleep(plan.times[done] - now)
+            continue
+        result = auto_commit.make_commits(due, push_every=push_every)
+        for key in totals:
+            totals[key] += result[key]
+        done += due
+    return totals
@@ -0,0 +1,211 @@
+"""Pushing commits: cached push target, failure classification and retries."""
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import git
+
+from .metrics import metrics
+
+NO_UPSTREAM = 'no_upstream'
+REJECTED = 'rejected'
+TRANSIENT = 'transient'
+FATAL = 'fatal'
+
+# Checked in this order; the first match wins. Transient network errors are
+# matched before the generic "could not read from remote" that git adds to them.
+FAILURE_PATTERNS = (
+    (NO_UPSTREAM, re.compile(r'has no upstream branch|no upstream configured', re.I)),
+    (REJECTED, re.compile(r'\[rejected\]|\[remote rejected\]|non-fast-forward|fetch first', re.I)),
+    (TRANSIENT, re.compile(
+        r'could not resolve host|connection (timed out|refused|reset)|operation timed out'
+        r'|timed out|remote end hung up unexpectedly|early eof|rpc failed'
+        r'|temporary failure|network is unreachable|http[ /]5\d\d|\b50[234]\b'
+        r'|ssl_(read|connect)|gnutls', re.I)),
+)
+
+
+def classify(output: str) -> str:
+    """Classify a failed push's output as no upstream, rejected, transient or fatal."""
+    for kind, pattern in FAILURE_PATTERNS:
+        if pattern.search(output or ''):
+            return kind
+    return FATAL
+
+
+def _output(error: git.exc.GitCommandError) -> str:
+    """Return a failed git command's stdout and stderr without GitPython's decoration."""
+    # --porcelain reports rejected refs on stdout and network errors on stderr
+    parts = []
+    for name, text in (('stdout', error.stdout), ('stderr', error.stderr)):
+        text = (text or '').strip()
+        prefix = f"{name}: '"
+        if text.startswith(prefix) and text.endswith("'"):
+            text = text[len(prefix):-1].strip()
+        if text:
+            parts.append(text)
+    return '\n'.join(parts)
+
+
+class PushError(Exception):
+    """A push that failed for good; ``kind`` is one of the classify() results."""
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(message)
+        self.kind = kind
+
+
+@dataclass
+class PushTarget:
+    """Where the current branch is pushed."""
+
+    remote: str
+    branch: str
+    has_upstream: bool
+
+
+class Pusher:
+    """Push the current branch, resolving the target once and retrying network errors.
+
+    The remote and branch are looked up on the first push and reused. Pushes
+    name the branch explicitly, so a branch without an upstream is pushed
+    (with ``--set-upstream``) in one go instead of after failed attempts.
+    Only transient errors are retried, with exponential backoff and jitter;
+    rejected and fatal pushes fail straight away.
+    """
+
+    def __init__(self, repo: git.Repo, remote: str = 'origin', max_retries: int = 4,
+                 base_delay: float = 1.0, max_delay: float = 30.0,
+                 sleep: Callable[[float], None] = time.sleep,
+                 jitter: Callable[[], float] = random.random):
+        """Initialize for ``repo``; ``sleep`` and ``jitter`` are replaceable for tests."""
+        self.repo = repo
+        self.remote = remote
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.jitter = jitter
+        self._target: Optional[PushTarget] = None
+
+    def target(self) -> PushTarget:
+        """Return the push target, resolving it on first use."""
+        if self._target is None:
+            if self.remote not in [r.name for r in self.repo.remotes]:
+                raise PushError(FATAL, f"No remote named '{self.remote}'")
+            try:
+                branch = self.repo.active_branch
+            except TypeError:
+                raise PushError(FATAL, "Can't push a detached HEAD; check out a branch first")
+            tracking = branch.tracking_branch()
+            self._target = PushTarget(self.remote, branch.name,
+                                      tracking is not None and tracking.remote_name == self.remote)
+        return self._target
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before retry number ``attempt`` (from 0): half fixed, half random."""
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return delay / 2 + self.jitter() * delay / 2
+
+    def push(self) -> None:
+        """Push the branch, raising PushError if it can't be pushed."""
+        target = self.target()
+        attempt = 0
+        while True:
+            args = ['--porcelain']
+            if not target.has_upstream:
+                args.append('--set-upstream')
+            args += [target.remote, f'refs/heads/{target.branch}:refs/heads/{target.branch}']
+            try:
+                with metrics.timer('push_attempt_seconds'):
+                    self.repo.git.push(*args)
+            except git.exc.GitCommandError as e:
+                output = _output(e)
+                kind = classify(output)
+                if kind == NO_UPSTREAM and target.has_upstream:
+                    # The configured upstream went away; push and set it again
+                    target.has_upstream = False
+                elif kind == TRANSIENT and attempt < self.max_retries:
+                    self.sleep(self.backoff(attempt))
+                    attempt += 1
+                else:
+                    metrics.increment('push_failures_total', reason=kind)
+                    raise PushError(kind, output.strip() or str(e))
+                metrics.increment('push_retries_total', reason=kind)
+                continue
+            target.has_upstream = True
+            return
+
+
+class BackgroundPusher:
+    """Push from a background thread while commits keep being made.
+
+    :meth:`request` asks for the commits made so far to be pushed and
+    returns at once. Each push sends the branch tip as it is when the push
+    starts, so requests made while a push is in flight are folded into a
+    single follow-up push. The first error stops the pusher; it is raised
+    from the next :meth:`request`, :meth:`check` or :meth:`close`.
+    """
+
+    def __init__(self, push: Callable[[], None],
+                 on_push: Optional[Callable[[int], None]] = None):
+        """Start the thread; ``push()`` pushes the tip, ``on_push(pushed)`` follows each push."""
+        self._push = push
+        self._on_push = on_push or (lambda pushed: None)
+        self._condition = threading.Condition()
+        self._requested = 0
+        self._closing = False
+        # Commits known to be on the remote: those made before the last successful push started
+        self.pushed = 0
+        self.pushes = 0
+        self.error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name='pusher', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._requested <= self.pushed and not self._closing:
+                    self._condition.wait()
+                if self._requested <= self.pushed:
+                    return
+                target = self._requested
+            try:
+                self._push()
+            except BaseException as e:
+                self.error = e
+                return
+            with self._condition:
+                self.pushed = target
+                self.pushes += 1
+            self._on_push(target)
+
+    def check(self) -> None:
+        """Raise the pusher's error, if it has failed."""
+        if self.error is not None:
+            raise self.error
+
+    def request(self, committed: int) -> None:
+        """Ask for the first ``committed`` commits of the run to be pushed."""
+        self.check()
+        with self._condition:
+            self._requested = max(self._requested, committed)
+            self._condition.notify()
+
+    def close(self, flush: bool = True) -> None:
+        """Wait for the pusher to finish, raising its error.
+
+        With ``flush`` the outstanding requests are pushed first; without it
+        only a push already in flight is waited for.
+        """
+        with self._condition:
+            if not flush:
+                self._requested = self.pushed
+            self._closing = True
+            self._condition.notify()
+        self._thread.join()
+        self.check()
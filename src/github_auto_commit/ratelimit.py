@@ -0,0 +1,148 @@
+"""Rate-limit-aware request scheduling for the GitHub API."""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import requests
+from rich.console import Console
+
+from .metrics import metrics
+
+console = Console()
+
+# Secondary limits without a Retry-After header: GitHub asks clients to wait at least a minute
+SECONDARY_LIMIT_WAIT = 60
+
+
+def retry_after_seconds(value: str) -> Optional[float]:
+    """Return the wait a ``Retry-After`` header asks for, in seconds, or None if it can't be read.
+
+    The header is either a number of seconds or an HTTP date.
+    """
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Gate concurrent API requests on GitHub's rate-limit headers.
+
+    Every response's ``X-RateLimit-Remaining`` and ``X-RateLimit-Reset``
+    headers update the limiter. While plenty of quota is left, up to
+    ``max_concurrency`` requests run at once; below ``low_water`` remaining
+    requests the allowed concurrency shrinks proportionally down to one,
+    and at zero all requests wait for the reset time. Primary (403 with no
+    remaining quota) and secondary (403/429 with ``Retry-After``) limit
+    responses pause every worker and are retried instead of returned.
+    """
+
+    def __init__(self, max_concurrency: int = 8, low_water: int = 100, max_retries: int = 5):
+        """Initialize with the concurrency to use while quota is plentiful."""
+        self.max_concurrency = max(max_concurrency, 1)
+        self.low_water = low_water
+        self.max_retries = max_retries
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.blocked_until = 0.0
+        self.retries = 0
+        self.requests_sent = 0
+        self._active = 0
+        self._cond = threading.Condition()
+
+    def allowed(self) -> int:
+        """Return how many requests may currently run at once."""
+        if self.remaining is None:
+            return self.max_concurrency
+        if self.remaining <= 0:
+            return 0
+        if self.remaining >= self.low_water:
+            return self.max_concurrency
+        return max(1, self.max_concurrency * self.remaining // self.low_water)
+
+    def _acquire(self) -> None:
+        with self._cond:
+            self.requests_sent += 1
+            while True:
+                now = time.time()
+                if self.blocked_until > now:
+                    self._cond.wait(self.blocked_until - now)
+                    continue
+                if self.remaining is not None and self.remaining <= 0:
+                    if self.reset_at is None or self.reset_at <= now:
+                        # The window has reset; quota is unknown until the next response
+                        self.remaining = None
+                    else:
+                        self._cond.wait(self.reset_at - now)
+                        continue
+                if self._active < self.allowed():
+                    self._active += 1
+                    return
+                self._cond.wait(1.0)
+
+    def _release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def update(self, response: requests.Response) -> None:
+        """Record the quota reported by ``response``."""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        with self._cond:
+            if remaining is not None:
+                self.remaining = int(remaining)
+            if reset is not None:
+                self.reset_at = float(reset)
+            self._cond.notify_all()
+
+    def limit_delay(self, response: requests.Response, attempt: int) -> Optional[float]:
+        """Return how long to wait if ``response`` is a rate-limit response, else None."""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None:
+            delay = retry_after_seconds(retry_after)
+            if delay is not None:
+                return delay
+        # No usable Retry-After: fall back to the reset time or the default backoff
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            reset = float(response.headers.get('X-RateLimit-Reset', time.time()))
+            return max(reset - time.time(), 0.0) + 1
+        if response.status_code == 429 or 'rate limit' in response.text.lower():
+            return SECONDARY_LIMIT_WAIT * 2 ** attempt
+        return None
+
+    def request(self, send: Callable[[], requests.Response]) -> requests.Response:
+        """Run ``send`` under the limiter, retrying rate-limit responses.
+
+        After ``max_retries`` retries the last limit response is returned to
+        the caller unchanged.
+        """
+        attempt = 0
+        while True:
+            self._acquire()
+            try:
+                response = send()
+            finally:
+                self._release()
+            self.update(response)
+
+            delay = self.limit_delay(response, attempt)
+            if delay is None or attempt >= self.max_retries:
+                return response
+            attempt += 1
+            metrics.increment('api_rate_limit_retries_total')
+            with self._cond:
+                self.retries += 1
+                until = time.time() + delay
+                if until > self.blocked_until:
+                    self.blocked_until = until
+                    console.print(f"[yellow]GitHub rate limit reached; waiting {delay:.0f}s "
+                                  "before retrying...[/yellow]")
@@ -0,0 +1,92 @@
+"""Parallel statistics across many local repositories."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import git
+
+from .auto_commit import scan_history_days
+from .commit_index import CommitIndex
+
+
+def find_repos(root: Path) -> List[Path]:
+    """Return every git working tree under ``root``, without descending into them."""
+    repos = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if '.git' in dirnames or '.git' in filenames:
+            repos.append(Path(dirpath))
+            dirnames[:] = []
+        else:
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+    return repos
+
+
+def _repo_stats(path: Path, days: int,
+                index_dir: Optional[Path]) -> Tuple[Path, Dict[str, Any], List[str]]:
+    """Compute ``get_stats`` metrics and active dates for one repository (runs in a worker)."""
+    repo = git.Repo(path)
+    try:
+        if index_dir is not None:
+            try:
+                index = CommitIndex(repo, index_dir)
+                try:
+                    index.refresh()
+                    return path, index.stats(days), sorted(d.isoformat() for d in index.active_dates(days))
+                finally:
+                    index.close()
+            except Exception:
+                pass
+        stats, active_days = scan_history_days(repo, days)
+        return path, stats, sorted(d.isoformat() for d in active_days)
+    finally:
+        repo.close()
+
+
+def _safe_repo_stats(args):
+    """Run :func:`_repo_stats`, turning failures into an ``error`` entry."""
+    path, days, index_dir = args
+    try:
+        return _repo_stats(path, days, index_dir)
+    except Exception as e:
+        return path, {'error': str(e)}, []
+
+
+def scan_repos(root: Path, days: int = 30, workers: Optional[int] = None,
+               index_dir: Optional[Path] = None) -> Tuple[Dict[Path, Dict[str, Any]], Dict[str, Any]]:
+    """Compute stats for every repository under ``root`` in a process pool.
+
+    Returns ``(per_repo, combined)``. ``per_repo`` maps each repository path
+    to its ``get_stats`` metrics (or ``{'error': ...}``); ``combined`` merges
+    them, counting a day as active if any repository had a commit on it.
+    With ``index_dir``, each repository's commit index there is refreshed
+    and used instead of scanning history.
+    """
+    paths = find_repos(root)
+    per_repo: Dict[Path, Dict[str, Any]] = {}
+    active_days = set()
+    total = 0
+    last_commit = None
+
+    if paths:
+        workers = min(workers or os.cpu_count() or 1, len(paths))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            jobs = [(path, days, index_dir) for path in paths]
+            for path, stats, dates in executor.map(_safe_repo_stats, jobs):
+                per_repo[path] = stats
+                if 'error' in stats:
+                    continue
+                total += stats['total_commits']
+                active_days.update(dates)
+                if stats['last_commit'] and (last_commit is None or stats['last_commit'] > last_commit):
+                    last_commit = stats['last_commit']
+
+    combined = {
+        'repositories': len(paths),
+        'total_commits': total,
+        'days_active': len(active_days),
+        'average_commits_per_day': round(total / days, 2) if days > 0 else 0,
+        'last_commit': last_commit,
+    }
+    return per_repo, combined
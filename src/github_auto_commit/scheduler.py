@@ -0,0 +1,482 @@
+"""Cron-style scheduling of automated commits."""
+
+import heapq
+import itertools
+import json
+import os
+import signal
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from rich.console import Console
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+console = Console()
+
+MONTH_NAMES = {name: i for i, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)}
+DAY_NAMES = {name: i for i, name in enumerate(['sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat'])}
+MACROS = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+}
+# How far ahead to look for a matching time before declaring an expression impossible
+SEARCH_YEARS = 5
+
+JOBS_FILE = 'jobs.json'
+JOBS_LOCK_FILE = 'jobs.lock'
+PID_FILE = 'scheduler.pid'
+
+
+def _try_lock(f) -> bool:
+    """Lock ``f`` exclusively if no other process holds it; return whether it was locked."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _lock(f) -> None:
+    """Block until ``f`` is locked exclusively."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            # LK_LOCK gives up after ten seconds
+            continue
+
+
+def _unlock(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class CronExpression:
+    """A standard five-field cron expression: minute, hour, day of month, month, day of week.
+
+    Supports ``*``, values, ranges, lists, ``/step``, month and weekday
+    names and the ``@hourly``-style macros. As in Vixie cron, when both
+    day of month and day of week are restricted a day matching either runs.
+    """
+
+    def __init__(self, expression: str):
+        """Parse ``expression``, raising ValueError if it is invalid."""
+        self.expression = expression.strip()
+        fields = MACROS.get(self.expression.lower(), self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid cron expression '{expression}': expected 5 fields")
+        try:
+            self.minutes = self._parse_field(fields[0], 0, 59)
+            self.hours = self._parse_field(fields[1], 0, 23)
+            self.days = self._parse_field(fields[2], 1, 31)
+            self.months = self._parse_field(fields[3], 1, 12, MONTH_NAMES)
+            self.weekdays = {d % 7 for d in self._parse_field(fields[4], 0, 7, DAY_NAMES)}
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression '{expression}': {e}")
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+        self._sorted_minutes = sorted(self.minutes)
+        self._sorted_hours = sorted(self.hours)
+
+    @staticmethod
+    def _parse_field(text: str, low: int, high: int, names: Optional[Dict[str, int]] = None) -> Set[int]:
+        def value(token):
+            token = token.lower()
+            if names and token in names:
+                return names[token]
+            return int(token)
+
+        values = set()
+        for part in text.split(','):
+            step = 1
+            if '/' in part:
+                part, step_text = part.split('/', 1)
+                step = int(step_text)
+                if step < 1:
+                    raise ValueError(f"step must be positive in '{text}'")
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                first, last = part.split('-', 1)
+                start, end = value(first), value(last)
+            else:
+                start = value(part)
+                end = high if step > 1 else start
+            if not low <= start <= end <= high:
+                raise ValueError(f"'{text}' is outside {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, when: datetime) -> bool:
+        day_ok = when.day in self.days
+        weekday_ok = (when.weekday() + 1) % 7 in self.weekdays
+        if self.any_day and self.any_weekday:
+            return True
+        if self.any_day:
+            return weekday_ok
+        if self.any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """Return the first matching minute strictly after ``after``."""
+        when = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = when + timedelta(days=366 * SEARCH_YEARS)
+        while when < limit:
+            if when.month not in self.months:
+                when = (when.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(when):
+                when = (when + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if when.hour not in self.hours:
+                later = [h for h in self._sorted_hours if h > when.hour]
+                if later:
+                    when = when.replace(hour=later[0], minute=0)
+                else:
+                    when = (when + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if when.minute not in self.minutes:
+                later = [m for m in self._sorted_minutes if m > when.minute]
+                if later:
+                    when = when.replace(minute=later[0])
+                else:
+                    when = when.replace(minute=0) + timedelta(hours=1)
+                continue
+            return when
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+
+@lru_cache(maxsize=None)
+def parse_cron(expression: str) -> CronExpression:
+    """Parse ``expression``, reusing earlier parses of the same string."""
+    return CronExpression(expression)
+
+
+@dataclass
+class Job:
+    """A scheduled run of ``count`` commits in the repository at ``repo``."""
+
+    cron: str
+    repo: str
+    count: int = 1
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    next_run: Optional[float] = None
+    last_run: Optional[float] = None
+
+    def schedule_next(self, after: float) -> float:
+        """Set and return the first run time after ``after``."""
+        following = parse_cron(self.cron).next_after(datetime.fromtimestamp(after))
+        self.next_run = following.timestamp()
+        return self.next_run
+
+
+class JobStore:
+    """Jobs persisted as JSON in the config directory.
+
+    Several processes change the jobs (the CLI, the scheduler, the daemon),
+    so changes go through :meth:`update`, which re-reads the file under a
+    lock and saves only what the change touched.
+    """
+
+    def __init__(self, config_dir: Path):
+        """Initialize with the directory holding the jobs file."""
+        self.config_dir = Path(config_dir)
+        self.path = self.config_dir / JOBS_FILE
+
+    @contextmanager
+    def locked(self):
+        """Hold the lock that serializes changes to the jobs file."""
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.config_dir / JOBS_LOCK_FILE, 'a+') as lock_file:
+            _lock(lock_file)
+            try:
+                yield
+            finally:
+                _unlock(lock_file)
+
+    def update(self, change: Callable[[Dict[str, Job]], None]) -> Dict[str, Job]:
+        """Apply ``change`` to the stored jobs in place, save them and return them."""
+        with self.locked():
+            jobs = self.load()
+            change(jobs)
+            self.save(jobs)
+            return jobs
+
+    def load(self) -> Dict[str, Job]:
+        """Return the stored jobs keyed by id."""
+        try:
+            with open(self.path, 'r') as f:
+                return {data['id']: Job(**data) for data in json.load(f)}
+        except FileNotFoundError:
+            return {}
+
+    def save(self, jobs: Dict[str, Job]) -> None:
+        """Atomically replace the stored jobs; see :meth:`update` for read-modify-write."""
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.config_dir, prefix='.jobs-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump([asdict(job) for job in jobs.values()], f, indent=4)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class Scheduler:
+    """Run jobs when their cron expressions come due.
+
+    Due times are kept in a heap and the scheduler thread sleeps until the
+    earliest one (or until a job is added or removed), so an idle scheduler
+    uses no CPU however many jobs it holds. Jobs run on a small thread pool;
+    runs in the same repository are serialized. Next-run times are persisted,
+    so a run missed while the scheduler was down happens once on restart.
+    Only one scheduler (including the daemon's) runs jobs at a time: it holds
+    a lock on the pid file while it runs.
+    """
+
+    def __init__(self, store: JobStore, runner: Callable[[Job], None], max_workers: int = 4):
+        """Initialize with the job store and the callable that performs a run."""
+        self.store = store
+        self.runner = runner
+        self.jobs: Dict[str, Job] = {}
+        self._heap: List = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._reload_requested = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._repo_locks = defaultdict(threading.Lock)
+        self.reload()
+
+    def _push(self, job: Job) -> None:
+        heapq.heappush(self._heap, (job.next_run, next(self._seq), job.id))
+
+    def reload(self) -> None:
+        """Re-read the job store, e.g. after another process changed it."""
+        def schedule_new(jobs: Dict[str, Job]) -> None:
+            now = time.time()
+            for job in jobs.values():
+                if job.next_run is None:
+                    job.schedule_next(now)
+
+        with self._cond:
+            self.jobs = self.store.update(schedule_new)
+            self._heap = []
+            for job in self.jobs.values():
+                self._push(job)
+            self._cond.notify_all()
+
+    def add(self, job: Job) -> Job:
+        """Schedule ``job`` and persist it."""
+        parse_cron(job.cron)
+        with self._cond:
+            job.schedule_next(time.time())
+            self.store.update(lambda jobs: jobs.update({job.id: job}))
+            self.jobs[job.id] = job
+            self._push(job)
+            self._cond.notify_all()
+        return job
+
+    def remove(self, job_id: str) -> None:
+        """Unschedule the job with ``job_id``."""
+        with self._cond:
+            self.store.update(lambda jobs: jobs.pop(job_id, None))
+            self.jobs.pop(job_id, None)
+            self._cond.notify_all()
+
+    def next_wakeup(self) -> Optional[float]:
+        """Return when the earliest job is due, or None with no jobs."""
+        with self._cond:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def _drop_stale(self) -> None:
+        # Entries for removed or rescheduled jobs are left in the heap and skipped here
+        while self._heap:
+            due, _, job_id = self._heap[0]
+            job = self.jobs.get(job_id)
+            if job is not None and job.next_run == due:
+                return
+            heapq.heappop(self._heap)
+
+    def run_due(self, now: Optional[float] = None) -> List[Job]:
+        """Start every job due at ``now`` and reschedule it; return the started jobs."""
+        now = time.time() if now is None else now
+        due = []
+        with self._cond:
+            self._drop_stale()
+            while self._heap and self._heap[0][0] <= now:
+                job = self.jobs[heapq.heappop(self._heap)[2]]
+                job.last_run = now
+                job.schedule_next(now)
+                self._push(job)
+                due.append(job)
+                self._drop_stale()
+            if due:
+                self.store.update(lambda jobs: self._record_runs(jobs, due))
+        for job in due:
+            self._executor.submit(self._run, job)
+        return due
+
+    @staticmethod
+    def _record_runs(jobs: Dict[str, Job], due: List[Job]) -> None:
+        # Only the run times change; jobs removed by another process stay removed
+        for job in due:
+            stored = jobs.get(job.id)
+            if stored is not None:
+                stored.last_run = job.last_run
+                stored.next_run = job.next_run
+
+    def _run(self, job: Job) -> None:
+        with self._repo_locks[job.repo]:
+            try:
+                self.runner(job)
+            except Exception as e:
+                console.print(f"[red]Scheduled job {job.id} in {job.repo} failed: {str(e)}[/red]")
+
+    def request_reload(self, *_) -> None:
+        """Have :meth:`run_forever` reload the jobs before it next runs any; safe in a signal handler."""
+        with self._cond:
+            # Only flag it: reloading here could swap the jobs under a run_due in progress
+            self._reload_requested = True
+            self._cond.notify_all()
+
+    def _claim_pid_file(self):
+        """Lock the pid file and write this process's pid to it; return the open file."""
+        path = self.store.config_dir / PID_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            pid_file = open(path, 'a+')
+            if not _try_lock(pid_file):
+                try:
+                    pid_file.seek(0)
+                    holder = f" (pid {pid_file.read().strip()})"
+                except OSError:
+                    holder = ""
+                pid_file.close()
+                raise Exception(f"A scheduler is already running{holder}. Only one scheduler "
+                                "or daemon can run scheduled jobs at a time.")
+            # A scheduler exiting between our open and lock removes the file we locked
+            try:
+                if os.stat(path).st_ino == os.fstat(pid_file.fileno()).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            pid_file.close()
+        pid_file.seek(0)
+        pid_file.truncate()
+        pid_file.write(str(os.getpid()))
+        pid_file.flush()
+        return pid_file
+
+    def run_forever(self) -> None:
+        """Run jobs as they come due until :meth:`stop` is called.
+
+        Raises if another scheduler is already running.
+        """
+        pid_file = self._claim_pid_file()
+        previous_handler = None
+        if hasattr(signal, 'SIGHUP') and threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(signal.SIGHUP, self.request_reload)
+        try:
+            while True:
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self.reload()
+                self.run_due()
+                with self._cond:
+                    if self._stopped:
+                        break
+                    if self._reload_requested:
+                        continue
+                    self._drop_stale()
+                    timeout = max(self._heap[0][0] - time.time(), 0) if self._heap else None
+                    self._cond.wait(timeout)
+                    if self._stopped:
+                        break
+        finally:
+            if previous_handler is not None:
+                signal.signal(signal.SIGHUP, previous_handler)
+            try:
+                os.unlink(pid_file.name)
+            except OSError:
+                pass
+            pid_file.close()
+            self._executor.shutdown(wait=True)
+
+    def stop(self) -> None:
+        """Ask :meth:`run_forever` to return after in-flight jobs finish."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+
+def notify_scheduler(config_dir: Path) -> bool:
+    """Ask a running scheduler to reload its jobs; return True if one was signalled.
+
+    The pid file is only trusted while its lock is held. A file left behind
+    by a scheduler that crashed names a pid that may now belong to an
+    unrelated process, which SIGHUP would kill.
+    """
+    if not hasattr(signal, 'SIGHUP'):
+        return False
+    try:
+        with open(Path(config_dir) / PID_FILE) as pid_file:
+            if _try_lock(pid_file):
+                # Nobody holds it, so no scheduler is running
+                return False
+            pid = int(pid_file.read())
+        os.kill(pid, signal.SIGHUP)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def run_job(job: Job) -> None:
+    """Make the commits for one scheduled run.
+
+    Jobs run on worker threads, possibly several at once, so this prints a
+    line per run rather than drawing a progress display.
+    """
+    from .auto_commit import GitHubAutoCommit
+    from .config import Config
+
+    result = GitHubAutoCommit(Config(), repo_dir=Path(job.repo)).run_commits(job.count)
+    console.print(f"[green]Job {job.id}: {result['commits']} commit(s) in {job.repo}, "
+                  f"pushed {result['pushes']} time(s)[/green]")
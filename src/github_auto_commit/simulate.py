@@ -0,0 +1,246 @@
+"""Simulated runs: real commit and push work on a throwaway copy, projected to a full run.
+
+:func:`simulate` clones the repository into a temporary directory with
+``git clone --shared`` (the clone borrows the existing objects rather than
+copying them, and only its index is filled in, not a working tree) and
+gives it a local bare repository, borrowing objects the same way, as
+``origin``. It makes a sample of the requested commits there with the
+chosen backend and push interval, then times two pushes on their own, one
+carrying a single commit and one carrying several, and projects the full
+run from what it measured:
+
+- commit time: the sampled commits' mean, plus the delays between commits
+- pushes: one per ``push_every`` commits, or fewer when a push takes
+  longer than the commits between pushes and later commits are folded in;
+  ``push_every=1`` pushes every commit before making the next one
+- push time: the single-commit push as the fixed cost of a push, plus the
+  extra time per commit carried by the larger push
+- growth: what the sample added to the clone's and the remote's object
+  stores, per commit
+
+Pushes go to a local disk, so they have no network time; ``push_latency``
+adds an expected round trip to each push. The real repository, its remote
+and its journal are not touched. Neither are the user's config directory
+and message store: the sample runs against a scratch config directory in
+the same temporary directory. It records its metrics into a private
+registry, so a ``--metrics`` export doesn't show commits and pushes that
+never happened, and it needs no GitHub credentials.
+"""
+
+import math
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import git
+
+from .auto_commit import GitHubAutoCommit
+from .metrics import metrics
+
+SAMPLE_COMMITS = 100
+# Commits carried by the push that measures the cost per commit pushed
+PUSH_SAMPLE = 20
+
+
+@dataclass
+class Projection:
+    """Measured costs of a simulated run and what they project for the full run."""
+
+    count: int
+    delay: int
+    push_every: int
+    backend: str
+    sampled: int
+    commit_seconds: float
+    push_seconds: float
+    push_seconds_per_commit: float
+    pushes: int
+    seconds: float
+    local_bytes_per_commit: float
+    remote_bytes_per_commit: float
+    objects_per_commit: float
+
+    @property
+    def local_bytes(self) -> int:
+        """Projected growth of the repository's object store."""
+        return round(self.local_bytes_per_commit * self.count)
+
+    @property
+    def remote_bytes(self) -> int:
+        """Projected growth of the remote's object store."""
+        return round(self.remote_bytes_per_commit * self.count)
+
+    def to_dict(self) -> Dict:
+        """Return the projection as plain data."""
+        return dict(asdict(self), local_bytes=self.local_bytes, remote_bytes=self.remote_bytes)
+
+
+def projected_pushes(count: int, push_every: int, commit_seconds: float, delay: float,
+                     push_seconds: float, push_seconds_per_commit: float = 0.0) -> int:
+    """Return how many pushes a run makes, allowing for pushes folded together."""
+    if not count:
+        return 0
+    if not push_every:
+        return 1
+    if push_every == 1:
+        return count
+    requested = math.ceil(count / push_every)
+    interval = push_every * (commit_seconds + delay)
+    push_time = push_seconds + push_seconds_per_commit * push_every
+    if push_time <= interval:
+        return requested
+    # Pushes run back to back, each carrying what was committed during the one before
+    run_time = count * (commit_seconds + delay)
+    return max(1, min(requested, math.ceil(run_time / push_time) + 1))
+
+
+def projected_seconds(count: int, push_every: int, commit_seconds: float, delay: float,
+                      push_seconds: float, push_seconds_per_commit: float, pushes: int) -> float:
+    """Return how long a run takes, from its start to the end of its last push."""
+    if not count:
+        return 0.0
+    committing = count * commit_seconds + (count - 1) * delay
+    carried = count / max(pushes, 1)
+    last_push = push_seconds + push_seconds_per_commit * carried
+    if not push_every:
+        return committing + last_push
+    if push_every == 1:
+        # Each push finishes before the next commit is made
+        return committing + pushes * last_push
+    # Pushing starts after the first push_every commits; it can fall behind the commits
+    pushing = push_every * commit_seconds + pushes * last_push
+    return max(committing + last_push, pushing)
+
+
+def _object_store(repo: git.Repo) -> Tuple[int, int]:
+    """Return ``(bytes, objects)`` in ``repo``'s own object store, not counting borrowed objects."""
+    counts = dict(line.split(': ', 1) for line in repo.git.count_objects('-v').splitlines())
+    return ((int(counts['size']) + int(counts['size-pack'])) * 1024,
+            int(counts['count']) + int(counts['in-pack']))
+
+
+def _push_totals() -> Tuple[float, int]:
+    """Return the ``(seconds, pushes)`` recorded in the push_seconds metric so far."""
+    for histogram in metrics.to_dict()['histograms']:
+        if histogram['name'] == 'push_seconds' and not histogram['labels']:
+            return histogram['sum'], histogram['count']
+    return 0.0, 0
+
+
+class _ScratchConfig:
+    """The user's settings, read-only, with a scratch config directory."""
+
+    def __init__(self, config, config_dir: Path):
+        self._config = config
+        self.config_dir = config_dir
+
+    def get(self, key: str, default=None):
+        return self._config.get(key, default)
+
+
+class _SimulatedCommit(GitHubAutoCommit):
+    """Commits to the throwaway copy, which never pushes to GitHub."""
+
+    def _validate_repo(self) -> None:
+        # No GitHub credentials are needed; the copy always has its local origin
+        pass
+
+
+def _throwaway_copy(real: git.Repo, root: Path) -> git.Repo:
+    """Set up a clone of ``real`` under ``root`` whose ``origin`` is a local bare repository."""
+    try:
+        branch = real.active_branch.name
+    except TypeError:
+        raise Exception("Check out a branch before simulating a run.")
+    source = real.common_dir
+    if real.head.is_valid():
+        git.Repo.clone_from(source, root / 'origin.git', bare=True, shared=True)
+        clone = git.Repo.clone_from(source, root / 'work', shared=True, no_checkout=True,
+                                    branch=branch)
+        # Point origin at the throwaway remote before anything can push
+        clone.remote('origin').set_url(str(root / 'origin.git'))
+        clone.git.read_tree('HEAD')
+    else:
+        git.Repo.init(root / 'origin.git', bare=True)
+        clone = git.Repo.init(root / 'work', initial_branch=branch)
+        clone.create_remote('origin', str(root / 'origin.git'))
+    reader = real.config_reader()
+    with clone.config_writer() as writer:
+        for key in ('name', 'email'):
+            if reader.has_option('user', key):
+                writer.set_value('user', key, reader.get_value('user', key))
+    return clone
+
+
+def simulate(config, count: int, delay: int = 0, push_every: Optional[int] = None,
+             backend: Optional[str] = None, message: Optional[str] = None,
+             repo_dir: Optional[Path] = None, sample: int = SAMPLE_COMMITS,
+             push_latency: float = 0.0) -> Projection:
+    """Measure a sample of a ``count``-commit run on a throwaway copy and project the whole run."""
+    try:
+        real = git.Repo(repo_dir or Path.cwd())
+    except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError):
+        raise Exception("Not a valid Git repository. Please run this from a Git repository.")
+    if push_every is None:
+        push_every = config.get('push_every', 0)
+    backend = backend or config.get('commit_backend', 'index')
+    sampled = max(1, min(count, sample))
+
+    with tempfile.TemporaryDirectory(prefix='github-auto-commit-simulate-') as temp_dir:
+        root = Path(temp_dir)
+        clone = _throwaway_copy(real, root)
+        remote = git.Repo(root / 'origin.git')
+        auto_commit = _SimulatedCommit(_ScratchConfig(config, root / 'config'), backend=backend,
+                                       repo_dir=root / 'work')
+        try:
+            with metrics.isolated():
+                local_before, objects_before = _object_store(clone)
+                remote_before, _ = _object_store(remote)
+
+                # Delays are projected rather than slept
+                auto_commit.run_commits(sampled, message=message, push_every=push_every)
+
+                local_after, objects_after = _object_store(clone)
+                remote_after, _ = _object_store(remote)
+                commit_seconds = [record['seconds'] for record in auto_commit.journal.records()
+                                  if record['type'] == 'commit']
+
+                # Pushes timed with nothing else running: one commit, then several
+                push_costs = []
+                for carried in (1, PUSH_SAMPLE):
+                    before = _push_totals()[0]
+                    auto_commit.run_commits(carried, message=message, push_every=0)
+                    push_costs.append(_push_totals()[0] - before)
+        finally:
+            auto_commit.journal.close()
+            if auto_commit._messages is not None:
+                auto_commit._messages.close()
+            auto_commit.repo.close()
+            clone.close()
+            remote.close()
+
+    per_commit = max(0.0, (push_costs[1] - push_costs[0]) / (PUSH_SAMPLE - 1))
+    fixed_push = max(0.0, push_costs[0] - per_commit) + push_latency
+    commit_mean = sum(commit_seconds) / len(commit_seconds)
+
+    batch = getattr(auto_commit.backend, 'batch', False)
+    run_delay = 0 if batch else delay
+    run_push_every = 0 if batch else push_every
+    pushes = projected_pushes(count, run_push_every, commit_mean, run_delay, fixed_push, per_commit)
+    return Projection(
+        count=count,
+        delay=run_delay,
+        push_every=run_push_every,
+        backend=backend,
+        sampled=sampled,
+        commit_seconds=commit_mean,
+        push_seconds=fixed_push,
+        push_seconds_per_commit=per_commit,
+        pushes=pushes,
+        seconds=projected_seconds(count, run_push_every, commit_mean, run_delay, fixed_push,
+                                  per_commit, pushes),
+        local_bytes_per_commit=(local_after - local_before) / sampled,
+        remote_bytes_per_commit=(remote_after - remote_before) / sampled,
+        objects_per_commit=(objects_after - objects_before) / sampled,
+    )
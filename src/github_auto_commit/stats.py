@@ -1,61 +1,281 @@
 """Statistics module for GitHub Auto Commit."""
 import os
-from datetime import datetime, timedelta
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from collections import defaultdict, deque
 import requests
+from requests.adapters import HTTPAdapter
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress
 from rich import box
 
+from .heatmap import render_heatmap
+from .http_cache import ResponseCache
+from .metrics import metrics
+from .ratelimit import RateLimiter
+
 console = Console()
 
+API_URL = 'https://api.github.com'
+PER_PAGE = 100
+BACKENDS = ('rest', 'graphql')
+
+# contributionsCollection spans at most one year, and these connections at most 100 items
+GRAPHQL_MAX_DAYS = 365
+GRAPHQL_PAGE = 100
+CONTRIBUTIONS_QUERY = """
+query($login: String!, $from: DateTime!, $to: DateTime!) {
+  user(login: $login) {
+    contributionsCollection(from: $from, to: $to) {
+      commitContributionsByRepository(maxRepositories: 100) {
+        repository { name owner { login } }
+        contributions(first: 100) {
+          pageInfo { hasNextPage }
+          nodes { occurredAt commitCount }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class GraphQLUnavailable(Exception):
+    """The GraphQL backend cannot answer this query completely."""
+
+
 class ContributionStats:
     """Class to handle contribution statistics."""
     
-    def __init__(self, token):
-        """Initialize with GitHub token."""
+    def __init__(self, token, api_url=API_URL, max_workers=8, cache=True, backend='rest'):
+        """Initialize with GitHub token.
+
+        Requests share one keep-alive ``requests.Session`` whose connection
+        pool holds ``max_workers`` connections, one per fetch worker.
+        ``cache`` is a ``ResponseCache``, ``True`` for the default on-disk
+        cache under ``~/.github_auto_commit`` or ``False`` to disable caching.
+        Every request goes through a ``RateLimiter`` that throttles the
+        workers as quota runs low and retries rate-limit responses.
+        ``backend`` is ``rest`` (one request per repository) or ``graphql``
+        (a single ``contributionsCollection`` query, falling back to REST
+        when it can't answer completely).
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown stats backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
         self.token = token
+        self.backend = backend
+        self.api_url = api_url.rstrip('/')
+        self.max_workers = max_workers
         self.headers = {
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github.v3+json'
         }
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(max_workers, 1))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if cache is True:
+            cache = ResponseCache()
+        self.cache = cache or None
+        self.limiter = RateLimiter(max_concurrency=max_workers)
+    
+    def _send(self, api, send):
+        """Send a request through the rate limiter, recording its latency and status."""
+        def timed():
+            with metrics.timer('api_request_seconds', api=api):
+                response = send()
+            metrics.increment('api_responses_total', api=api, status=response.status_code)
+            return response
+        return self.limiter.request(timed)
+    
+    def _get_page(self, url, params=None):
+        """Fetch one page and return ``(body, next_url)``.
+
+        With a cache, the request carries the stored ``ETag``/``Last-Modified``
+        validators and a ``304 Not Modified`` answer is served from the cache.
+        Entries are kept per token, so accounts sharing the cache never see
+        each other's pages.
+        """
+        key = entry = None
+        headers = {}
+        if self.cache is not None:
+            key = self.cache.key(url, params, scope=self.token)
+            entry = self.cache.load(key)
+            if entry is not None and 'body' in entry:
+                if entry.get('etag'):
+                    headers['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    headers['If-Modified-Since'] = entry['last_modified']
+            else:
+                entry = None
+        
+        response = self._send('rest', lambda: self.session.get(url, params=params, headers=headers))
+        if response.status_code == 304:
+            if entry is not None:
+                self.cache.record(hit=True)
+                return entry['body'], entry.get('next')
+            # Nothing to serve it from (a proxy revalidated on our behalf); ask for the page itself
+            response = self._send('rest', lambda: self.session.get(
+                url, params=params, headers={'Cache-Control': 'no-cache'}))
+            if response.status_code == 304:
+                raise Exception(f"GitHub answered 304 Not Modified for {url} without a cached copy")
+        if response.status_code == 409:
+            # Empty repository
+            return [], None
+        response.raise_for_status()
         
-    def get_user_stats(self, username, days=30):
-        """Get user contribution statistics."""
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
+        body = response.json()
+        next_url = response.links.get('next', {}).get('url')
+        if self.cache is not None:
+            self.cache.record(hit=False)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self.cache.store(key, {'etag': etag, 'last_modified': last_modified,
+                                       'body': body, 'next': next_url})
+        return body, next_url
+    
+    def _paginate(self, url, params=None):
+        """Yield the items of every page of a list endpoint, following ``Link`` headers."""
+        params = dict(params or {}, per_page=PER_PAGE)
+        while url:
+            page, url = self._get_page(url, params)
+            if not isinstance(page, list):
+                return
+            yield from page
+            # The next link already carries the query string
+            params = None
+    
+    def iter_repos(self, username):
+        """Yield every repository of ``username``."""
+        yield from self._paginate(f'{self.api_url}/users/{username}/repos')
+    
+    def iter_commits(self, username, repo_name, since):
+        """Yield the commits ``username`` authored in a repository since ``since``.
+
+        Commits come newest first, so iteration stops at the first commit
+        older than ``since`` without requesting further pages.
+        """
+        since_str = since.strftime('%Y-%m-%dT%H:%M:%SZ')
+        commits_url = f'{self.api_url}/repos/{username}/{repo_name}/commits'
+        for commit in self._paginate(commits_url, {'since': since_str, 'author': username}):
+            info = commit['commit']
+            if info.get('committer', info['author'])['date'] < since_str:
+                return
+            yield commit
+    
+    def _fetch_repo_commits(self, username, repo_name, since):
+        """Return ``{date: commits}`` for one repository."""
+        counts = defaultdict(int)
+        for commit in self.iter_commits(username, repo_name, since):
+            counts[commit['commit']['author']['date'][:10]] += 1
+        return counts
         
-        # Get user's repositories
-        repos_url = f'https://api.github.com/users/{username}/repos'
-        response = requests.get(repos_url, headers=self.headers)
-        repos = response.json()
+    def _graphql_stats(self, username, days):
+        """Get ``(stats, repo_stats)`` from one GraphQL ``contributionsCollection`` query.
+
+        Only repositories owned by ``username`` are counted, matching the
+        REST path. Raises ``GraphQLUnavailable`` when the window is too long
+        or the result was truncated.
+        """
+        if days > GRAPHQL_MAX_DAYS:
+            raise GraphQLUnavailable(f"GraphQL contributions cover at most {GRAPHQL_MAX_DAYS} days")
+        end_date = datetime.now(timezone.utc)
+        start_date = (end_date - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        variables = {
+            'login': username,
+            'from': start_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'to': end_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        }
+        
+        response = self._send('graphql', lambda: self.session.post(
+            f'{self.api_url}/graphql', json={'query': CONTRIBUTIONS_QUERY, 'variables': variables}))
+        if response.status_code != 200:
+            raise GraphQLUnavailable(f"HTTP {response.status_code}")
+        result = response.json()
+        if result.get('errors') or not (result.get('data') or {}).get('user'):
+            errors = result.get('errors') or [{'message': 'user not found'}]
+            raise GraphQLUnavailable(errors[0].get('message', 'query failed'))
+        
+        by_repo = result['data']['user']['contributionsCollection']['commitContributionsByRepository']
+        if len(by_repo) >= GRAPHQL_PAGE:
+            raise GraphQLUnavailable("more than 100 repositories contributed to")
+        
+        stats = defaultdict(int)
+        repo_stats = defaultdict(int)
+        for entry in by_repo:
+            repository = entry['repository']
+            if repository['owner']['login'].lower() != username.lower():
+                continue
+            if entry['contributions']['pageInfo']['hasNextPage']:
+                raise GraphQLUnavailable(f"too many contribution days in {repository['name']}")
+            for node in entry['contributions']['nodes']:
+                stats[node['occurredAt'][:10]] += node['commitCount']
+                repo_stats[repository['name']] += node['commitCount']
+        return stats, repo_stats
+    
+    def get_user_stats(self, username, days=30, max_workers=None, backend=None):
+        """Get user contribution statistics.
+
+        ``backend`` overrides the backend chosen in the constructor. The
+        GraphQL backend falls back to REST when it can't answer completely.
+        """
+        if (backend or self.backend) == 'graphql':
+            try:
+                return self._graphql_stats(username, days)
+            except (GraphQLUnavailable, requests.RequestException) as e:
+                console.print(f"[yellow]GraphQL stats unavailable ({e}); falling back to REST.[/yellow]")
+        return self._rest_stats(username, days, max_workers)
+    
+    def _rest_stats(self, username, days, max_workers=None):
+        """Get user contribution statistics from the REST API.
+
+        Repositories are streamed page by page and fetched concurrently by up
+        to ``max_workers`` threads (default: the value given to the
+        constructor; 1 fetches serially). At most two fetches per worker are
+        in flight, and results are merged in repository order as they
+        complete, so memory stays flat and results are identical to a serial
+        fetch.
+        """
+        # Whole UTC days, so repeated runs on the same day reuse cached responses
+        start_date = (datetime.now(timezone.utc) - timedelta(days=days)).replace(
+            hour=0, minute=0, second=0, microsecond=0)
+        workers = max(max_workers or self.max_workers, 1)
         
         stats = defaultdict(int)
         repo_stats = defaultdict(int)
         
-        with Progress() as progress:
-            task = progress.add_task("[cyan]Analyzing repositories...", total=len(repos))
+        def fetch(repo_name):
+            try:
+                return self._fetch_repo_commits(username, repo_name, start_date), None
+            except Exception as e:
+                return None, e
+        
+        def merge(repo_name, future):
+            counts, error = future.result()
+            if error is not None:
+                console.print(f"[yellow]Warning: Could not fetch commits for {repo_name}: {str(error)}[/yellow]")
+            else:
+                for date, count in counts.items():
+                    stats[date] += count
+                    repo_stats[repo_name] += count
+            progress.update(task, advance=1)
+        
+        with Progress() as progress, ThreadPoolExecutor(max_workers=workers) as executor:
+            task = progress.add_task("[cyan]Analyzing repositories...", total=None)
             
-            for repo in repos:
-                repo_name = repo['name']
-                commits_url = f'https://api.github.com/repos/{username}/{repo_name}/commits'
-                params = {'since': start_date.isoformat(), 'author': username}
-                
-                try:
-                    response = requests.get(commits_url, headers=self.headers, params=params)
-                    commits = response.json()
-                    
-                    if isinstance(commits, list):
-                        for commit in commits:
-                            date = commit['commit']['author']['date'][:10]
-                            stats[date] += 1
-                            repo_stats[repo_name] += 1
-                            
-                except Exception as e:
-                    console.print(f"[yellow]Warning: Could not fetch commits for {repo_name}: {str(e)}[/yellow]")
-                
-                progress.update(task, advance=1)
+            pending = deque()
+            seen = 0
+            for repo in self.iter_repos(username):
+                pending.append((repo['name'], executor.submit(fetch, repo['name'])))
+                seen += 1
+                if len(pending) >= 2 * workers:
+                    merge(*pending.popleft())
+            progress.update(task, total=seen)
+            while pending:
+                merge(*pending.popleft())
         
         return stats, repo_stats
     
@@ -97,60 +317,12 @@ class ContributionStats:
         # Activity heatmap
         console.print("🔥 Activity Heatmap")
         self._display_heatmap(stats, days)
+        
+        if self.cache is not None:
+            report = self.cache.report()
+            console.print(f"\n[dim]💾 API cache: {report['hits']} hits, {report['misses']} misses, "
+                          f"{report['entries']} entries ({report['bytes'] / 1024:.0f} KiB)[/dim]")
     
     def _display_heatmap(self, stats, days):
-        """Display an ASCII heatmap of contributions."""
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        
-        current_date = start_date
-        calendar = []
-        week = []
-        
-        # Fill in missing dates with zero commits
-        while current_date <= end_date:
-            date_str = current_date.strftime('%Y-%m-%d')
-            count = stats.get(date_str, 0)
-            
-            # Determine color based on commit count
-            if count == 0:
-                color = "white"
-            elif count <= 2:
-                color = "green"
-            elif count <= 5:
-                color = "yellow"
-            else:
-                color = "red"
-            
-            week.append((date_str, count, color))
-            
-            if current_date.weekday() == 6:
-                calendar.append(week)
-                week = []
-            
-            current_date += timedelta(days=1)
-        
-        if week:
-            calendar.append(week)
-        
-        # Print weekday headers
-        console.print("   Mo Tu We Th Fr Sa Su")
-        
-        # Print calendar with colored squares
-        for week in calendar:
-            line = ""
-            for date, count, color in week:
-                if count == 0:
-                    symbol = "⬜"
-                elif count <= 2:
-                    symbol = "🟩"
-                elif count <= 5:
-                    symbol = "🟨"
-                else:
-                    symbol = "🟥"
-                line += f" {symbol}"
-            console.print(line)
-        
-        # Print legend
-        console.print("\nLegend:")
-        console.print("⬜ No commits  🟩 1-2 commits  🟨 3-5 commits  🟥 >5 commits")
+        """Display a GitHub-style heatmap of contributions."""
+        console.print(render_heatmap(stats, days))
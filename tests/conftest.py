@@ -0,0 +1,260 @@
+"""Shared fixtures for the GitHub Auto Commit test suite."""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import git
+import pytest
+
+from github_auto_commit.config import Config
+
+
+@pytest.fixture
+def home_config(tmp_path, monkeypatch):
+    """Create a Config stored under a throwaway home directory."""
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+
+    test_config = Config()
+    test_config.set("github_username", "test-user")
+    test_config.set("github_token", "test-token")
+    return test_config
+
+
+@pytest.fixture
+def repo_with_remote(tmp_path, monkeypatch):
+    """Create a working repository with a local bare repository as ``origin``."""
+    work_dir = tmp_path / "work"
+    remote_dir = tmp_path / "remote.git"
+
+    repo = git.Repo.init(work_dir)
+    with repo.config_writer() as git_config:
+        git_config.set_value('user', 'name', 'Test User')
+        git_config.set_value('user', 'email', 'test@example.com')
+
+    test_file = work_dir / "test.txt"
+    test_file.write_text("test content")
+    repo.index.add([str(test_file)])
+    repo.index.commit("Initial commit")
+
+    git.Repo.init(remote_dir, bare=True)
+    repo.create_remote('origin', str(remote_dir))
+
+    monkeypatch.chdir(work_dir)
+    return repo, git.Repo(remote_dir)
+
+
+class StubGitHub:
+    """Minimal local stand-in for the parts of the GitHub REST API the stats use."""
+
+    def __init__(self, username="test-user"):
+        self.username = username
+        self.repos = {}
+        self.latency = 0.0
+        self.ignore_since = False
+        self.requests = []
+        self.not_modified = 0
+        self.force_not_modified = 0
+        self.quota = None
+        self.quota_window = 1.0
+        self.retry_after = []
+        self.graphql_error = None
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._remaining = None
+        self._reset_at = 0.0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def add_repo(self, name, commit_dates):
+        """Register a repository whose commits were authored on ``commit_dates``."""
+        self.repos[name] = sorted(commit_dates, reverse=True)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with stub._lock:
+                    stub.requests.append(url.path)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    if not self._rate_limited():
+                        self._serve(url, query)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length))
+                with stub._lock:
+                    stub.requests.append(urlparse(self.path).path)
+                variables = payload["variables"]
+                if stub.graphql_error:
+                    body = {"errors": [{"message": stub.graphql_error}]}
+                else:
+                    by_repo = []
+                    for name, dates in stub.repos.items():
+                        days = {}
+                        for date in dates:
+                            if variables["from"] <= date <= variables["to"]:
+                                days[date[:10]] = days.get(date[:10], 0) + 1
+                        if days:
+                            nodes = [{"occurredAt": f"{day}T00:00:00Z", "commitCount": count}
+                                     for day, count in days.items()]
+                            by_repo.append({
+                                "repository": {"name": name, "owner": {"login": stub.username}},
+                                "contributions": {"pageInfo": {"hasNextPage": False},
+                                                  "nodes": nodes},
+                            })
+                    body = {"data": {"user": {"contributionsCollection": {
+                        "commitContributionsByRepository": by_repo}}}}
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _rate_limited(self):
+                """Apply the stub's secondary and primary limits; True if the request was refused."""
+                with stub._lock:
+                    if stub.retry_after:
+                        self.send_response(429)
+                        self.send_header("Retry-After", str(stub.retry_after.pop(0)))
+                        self.end_headers()
+                        return True
+                    if stub.quota is None:
+                        return False
+                    now = time.time()
+                    if stub._remaining is None or now >= stub._reset_at:
+                        stub._remaining, stub._reset_at = stub.quota, now + stub.quota_window
+                    self.rate_headers = {"X-RateLimit-Remaining": str(max(stub._remaining - 1, 0)),
+                                         "X-RateLimit-Reset": str(stub._reset_at)}
+                    if stub._remaining <= 0:
+                        self.send_response(403)
+                        for name, value in self.rate_headers.items():
+                            self.send_header(name, value)
+                        self.end_headers()
+                        return True
+                    stub._remaining -= 1
+                    return False
+
+            def _serve(self, url, query):
+                time.sleep(stub.latency)
+                parts = url.path.strip("/").split("/")
+                if parts[:1] == ["users"] and parts[2:] == ["repos"]:
+                    items = [{"name": name} for name in stub.repos]
+                elif parts[:1] == ["repos"] and parts[3:] == ["commits"] and parts[2] in stub.repos:
+                    since = "" if stub.ignore_since else query.get("since", "")
+                    items = [{"commit": {"author": {"date": date}, "committer": {"date": date}}}
+                             for date in stub.repos[parts[2]] if date >= since]
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                per_page = int(query.get("per_page", 30))
+                page = int(query.get("page", 1))
+                body = items[(page - 1) * per_page:page * per_page]
+                data = json.dumps(body).encode()
+                etag = f'"{hashlib.sha1(data).hexdigest()}"'
+                with stub._lock:
+                    forced = stub.force_not_modified > 0 and "no-cache" not in self.headers.get(
+                        "Cache-Control", "")
+                    if forced:
+                        stub.force_not_modified -= 1
+                if forced or self.headers.get("If-None-Match") == etag:
+                    with stub._lock:
+                        stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                for name, value in getattr(self, "rate_headers", {}).items():
+                    self.send_header(name, value)
+                self.send_header("ETag", etag)
+                if page * per_page < len(items):
+                    query.update(page=str(page + 1), per_page=str(per_page))
+                    next_url = f"{stub.url}{url.path}?{urlencode(query)}"
+                    self.send_header("Link", f'<{next_url}>; rel="next"')
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+@pytest.fixture
+def github_stub(tmp_path, monkeypatch):
+    """Serve a StubGitHub on a local port for the duration of a test.
+
+    HOME points at a throwaway directory so the response cache starts empty.
+    """
+    monkeypatch.setenv("HOME", str(tmp_path))
+    stub = StubGitHub()
+    thread = threading.Thread(target=stub.server.serve_forever, daemon=True)
+    thread.start()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+class FlakyRemote:
+    """Control a local bare remote whose receive-pack can be made to fail."""
+
+    def __init__(self, repo, remote, script_dir):
+        self.repo = repo
+        self.remote = remote
+        self.failures_file = script_dir / "failures"
+        self.calls_file = script_dir / "calls"
+        self.failures_file.write_text("")
+        script = script_dir / "receive-pack"
+        # Each call logs itself, then either fails with the next queued message or runs normally
+        script.write_text(
+            "#!/bin/sh\n"
+            f"echo call >> '{self.calls_file}'\n"
+            f"message=$(head -n 1 '{self.failures_file}')\n"
+            "if [ -n \"$message\" ]; then\n"
+            f"  sed -i '1d' '{self.failures_file}'\n"
+            "  echo \"$message\" >&2\n"
+            "  exit 128\n"
+            "fi\n"
+            "exec git-receive-pack \"$@\"\n"
+        )
+        script.chmod(0o755)
+        with repo.config_writer() as git_config:
+            git_config.set_value('remote "origin"', 'receivepack', str(script))
+
+    def fail_next(self, count, message="ssh: connect to host example.com port 22: Connection timed out"):
+        """Make the next ``count`` pushes fail with ``message`` on stderr."""
+        with open(self.failures_file, "a") as f:
+            f.write(f"{message}\n" * count)
+
+    @property
+    def calls(self):
+        """Number of pushes that reached the remote."""
+        return len(self.calls_file.read_text().splitlines()) if self.calls_file.exists() else 0
+
+
+@pytest.fixture
+def flaky_remote(repo_with_remote, tmp_path):
+    """A ``repo_with_remote`` whose pushes can be made to fail on demand."""
+    repo, remote = repo_with_remote
+    script_dir = tmp_path / "flaky"
+    script_dir.mkdir()
+    return FlakyRemote(repo, remote, script_dir)
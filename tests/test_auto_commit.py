@@ -0,0 +1,129 @@
+"""Tests for the commit and push flow of GitHubAutoCommit."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from github_auto_commit.auto_commit import GitHubAutoCommit
+from github_auto_commit.backends import FastImportBackend
+from github_auto_commit.push import REJECTED, BackgroundPusher, PushError
+
+
+def _no_background_pusher(self, *args, **kwargs):
+    raise AssertionError("Pushed in the background")
+
+
+def test_make_commits_batches_pushes(repo_with_remote, home_config, monkeypatch):
+    """A push is requested every ``push_every`` commits, plus one for the remainder."""
+    repo, remote = repo_with_remote
+    request = BackgroundPusher.request
+
+    def request_and_wait(self, committed):
+        # Let each push finish before the next commit, so none are folded
+        request(self, committed)
+        while self.pushed < committed and self.error is None:
+            time.sleep(0.01)
+
+    monkeypatch.setattr(BackgroundPusher, 'request', request_and_wait)
+    auto_commit = GitHubAutoCommit(home_config)
+
+    summary = auto_commit.make_commits(5, push_every=2)
+
+    assert summary['commits'] == 5
+    assert summary['pushes'] == 3
+    assert summary['pushes_saved'] == 2
+    assert remote.head.commit == repo.head.commit
+
+
+def test_make_commits_pushes_once_by_default(repo_with_remote, home_config):
+    """Without ``push_every`` the whole run is pushed once at the end."""
+    repo, remote = repo_with_remote
+    auto_commit = GitHubAutoCommit(home_config)
+
+    summary = auto_commit.make_commits(4)
+
+    assert summary['pushes'] == 1
+    assert summary['pushes_saved'] == 3
+    assert remote.head.commit == repo.head.commit
+
+
+def test_make_commits_per_commit_push(repo_with_remote, home_config, monkeypatch):
+    """``push_every=1`` pushes each commit before making the next one."""
+    repo, remote = repo_with_remote
+    monkeypatch.setattr(BackgroundPusher, '__init__', _no_background_pusher)
+    auto_commit = GitHubAutoCommit(home_config)
+    pushed = []
+    push = auto_commit._push_commits
+
+    def push_and_record():
+        push()
+        pushed.append(remote.head.commit.hexsha)
+
+    auto_commit._push_commits = push_and_record
+
+    summary = auto_commit.make_commits(3, push_every=1)
+
+    assert summary['commits'] == 3
+    assert summary['pushes'] == 3
+    assert summary['pushes_saved'] == 0
+    assert pushed == [commit.hexsha for commit in reversed(list(repo.iter_commits(max_count=3)))]
+
+
+def test_commits_made_during_a_push_are_folded(home_config, repo_with_remote):
+    """Commits keep being made while a push runs and go out together in the next push."""
+    release = threading.Event()
+    pushes = []
+
+    def slow_push():
+        pushes.append(len(descriptions))
+        assert release.wait(5)
+
+    def on_progress(advance, description):
+        descriptions.append(description)
+        if description.startswith("Committed 10/10, pushed 0"):
+            # Everything has been requested while the first push is still running
+            release.set()
+
+    descriptions = []
+    auto_commit = GitHubAutoCommit(home_config)
+    auto_commit._push_commits = slow_push
+
+    summary = auto_commit.run_commits(10, push_every=2, on_progress=on_progress)
+
+    assert summary['commits'] == 10
+    assert summary['pushes'] == 2
+    assert len(pushes) == 2
+    assert "Committed 10/10, pushed 2" in descriptions
+    assert "Committed 10/10, pushed 10" in descriptions
+    assert any(d.startswith("Committed 1/10, pushed 0") for d in descriptions)
+
+
+def test_push_error_reaches_caller(flaky_remote, home_config):
+    """A failure in the background pusher stops the run and is raised to the caller."""
+    flaky_remote.fail_next(1, " ! [remote rejected] master -> master (pre-receive hook declined)")
+    auto_commit = GitHubAutoCommit(home_config)
+
+    with pytest.raises(PushError) as excinfo:
+        auto_commit.make_commits(3, push_every=2)
+    assert excinfo.value.kind == REJECTED
+
+
+def test_get_stats_counts_beyond_100_commits(repo_with_remote, home_config):
+    """Stats cover every commit in the window, not just the newest 100."""
+    repo, _ = repo_with_remote
+    now = int(time.time())
+    old = [(f"Old {i}", str(i), now - 90 * 86400 + i) for i in range(20)]
+    recent = [(f"Recent {i}", str(i), now - 3 * 86400 + i * 60) for i in range(150)]
+    FastImportBackend(repo, Path(repo.working_dir)).commit_many(old + recent)
+
+    stats = GitHubAutoCommit(home_config).get_stats(days=30)
+
+    # The 150 recent commits plus the fixture's initial commit
+    assert stats['total_commits'] == 151
+    assert stats['days_active'] in (1, 2)
+    assert stats['messages'][0] == "Recent 149"
+    assert len(stats['messages']) == 10
+    assert stats['last_commit'].startswith(
+        time.strftime('%Y-%m-%dT%H:%M', time.localtime(recent[-1][2])))
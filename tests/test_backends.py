@@ -0,0 +1,134 @@
+"""Tests for the commit backends."""
+
+from pathlib import Path
+
+import pytest
+
+from github_auto_commit.auto_commit import GitHubAutoCommit
+from github_auto_commit.backends import (
+    FastImportBackend,
+    IndexBackend,
+    ObjectBackend,
+    get_backend,
+)
+
+
+def _clone(repo, path):
+    """Clone ``repo`` with the same committer identity."""
+    clone = repo.clone(str(path))
+    with clone.config_writer() as git_config:
+        git_config.set_value('user', 'name', 'Test User')
+        git_config.set_value('user', 'email', 'test@example.com')
+    return clone
+
+
+def test_object_backend_leaves_worktree_and_index(repo_with_remote):
+    """The object backend advances the branch without touching files or the index."""
+    repo, _ = repo_with_remote
+    work_dir = Path(repo.working_dir)
+    parent = repo.head.commit
+
+    sha = ObjectBackend(repo, work_dir).commit("Object commit", "2024-01-01T00:00:00")
+
+    commit = repo.head.commit
+    assert commit.hexsha == sha
+    assert commit.parents == (parent,)
+    assert commit.message == "Object commit"
+    assert commit.tree['.timestamp'].data_stream.read() == b"2024-01-01T00:00:00"
+    assert commit.tree['test.txt'] == parent.tree['test.txt']
+    assert not (work_dir / '.timestamp').exists()
+    assert ('.timestamp', 0) not in repo.index.entries
+
+
+def test_object_backend_matches_index_backend(repo_with_remote, tmp_path):
+    """Both backends produce identical commits for identical input."""
+    repo, _ = repo_with_remote
+    index_repo = _clone(repo, tmp_path / "index")
+    object_repo = _clone(repo, tmp_path / "object")
+    index_backend = IndexBackend(index_repo, Path(index_repo.working_dir))
+    object_backend = ObjectBackend(object_repo, Path(object_repo.working_dir))
+
+    for i in range(3):
+        when = 1700000000 + i * 60
+        index_sha = index_backend.commit(f"Commit {i}", f"content {i}", when=when)
+        object_sha = object_backend.commit(f"Commit {i}", f"content {i}", when=when)
+        assert index_sha == object_sha
+
+
+def test_fast_import_matches_per_commit_history(repo_with_remote, tmp_path):
+    """A fast-import run reproduces the per-commit history exactly."""
+    repo, _ = repo_with_remote
+    index_repo = _clone(repo, tmp_path / "index")
+    import_repo = _clone(repo, tmp_path / "import")
+    plan = [(f"Commit {i}", f"content {i}", 1700000000 + i) for i in range(20)]
+
+    index_shas = IndexBackend(index_repo, Path(index_repo.working_dir)).commit_many(plan)
+    import_shas = FastImportBackend(import_repo, Path(import_repo.working_dir)).commit_many(plan)
+
+    assert import_shas == index_shas
+    assert import_repo.head.commit.hexsha == index_repo.head.commit.hexsha
+
+
+def test_make_commits_with_fast_import_pushes_once(repo_with_remote, home_config):
+    """The fast-import backend imports the whole run and pushes it once."""
+    repo, remote = repo_with_remote
+    home_config.set("commit_messages", ["Only message"])
+    auto_commit = GitHubAutoCommit(home_config, backend='fast-import')
+
+    summary = auto_commit.make_commits(50)
+
+    assert summary == {'commits': 50, 'pushes': 1, 'pushes_saved': 49}
+    assert remote.head.commit == repo.head.commit
+    assert len(list(repo.iter_commits())) == 51
+    assert repo.head.commit.message == "Only message"
+
+
+def test_make_commits_with_object_backend(repo_with_remote, home_config):
+    """GitHubAutoCommit accepts the object backend as a drop-in replacement."""
+    repo, remote = repo_with_remote
+    auto_commit = GitHubAutoCommit(home_config, backend='object')
+
+    auto_commit.make_commits(3, message="Object run")
+
+    assert remote.head.commit == repo.head.commit
+    assert [c.message for c in repo.iter_commits(max_count=3)] == ["Object run"] * 3
+
+
+def test_object_backend_refuses_a_moved_branch(repo_with_remote):
+    """A branch moved by another process between reading and updating it is not clobbered."""
+    repo, _ = repo_with_remote
+    backend = ObjectBackend(repo, Path(repo.working_dir))
+    original = backend._write_objects
+
+    def write_then_race(*args):
+        sha = original(*args)
+        repo.git.commit('--allow-empty', '-m', 'Concurrent commit')
+        return sha
+
+    backend._write_objects = write_then_race
+    with pytest.raises(Exception, match="moved"):
+        backend.commit("Object commit", "2024-01-01T00:00:00")
+
+    assert repo.head.commit.message.strip() == "Concurrent commit"
+    assert not Path(repo.git_dir, repo.head.ref.path + '.lock').exists()
+
+
+def test_object_backend_respects_ref_lock(repo_with_remote):
+    """A ref locked by another git process is left alone."""
+    repo, _ = repo_with_remote
+    head = repo.head.commit
+    lock = Path(repo.git_dir, repo.head.ref.path + '.lock')
+    lock.write_text("held\n")
+
+    with pytest.raises(Exception, match="Unable to lock"):
+        ObjectBackend(repo, Path(repo.working_dir)).commit("Object commit", "2024-01-01T00:00:00")
+
+    assert repo.head.commit == head
+    assert lock.read_text() == "held\n"
+
+
+def test_unknown_backend(repo_with_remote):
+    """An unknown backend name is rejected."""
+    repo, _ = repo_with_remote
+    with pytest.raises(ValueError):
+        get_backend('svn', repo, Path(repo.working_dir))
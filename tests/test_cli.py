@@ -0,0 +1,121 @@
+"""Tests for the non-interactive command-line interface."""
+
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+from github_auto_commit.cli import main
+from github_auto_commit.config import Config
+from github_auto_commit.messages import MessageStore
+
+
+def test_cli_import_is_lazy():
+    """Loading the CLI must not import the interactive or git dependencies."""
+    code = ("import sys, github_auto_commit.cli; "
+            "print(sorted(m for m in ('questionary', 'pyfiglet', 'git') if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == '[]'
+
+
+def test_commit_subcommand(home_config, repo_with_remote):
+    repo, remote = repo_with_remote
+
+    result = CliRunner().invoke(main, ['commit', '-n', '3', '-m', 'Headless commit'])
+
+    assert result.exit_code == 0, result.output
+    assert [c.message for c in remote.iter_commits(repo.active_branch.name, max_count=3)] == \
+        ['Headless commit'] * 3
+
+
+def test_errors_exit_nonzero(home_config, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(main, ['commit', '-n', '1'])
+
+    assert result.exit_code == 1
+    assert 'Not a valid Git repository' in result.output
+
+
+def test_messages_subcommand(home_config):
+    runner = CliRunner()
+    result = runner.invoke(main, ['messages', '--add', 'First', '--add', 'Second'])
+    assert result.exit_code == 0, result.output
+    with MessageStore.for_config(Config()) as store:
+        count = store.slots
+        assert store.messages()[-2:] == ['First', 'Second']
+
+    result = runner.invoke(main, ['messages', '--remove', str(count)])
+    assert result.exit_code == 0, result.output
+    with MessageStore.for_config(Config()) as store:
+        assert store.messages()[-1] == 'First'
+        assert len(store) == count - 1
+
+
+def test_schedule_subcommands(home_config, repo_with_remote):
+    repo, _ = repo_with_remote
+    runner = CliRunner()
+
+    result = runner.invoke(main, ['schedule', 'add', '0 9 * * MON', '-n', '2'])
+    assert result.exit_code == 0, result.output
+    job_id = result.output.split('job ')[1].split()[0]
+
+    result = runner.invoke(main, ['schedule', 'list'])
+    assert job_id in result.output
+
+    result = runner.invoke(main, ['schedule', 'remove', job_id])
+    assert result.exit_code == 0, result.output
+    assert job_id not in runner.invoke(main, ['schedule', 'list']).output
+
+
+def test_bulk_dry_run_prints_plan(home_config, repo_with_remote):
+    repo, _ = repo_with_remote
+    head = repo.head.commit.hexsha
+
+    result = CliRunner().invoke(main, ['bulk', '-n', '20', '--days', '4', '--dry-run'])
+
+    assert result.exit_code == 0, result.output
+    assert '20 commits over 4 days' in result.output
+    assert repo.head.commit.hexsha == head
+
+
+def test_bulk_dry_run_needs_no_repository(tmp_path, monkeypatch):
+    """A non-interactive dry run only plans, so it works outside a repository without credentials."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(main, ['bulk', '-n', '5', '--days', '30', '--dry-run'])
+
+    assert result.exit_code == 0, result.output
+    assert '5 commits over 30 days' in result.output
+
+
+def test_stats_github_backend_is_selectable(github_stub, monkeypatch):
+    from github_auto_commit import stats
+
+    config = Config()
+    config.set("github_username", "test-user")
+    config.set("github_token", "test-token")
+    github_stub.add_repo("repo", [])
+
+    class StubbedStats(stats.ContributionStats):
+        def __init__(self, token, **kwargs):
+            super().__init__(token, api_url=github_stub.url, cache=False, **kwargs)
+
+    monkeypatch.setattr(stats, 'ContributionStats', StubbedStats)
+    runner = CliRunner()
+
+    result = runner.invoke(main, ['stats', '--github', '--backend', 'graphql'])
+    assert result.exit_code == 0, result.output
+    assert 'Contribution Summary' in result.output
+    # One GraphQL query rather than a repository listing plus one request per repository
+    assert github_stub.requests == ['/graphql']
+
+    # The config setting is the default
+    config.set("stats_backend", "rest")
+    result = runner.invoke(main, ['stats', '--github'])
+    assert result.exit_code == 0, result.output
+    assert '/graphql' not in github_stub.requests[1:]
+
+    result = runner.invoke(main, ['stats', '--backend', 'graphql'])
+    assert result.exit_code == 2
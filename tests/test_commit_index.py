@@ -0,0 +1,122 @@
+"""Tests for the incremental commit index."""
+
+import threading
+import time
+from pathlib import Path
+
+from github_auto_commit.auto_commit import GitHubAutoCommit, scan_history
+from github_auto_commit.backends import FastImportBackend
+from github_auto_commit.commit_index import CommitIndex
+
+
+def _plan(prefix, count, start):
+    return [(f"{prefix} {i}", f"{prefix}{i}", start + i * 60) for i in range(count)]
+
+
+def test_refresh_walks_only_new_commits(repo_with_remote, tmp_path):
+    """A refresh after new commits only walks those commits."""
+    repo, _ = repo_with_remote
+    backend = FastImportBackend(repo, Path(repo.working_dir))
+    now = int(time.time())
+    backend.commit_many(_plan("First", 30, now - 5 * 86400))
+
+    index = CommitIndex(repo, tmp_path / "index")
+    assert index.refresh() == 31
+    assert index.refresh() == 0
+
+    backend.commit_many(_plan("Second", 5, now - 3600))
+    assert index.refresh() == 5
+
+    stats = index.stats(30)
+    assert stats['total_commits'] == 36
+    assert stats['messages'][:2] == ["Second 4", "Second 3"]
+    assert len(stats['messages']) == 10
+    assert index.stats(1)['total_commits'] in (5, 6)
+    index.close()
+
+
+def test_rewritten_history_rebuilds(repo_with_remote, tmp_path):
+    """Rewriting history drops commits that are no longer reachable."""
+    repo, _ = repo_with_remote
+    backend = FastImportBackend(repo, Path(repo.working_dir))
+    base = repo.head.commit
+    now = int(time.time())
+    backend.commit_many(_plan("Doomed", 10, now - 7200))
+
+    index = CommitIndex(repo, tmp_path / "index")
+    index.refresh()
+    assert index.stats(30)['total_commits'] == 11
+
+    repo.head.reset(base, index=True, working_tree=True)
+    backend.commit_many(_plan("Kept", 2, now - 600))
+    assert index.refresh() == 3
+    assert index.stats(30)['total_commits'] == 3
+    assert "Doomed 9" not in index.stats(30)['messages']
+    index.close()
+
+
+def test_index_persists_between_instances(repo_with_remote, tmp_path):
+    """A new CommitIndex for the same repository reuses the stored index."""
+    repo, _ = repo_with_remote
+    CommitIndex(repo, tmp_path / "index").refresh()
+
+    reopened = CommitIndex(repo, tmp_path / "index")
+    assert reopened.refresh() == 0
+    assert reopened.stats(30)['total_commits'] == 1
+    reopened.close()
+
+
+def test_index_and_scan_agree_at_window_edges(repo_with_remote, tmp_path):
+    """The index and the history scan use the same window for counts and messages."""
+    repo, _ = repo_with_remote
+    now = int(time.time())
+    ages = (31.2, 30.5, 30.2, 29.9, 0.5)
+    FastImportBackend(repo, Path(repo.working_dir)).commit_many(
+        [(f"Aged {age}", str(age), int(now - age * 86400)) for age in ages])
+
+    index = CommitIndex(repo, tmp_path / "index")
+    index.refresh()
+    for days in (1, 29, 30, 31, 32):
+        stats = index.stats(days)
+        assert stats == scan_history(repo, days)
+        # Every commit in the window is among the newest ten here
+        assert len(stats['messages']) == stats['total_commits']
+    index.close()
+
+
+def test_concurrent_refreshes_count_once(repo_with_remote, tmp_path):
+    """Processes refreshing the same index at once don't add the same commits twice."""
+    repo, _ = repo_with_remote
+    CommitIndex(repo, tmp_path / "index").refresh()
+    FastImportBackend(repo, Path(repo.working_dir)).commit_many(
+        _plan("Raced", 50, int(time.time()) - 3600))
+
+    barrier = threading.Barrier(4)
+    walked = []
+
+    def refresh():
+        index = CommitIndex(repo, tmp_path / "index")
+        barrier.wait()
+        walked.append(index.refresh())
+        index.close()
+
+    threads = [threading.Thread(target=refresh) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(walked) == [0, 0, 0, 50]
+    index = CommitIndex(repo, tmp_path / "index")
+    assert index.stats(30)['total_commits'] == 51
+    index.close()
+
+
+def test_get_stats_warns_and_scans_without_an_index(repo_with_remote, home_config, capsys):
+    """An unusable index is reported, and stats still come from a history scan."""
+    (home_config.config_dir / "index").write_text("not a directory")
+
+    stats = GitHubAutoCommit(home_config).get_stats(days=30)
+
+    assert stats['total_commits'] == 1
+    assert "Commit index unavailable" in capsys.readouterr().out
@@ -1,7 +1,9 @@
 """Tests for the GitHub Auto Commit package."""
 
+import json
 import os
 import tempfile
+import threading
 from pathlib import Path
 import pytest
 import git
@@ -136,3 +138,56 @@ def test_get_stats(temp_git_repo, config):
     assert "total_commits" in stats
     assert "days_active" in stats
     assert "average_commits_per_day" in stats
+
+def test_config_reads_file_once_while_unchanged(home_config, monkeypatch):
+    """Repeated gets are served from memory until the file changes."""
+    loads = []
+    real_load = json.load
+    monkeypatch.setattr(json, "load", lambda f: loads.append(1) or real_load(f))
+
+    for _ in range(5):
+        assert home_config.get("github_username") == "test-user"
+    assert loads == []
+
+    # Another process rewrites the file
+    other = Config()
+    other.set("github_username", "someone-else")
+    loads.clear()
+    assert home_config.get("github_username") == "someone-else"
+    assert len(loads) == 1
+
+
+def test_config_update_writes_once(home_config, monkeypatch):
+    """update() applies several keys with a single atomic write."""
+    saves = []
+    real_save = home_config._save_config
+    monkeypatch.setattr(home_config, "_save_config", lambda c: saves.append(1) or real_save(c))
+
+    home_config.update(github_username="new-user", github_token="new-token")
+
+    assert len(saves) == 1
+    assert home_config.get("github_username") == "new-user"
+    assert home_config.get("github_token") == "new-token"
+    # No temporary files are left behind
+    assert sorted(p.name for p in home_config.config_dir.iterdir()) == ["config.json", "config.lock"]
+
+
+def test_config_get_returns_copies(home_config):
+    """Mutating a returned value does not leak into the cached config."""
+    messages = home_config.get("commit_messages")
+    messages.append("Not saved")
+    assert "Not saved" not in home_config.get("commit_messages")
+
+
+def test_concurrent_updates_are_all_kept(home_config):
+    """Updates made at the same time through separate Configs don't overwrite each other."""
+    def update(i):
+        Config().set(f"key{i}", i)
+
+    threads = [threading.Thread(target=update, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [home_config.get(f"key{i}") for i in range(8)] == list(range(8))
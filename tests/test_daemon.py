@@ -0,0 +1,115 @@
+"""Tests for the resident daemon and its socket client."""
+
+import os
+import socket
+import stat
+import threading
+import time
+
+import pytest
+
+from github_auto_commit.daemon import Daemon, DaemonClient, DaemonNotRunning
+
+
+def _start(daemon):
+    """Serve ``daemon`` on a thread and wait until it answers."""
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    client = DaemonClient(daemon.path, timeout=30)
+    for _ in range(100):
+        if daemon.path.exists() and client.running():
+            break
+        time.sleep(0.05)
+    return thread, client
+
+
+@pytest.fixture
+def running_daemon(home_config):
+    daemon = Daemon(home_config)
+    thread, client = _start(daemon)
+    yield daemon, client
+    daemon.stop()
+    thread.join(10)
+    assert not thread.is_alive()
+
+
+def test_client_without_daemon(tmp_path):
+    with pytest.raises(DaemonNotRunning):
+        DaemonClient(tmp_path / 'missing.sock').request('ping')
+
+
+def test_commit_and_stats_reuse_repo(running_daemon, repo_with_remote):
+    daemon, client = running_daemon
+    repo, remote = repo_with_remote
+    work_dir = repo.working_tree_dir
+
+    first = client.request('commit', repo=work_dir, count=2, message='Daemon commit')
+    second = client.request('commit', repo=work_dir, count=1, message='Daemon commit')
+
+    assert first == {'commits': 2, 'pushes': 1, 'pushes_saved': 1}
+    assert second['commits'] == 1
+    assert int(remote.git.rev_list('--count', repo.active_branch.name)) == 4
+    stats = client.request('stats', repo=work_dir, days=7)
+    assert stats['total_commits'] == 4
+    status = client.request('ping')
+    assert status['repositories'] == 1
+    assert status['requests'] >= 4
+
+
+@pytest.mark.parametrize('backend', ['object', 'fast-import'])
+def test_cached_repo_follows_branch_checkout(running_daemon, repo_with_remote, backend):
+    """A repository kept open by the daemon commits to whichever branch is checked out."""
+    _, client = running_daemon
+    repo, remote = repo_with_remote
+    work_dir = repo.working_tree_dir
+    main = repo.active_branch
+
+    client.request('commit', repo=work_dir, count=1, message='On main', backend=backend)
+    main_tip = main.commit
+    repo.git.checkout('-b', 'feature')
+    client.request('commit', repo=work_dir, count=1, message='On feature', backend=backend)
+
+    assert main.commit == main_tip
+    assert repo.heads.feature.commit.message.strip() == 'On feature'
+    assert remote.heads.feature.commit == repo.heads.feature.commit
+
+
+def test_errors_are_returned_to_client(running_daemon, tmp_path):
+    _, client = running_daemon
+    with pytest.raises(Exception, match='Not a valid Git repository'):
+        client.request('commit', repo=str(tmp_path), count=1)
+    with pytest.raises(Exception, match='Unknown daemon request'):
+        client.request('explode')
+    assert client.running()
+
+
+def test_shutdown_request(home_config):
+    daemon = Daemon(home_config)
+    thread, client = _start(daemon)
+
+    assert client.request('shutdown') is None
+    thread.join(10)
+    assert not thread.is_alive()
+    assert not daemon.path.exists()
+    assert not client.running()
+
+
+def test_socket_is_private(running_daemon):
+    daemon, _ = running_daemon
+    assert stat.S_IMODE(os.stat(daemon.path).st_mode) & 0o077 == 0
+
+
+def test_idle_client_does_not_block_stop(home_config):
+    daemon = Daemon(home_config)
+    thread, client = _start(daemon)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle:
+        idle.connect(str(daemon.path))
+        # Make sure the daemon has picked up the connection before stopping
+        for _ in range(100):
+            if daemon._connections:
+                break
+            time.sleep(0.05)
+        daemon.stop()
+        thread.join(10)
+        assert not thread.is_alive()
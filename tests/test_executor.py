@@ -0,0 +1,55 @@
+"""Tests for the multi-repository commit executor."""
+
+import git
+
+from github_auto_commit.executor import commit_to_repos
+
+
+def _make_repo(root, name):
+    work_dir = root / name
+    remote_dir = root / f"{name}.git"
+    repo = git.Repo.init(work_dir)
+    with repo.config_writer() as git_config:
+        git_config.set_value('user', 'name', 'Test User')
+        git_config.set_value('user', 'email', 'test@example.com')
+    (work_dir / "test.txt").write_text("test content")
+    repo.index.add([str(work_dir / "test.txt")])
+    repo.index.commit("Initial commit")
+    remote = git.Repo.init(remote_dir, bare=True)
+    repo.create_remote('origin', str(remote_dir))
+    return work_dir, remote
+
+
+def test_commits_in_every_repo(tmp_path, home_config):
+    repos = [_make_repo(tmp_path, f"repo{i}") for i in range(3)]
+    counts = [(path, i + 2) for i, (path, _) in enumerate(repos)]
+
+    results = commit_to_repos(home_config, counts, max_workers=2)
+
+    assert len(results) == 3
+    for i, (path, remote) in enumerate(repos):
+        result = results[str(path.resolve())]
+        assert result['commits'] == i + 2
+        assert result['pushes'] == 1
+        branch = git.Repo(path).active_branch.name
+        assert int(remote.git.rev_list('--count', branch)) == i + 3
+
+
+def test_duplicate_paths_share_one_worker(tmp_path, home_config):
+    path, remote = _make_repo(tmp_path, "repo")
+
+    results = commit_to_repos(home_config, [(path, 2), (path / '.', 3)])
+
+    assert list(results) == [str(path.resolve())]
+    assert results[str(path.resolve())]['commits'] == 5
+
+
+def test_failures_are_reported_per_repo(tmp_path, home_config):
+    good, _ = _make_repo(tmp_path, "good")
+    bad = tmp_path / "not-a-repo"
+    bad.mkdir()
+
+    results = commit_to_repos(home_config, {good: 1, bad: 1})
+
+    assert results[str(good.resolve())]['commits'] == 1
+    assert 'error' in results[str(bad.resolve())]
@@ -0,0 +1,47 @@
+"""Tests for the contribution heatmap renderer."""
+
+import time
+from datetime import date, timedelta
+
+from rich.console import Console
+
+from github_auto_commit.heatmap import count_level, level_thresholds, render_heatmap
+
+
+def _render(stats, days, end):
+    console = Console(width=200, color_system=None)
+    with console.capture() as capture:
+        console.print(render_heatmap(stats, days, end=end))
+    return capture.get()
+
+
+def test_levels_follow_quartiles():
+    """Non-zero days are split into four levels at the quartiles."""
+    thresholds = level_thresholds([0, 0, 1, 2, 3, 4, 5, 6, 7, 8])
+    assert thresholds == [2, 4, 6]
+    assert [count_level(c, thresholds) for c in (0, 1, 2, 3, 5, 6, 8)] == [0, 1, 1, 2, 3, 3, 4]
+
+
+def test_grid_covers_window_only():
+    """One cell is drawn per day in the window, bucketed by weekday."""
+    end = date(2024, 3, 10)  # a Sunday
+    output = _render({"2024-03-04": 3}, 13, end)
+    lines = output.splitlines()
+
+    assert lines[0].strip() == "Feb"
+    assert lines[1].startswith("Mon")
+    assert output.count("■") == 14 + 5  # 14 days plus the legend
+
+
+def test_five_year_window_renders_quickly():
+    """A five-year window renders in well under a second, split into yearly blocks."""
+    end = date(2024, 12, 31)
+    stats = {(end - timedelta(days=i)).isoformat(): i % 7 for i in range(5 * 365)}
+
+    start = time.perf_counter()
+    output = _render(stats, 5 * 365, end)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    assert output.count("Mon") == 5
+    assert output.count("■") == 5 * 365 + 1 + 5
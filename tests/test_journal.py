@@ -0,0 +1,210 @@
+"""Tests for the run journal and resuming interrupted runs."""
+
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from github_auto_commit import journal as journal_module
+from github_auto_commit.auto_commit import GitHubAutoCommit
+from github_auto_commit.cli import main
+from github_auto_commit.journal import Journal, summarize
+
+
+def interrupt_after(auto_commit, commits, exception=KeyboardInterrupt):
+    """Make the run stop when it tries to make commit number ``commits + 1``."""
+    original = auto_commit._make_single_commit
+    made = []
+
+    def make(message):
+        if len(made) == commits:
+            raise exception()
+        made.append(message)
+        return original(message)
+
+    auto_commit._make_single_commit = make
+
+
+def test_run_is_journaled(repo_with_remote, home_config):
+    repo, _ = repo_with_remote
+    auto_commit = GitHubAutoCommit(home_config)
+    base = repo.head.commit.hexsha
+
+    auto_commit.make_commits(3, message="Journaled")
+    # Closed (and so synced) at the end of the run
+    assert auto_commit.journal._file is None
+
+    state = auto_commit.journal.last_run()
+    assert (state.status, state.count, state.committed, state.pushed) == ('done', 3, 3, 3)
+    assert state.base == base
+    assert state.last_sha == repo.head.commit.hexsha
+    assert [state.shas[n] for n in (1, 2, 3)] == [c.hexsha for c in reversed(list(repo.iter_commits(max_count=3)))]
+    assert auto_commit.interrupted_run() is None
+
+
+def test_dry_run_not_journaled(repo_with_remote, home_config):
+    auto_commit = GitHubAutoCommit(home_config)
+    auto_commit.make_commits(2, dry_run=True)
+    assert auto_commit.journal.last_run() is None
+
+
+def test_fsync_is_batched(tmp_path, monkeypatch):
+    syncs = []
+    monkeypatch.setattr(journal_module.os, 'fsync', syncs.append)
+    journal = Journal(tmp_path / "journal.jsonl", sync_every=3, sync_interval=3600)
+
+    for i in range(7):
+        journal.append({'type': 'commit', 'time': time.time(), 'n': i})
+    assert len(syncs) == 2
+    journal.append({'type': 'push', 'time': time.time()}, sync=True)
+    assert len(syncs) == 3
+    # Records are on disk before they are synced
+    assert len((tmp_path / "journal.jsonl").read_text().splitlines()) == 8
+    journal.close()
+
+
+def test_interrupted_run_resumes_where_it_stopped(repo_with_remote, home_config):
+    repo, remote = repo_with_remote
+    auto_commit = GitHubAutoCommit(home_config)
+    interrupt_after(auto_commit, 2)
+
+    with pytest.raises(KeyboardInterrupt):
+        auto_commit.run_commits(5, push_every=0)
+
+    fresh = GitHubAutoCommit(home_config)
+    state = fresh.interrupted_run()
+    assert (state.status, state.committed, state.pushed, state.remaining) == ('interrupted', 2, 0, 3)
+
+    result = fresh.make_commits(state.remaining, push_every=state.push_every, resume=state)
+
+    assert result['commits'] == 3
+    assert len(list(repo.iter_commits())) == 6
+    assert remote.head.commit == repo.head.commit
+    final = fresh.journal.last_run()
+    assert (final.status, final.committed, final.pushed) == ('done', 5, 5)
+    assert fresh.interrupted_run() is None
+
+
+def test_unrecorded_commit_is_recovered(repo_with_remote, home_config):
+    """A commit made just before the process died, but not journaled, counts as done."""
+    repo, _ = repo_with_remote
+    auto_commit = GitHubAutoCommit(home_config)
+    interrupt_after(auto_commit, 1)
+    with pytest.raises(KeyboardInterrupt):
+        auto_commit.run_commits(4)
+    auto_commit.backend.commit("Made but not recorded", "content")
+
+    state = GitHubAutoCommit(home_config).interrupted_run()
+
+    assert (state.committed, state.remaining) == (2, 2)
+    assert state.last_sha == repo.head.commit.hexsha
+    records = list(Journal(auto_commit.journal.path).records())
+    assert records[-2]['recovered'] is True
+
+
+def test_failed_push_resumes_with_a_push(flaky_remote, home_config):
+    repo = flaky_remote.repo
+    flaky_remote.fail_next(1, " ! [remote rejected] master -> master (hook declined)")
+    auto_commit = GitHubAutoCommit(home_config)
+    with pytest.raises(Exception):
+        auto_commit.run_commits(3)
+
+    state = auto_commit.interrupted_run()
+    assert (state.status, state.committed, state.pushed, state.remaining) == ('failed', 3, 0, 0)
+
+    result = auto_commit.run_commits(state.remaining, resume=state)
+
+    assert result['pushes'] == 1
+    assert flaky_remote.remote.head.commit == repo.head.commit
+    assert auto_commit.journal.last_run().status == 'done'
+
+
+def test_rewritten_branch_cannot_resume(repo_with_remote, home_config):
+    repo, _ = repo_with_remote
+    auto_commit = GitHubAutoCommit(home_config)
+    interrupt_after(auto_commit, 2)
+    with pytest.raises(KeyboardInterrupt):
+        auto_commit.run_commits(4)
+    repo.git.reset('--hard', 'HEAD~2')
+    repo.index.commit("Something else")
+
+    with pytest.raises(Exception, match="rewritten"):
+        GitHubAutoCommit(home_config).interrupted_run()
+
+
+def test_last_run_found_across_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal_module, 'BLOCK_SIZE', 64)
+    journal = Journal(tmp_path / "journal.jsonl")
+    for count in (1, 2):
+        run = journal.start_run(repo="/r", branch="main", base="0" * 40, count=count)
+        for n in range(count):
+            run.commit(f"{n:040d}", "message " * 10, 0.01)
+    run.finish('done')
+
+    state = journal.last_run()
+    assert (state.count, state.committed, state.status) == (2, 2, 'done')
+
+
+def test_torn_last_record_is_ignored(tmp_path):
+    journal = Journal(tmp_path / "journal.jsonl")
+    run = journal.start_run(repo="/r", branch="main", base="0" * 40, count=3)
+    run.commit("a" * 40, "One", 0.01)
+    journal.close()
+    with open(journal.path, 'ab') as f:
+        f.write(b'{"type":"commit","run":"')
+
+    state = journal.last_run()
+    assert (state.committed, state.status) == (1, None)
+
+
+def test_records_since_seeks_to_window(tmp_path):
+    journal = Journal(tmp_path / "journal.jsonl")
+    now = time.time()
+    for age_days in range(100, -1, -1):
+        journal.append({'type': 'commit', 'run': 'r', 'time': now - age_days * 86400 - 1,
+                        'n': 100 - age_days, 'seconds': 0.5})
+
+    recent = list(journal.records(since=now - 10 * 86400))
+    assert [r['n'] for r in recent] == list(range(91, 101))
+    assert len(list(journal.records())) == 101
+
+
+def test_summarize(repo_with_remote, home_config):
+    auto_commit = GitHubAutoCommit(home_config)
+    auto_commit.make_commits(2)
+    interrupt_after(auto_commit, 1)
+    with pytest.raises(KeyboardInterrupt):
+        auto_commit.run_commits(3)
+
+    summary = summarize([auto_commit.journal], days=7)
+
+    assert (summary['runs'], summary['completed'], summary['unfinished']) == (2, 1, 1)
+    assert summary['commits'] == 3
+    assert summary['pushes'] == 1
+    assert summary['days_active'] == 1
+    assert list(summary['repositories'].values()) == [3]
+
+
+def test_cli_resume_and_journal(repo_with_remote, home_config):
+    repo, remote = repo_with_remote
+    auto_commit = GitHubAutoCommit(home_config)
+    interrupt_after(auto_commit, 1)
+    with pytest.raises(KeyboardInterrupt):
+        auto_commit.run_commits(3, message="CLI run")
+    runner = CliRunner()
+
+    result = runner.invoke(main, ['commit', '--resume'])
+    assert result.exit_code == 0, result.output
+    assert "1/3 commits made" in result.output
+    assert remote.head.commit == repo.head.commit
+    assert repo.head.commit.message == "CLI run"
+
+    result = runner.invoke(main, ['commit', '--resume'])
+    assert "No interrupted run" in result.output
+
+    result = runner.invoke(main, ['journal', '--days', '1'])
+    assert result.exit_code == 0, result.output
+    assert "1 completed" in result.output
+
+    result = runner.invoke(main, ['commit'])
+    assert result.exit_code == 2
@@ -0,0 +1,159 @@
+"""Tests for the commit message store."""
+
+import random
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+from click.testing import CliRunner
+
+from github_auto_commit import messages
+from github_auto_commit.cli import main
+from github_auto_commit.messages import MessageStore, build_alias
+
+
+@pytest.fixture
+def store(tmp_path):
+    with MessageStore(tmp_path / "messages") as store:
+        yield store
+
+
+def test_build_alias_matches_weights():
+    weights = [1.0, 0.0, 3.0, 4.0]
+    probability, alias = build_alias(weights)
+    n = len(weights)
+    # Each slot's share: its own kept probability plus what others alias to it
+    share = [probability[i] / n for i in range(n)]
+    for i in range(n):
+        share[alias[i]] += (1 - probability[i]) / n
+    assert share == pytest.approx([w / sum(weights) for w in weights])
+
+
+def test_add_get_and_iterate(store):
+    numbers = store.add_many(["Fix bug", ("Add tests", 2.5), "Ünïcode ✓"])
+    assert numbers == [1, 2, 3]
+    assert store.add("Refactor") == 4
+    assert store.get(2) == ("Add tests", 2.5)
+    assert store.get(3) == ("Ünïcode ✓", 1.0)
+    assert list(store)[-1] == (4, "Refactor", 1.0)
+    assert len(store) == 4
+
+
+def test_sampling_follows_weights(store):
+    store.add_many([("rare", 1), ("common", 9), ("never", 0)])
+    rng = random.Random(1)
+    counts = Counter(store.sample(rng) for _ in range(20000))
+    assert counts["never"] == 0
+    assert counts["common"] / counts["rare"] == pytest.approx(9, rel=0.1)
+
+
+def test_edit_and_remove_in_place(store):
+    store.add_many(["one", "two", "three"])
+    index_size = store.index_path.stat().st_size
+
+    store.edit(2, message="TWO", weight=5)
+    store.remove(1)
+
+    # Entries are rewritten in place; only the new text is appended
+    assert store.index_path.stat().st_size == index_size
+    assert store.get(2) == ("TWO", 5.0)
+    assert [number for number, _, _ in store] == [2, 3]
+    assert len(store) == 2
+    with pytest.raises(Exception, match="No commit message number 1"):
+        store.get(1)
+    rng = random.Random(2)
+    assert {store.sample(rng) for _ in range(200)} == {"TWO", "three"}
+
+
+def test_alias_table_persisted_and_rebuilt_after_changes(store, tmp_path):
+    store.add_many(["a", "b"])
+    store.sample()
+    built = store.alias_path.stat().st_mtime_ns
+
+    with MessageStore(tmp_path / "messages") as reopened:
+        reopened.sample()
+        assert store.alias_path.stat().st_mtime_ns == built
+
+        reopened.remove(1)
+        # The first store sees the change and samples from the new table
+        assert {store.sample() for _ in range(50)} == {"b"}
+
+
+def test_changes_seen_by_other_open_stores(store, tmp_path):
+    store.add("first")
+    with MessageStore(tmp_path / "messages") as other:
+        other.add_many(f"message {i}" for i in range(1000))
+    assert len(store) == 1001
+    assert store.get(1001) == ("message 999", 1.0)
+
+
+def test_compact(store, tmp_path):
+    store.add_many(["keep", "drop", "edit me"])
+    store.remove(2)
+    store.edit(3, message="edited")
+
+    assert store.compact() > 0
+    assert list(store) == [(1, "keep", 1.0), (2, "edited", 1.0)]
+    assert store.data_path.read_bytes() == b"keepedited"
+
+
+def test_compact_seen_by_other_open_stores(store, tmp_path):
+    store.add_many(["a", "b", "c"])
+    with MessageStore(tmp_path / "messages") as other:
+        other.remove(1)
+        other.compact()
+    assert store.messages() == ["b", "c"]
+    assert store.get(1) == ("b", 1.0)
+
+
+def test_empty_store_cannot_sample(store):
+    with pytest.raises(Exception, match="No commit messages"):
+        store.sample()
+    store.add("only", weight=0)
+    with pytest.raises(Exception, match="No commit messages"):
+        store.sample()
+
+
+def test_rejects_bad_input(store):
+    with pytest.raises(ValueError):
+        store.add("")
+    with pytest.raises(ValueError):
+        store.add("negative", weight=-1)
+
+
+def test_locks_without_fcntl(tmp_path, monkeypatch):
+    """Without fcntl (Windows) the store locks with msvcrt."""
+    calls = []
+    msvcrt = SimpleNamespace(LK_LOCK=1, LK_UNLCK=0,
+                             locking=lambda fd, mode, size: calls.append(mode))
+    monkeypatch.setattr(messages, 'fcntl', None)
+    monkeypatch.setattr(messages, 'msvcrt', msvcrt, raising=False)
+
+    with MessageStore(tmp_path / "messages") as store:
+        store.add("Locked")
+        assert store.sample() == "Locked"
+    assert calls and calls[::2] == [1] * (len(calls) // 2) and calls[1::2] == [0] * (len(calls) // 2)
+
+
+def test_seeded_from_config(home_config):
+    home_config.set("commit_messages", ["From config"])
+    with MessageStore.for_config(home_config) as store:
+        assert store.messages() == ["From config"]
+    # Later config changes don't reseed an existing store
+    home_config.set("commit_messages", ["Other"])
+    with MessageStore.for_config(home_config) as store:
+        assert store.messages() == ["From config"]
+
+
+def test_messages_import_and_weight(home_config, tmp_path):
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("Plain message\n3\tHeavy message\n\n")
+    result = CliRunner().invoke(main, ['messages', '--import', str(corpus),
+                                       '--add', 'Light', '--weight', '0.5'])
+    assert result.exit_code == 0, result.output
+
+    with MessageStore.for_config(home_config) as store:
+        weights = {message: weight for _, message, weight in store}
+    assert weights["Plain message"] == 1.0
+    assert weights["Heavy message"] == 3.0
+    assert weights["Light"] == 0.5
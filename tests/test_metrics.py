@@ -0,0 +1,71 @@
+"""Tests for metrics recording and export."""
+
+import json
+
+import pytest
+
+from github_auto_commit.auto_commit import GitHubAutoCommit
+from github_auto_commit.metrics import Histogram, Metrics, metrics
+from github_auto_commit.stats import ContributionStats
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_histogram_buckets():
+    histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.01, 0.05, 2.0):
+        histogram.observe(value)
+    assert dict(histogram.cumulative()) == {'0.01': 2, '0.1': 3, '1.0': 3, '+Inf': 4}
+    assert histogram.count == 4
+    assert histogram.max == 2.0
+
+
+def test_prometheus_and_json_export(tmp_path):
+    registry = Metrics()
+    registry.observe('push_seconds', 0.2)
+    registry.observe('commit_phase_seconds', 0.003, backend='index', phase='index_add')
+    registry.increment('push_retries_total', 2)
+
+    text = registry.to_prometheus()
+    assert '# TYPE github_auto_commit_push_seconds histogram' in text
+    assert 'github_auto_commit_push_seconds_bucket{le="0.25"} 1' in text
+    assert ('github_auto_commit_commit_phase_seconds_count{backend="index",phase="index_add"} 1'
+            in text)
+    assert 'github_auto_commit_push_retries_total 2' in text
+
+    json_path, prom_path = registry.write(tmp_path)
+    data = json.loads(json_path.read_text())
+    assert data['counters'] == [{'name': 'push_retries_total', 'labels': {}, 'value': 2}]
+    assert prom_path.read_text() == text
+
+
+def test_make_commits_records_phases(home_config, repo_with_remote):
+    GitHubAutoCommit(home_config).make_commits(3)
+
+    data = metrics.to_dict()
+    phases = {h['labels']['phase']: h['count'] for h in data['histograms']
+              if h['name'] == 'commit_phase_seconds'}
+    assert phases == {'write_file': 3, 'index_add': 3, 'index_commit': 3}
+    attempts = [h['count'] for h in data['histograms'] if h['name'] == 'push_attempt_seconds']
+    counters = {c['name']: c['value'] for c in data['counters']}
+    # The fresh branch has no upstream, but it is pushed with --set-upstream at the first attempt
+    assert attempts == [1]
+    assert 'push_retries_total' not in counters
+    assert counters['commits_total'] == 3
+
+
+def test_api_requests_are_timed(github_stub):
+    github_stub.add_repo("repo", [])
+    ContributionStats("test-token", api_url=github_stub.url, cache=False).get_user_stats("test-user")
+
+    data = metrics.to_dict()
+    timed = [h for h in data['histograms'] if h['name'] == 'api_request_seconds']
+    assert timed[0]['labels'] == {'api': 'rest'}
+    assert timed[0]['count'] == len(github_stub.requests)
+    statuses = {c['labels']['status'] for c in data['counters'] if c['name'] == 'api_responses_total'}
+    assert statuses == {'200'}
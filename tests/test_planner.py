@@ -0,0 +1,95 @@
+"""Tests for the bulk commit planner."""
+
+import time
+
+import pytest
+from rich.console import Console
+
+from github_auto_commit.planner import DAY_SECONDS, PATTERNS, CommitPlan, apportion, run_plan
+
+
+@pytest.mark.parametrize('pattern', PATTERNS)
+def test_plan_totals_and_order(pattern):
+    plan = CommitPlan(1000, 7, pattern, start=0.0, seed=1)
+    assert sum(plan.counts) == len(plan) == 1000
+    assert list(plan.times) == sorted(plan.times)
+    for day, count in enumerate(plan.counts):
+        in_day = [t for t in plan.times if day * DAY_SECONDS <= t < (day + 1) * DAY_SECONDS]
+        assert len(in_day) == count
+
+
+def test_patterns_shape():
+    assert list(CommitPlan(10, 5, 'Even', seed=1).counts) == [2, 2, 2, 2, 2]
+    front = list(CommitPlan(150, 5, 'Front-loaded', seed=1).counts)
+    assert front == sorted(front, reverse=True) and front[0] > front[-1]
+    back = list(CommitPlan(150, 5, 'Back-loaded', seed=1).counts)
+    assert back == sorted(back) and back[0] < back[-1]
+
+
+def test_apportion_largest_remainder():
+    # Tied remainders: the extra commit goes to the middle, not the first day
+    assert list(apportion(10, [1, 1, 1])) == [3, 4, 3]
+    assert list(apportion(7, [3, 0, 1])) == [5, 0, 2]
+
+
+def test_even_plan_with_fewer_commits_than_days():
+    counts = list(CommitPlan(5, 30, 'Even', seed=1).counts)
+    assert sum(counts) == 5 and max(counts) == 1
+    busy = [day for day, count in enumerate(counts) if count]
+    # Spread over the whole window, six days apart
+    assert busy == [3, 9, 15, 21, 27]
+
+
+def test_unknown_pattern():
+    with pytest.raises(ValueError):
+        CommitPlan(10, 2, 'Sideways')
+
+
+def test_large_plan_is_fast():
+    started = time.perf_counter()
+    plan = CommitPlan(200_000, 365, 'Random', seed=3)
+    assert time.perf_counter() - started < 2
+    assert len(plan) == 200_000
+
+
+def test_histogram_buckets_long_plans():
+    console = Console(width=120, color_system=None)
+    with console.capture() as capture:
+        console.print(CommitPlan(500, 90, 'Even', seed=1).histogram(max_rows=30))
+    output = capture.get()
+    assert '500 commits over 90 days' in output
+    assert output.count('█') > 0
+
+
+class FakeAutoCommit:
+    def __init__(self):
+        self.runs = []
+
+    def make_commits(self, count, push_every=None):
+        self.runs.append(count)
+        return {'commits': count, 'pushes': 1, 'pushes_saved': count - 1}
+
+
+def test_run_plan_sleeps_between_slots():
+    plan = CommitPlan(6, 3, 'Even', start=1000.0, seed=2)
+    clock = [1000.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    fake = FakeAutoCommit()
+    result = run_plan(fake, plan, sleep=sleep, clock=lambda: clock[0])
+    assert result['commits'] == 6
+    assert sum(fake.runs) == 6
+    assert len(sleeps) == len(fake.runs)
+
+
+def test_run_plan_catches_up_overdue_commits():
+    plan = CommitPlan(20, 2, 'Even', start=0.0, seed=2)
+    fake = FakeAutoCommit()
+    result = run_plan(fake, plan, sleep=lambda s: pytest.fail('should not sleep'),
+                      clock=lambda: 3 * DAY_SECONDS)
+    assert fake.runs == [20]
+    assert result == {'commits': 20, 'pushes': 1, 'pushes_saved': 19}
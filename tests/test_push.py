@@ -0,0 +1,198 @@
+"""Tests for push target resolution, failure classification and retries."""
+
+import threading
+
+import git
+import pytest
+
+from github_auto_commit.auto_commit import GitHubAutoCommit
+from github_auto_commit.push import (FATAL, NO_UPSTREAM, REJECTED, TRANSIENT, BackgroundPusher,
+                                     PushError, Pusher, classify)
+
+
+def make_pusher(repo, **kwargs):
+    delays = []
+    pusher = Pusher(repo, sleep=delays.append, jitter=lambda: 0.5, **kwargs)
+    return pusher, delays
+
+
+@pytest.mark.parametrize("output, kind", [
+    ("fatal: The current branch main has no upstream branch.", NO_UPSTREAM),
+    (" ! [rejected]        master -> master (fetch first)", REJECTED),
+    (" ! [remote rejected] master -> master (pre-receive hook declined)", REJECTED),
+    ("ssh: connect to host github.com port 22: Connection timed out\n"
+     "fatal: Could not read from remote repository.", TRANSIENT),
+    ("fatal: unable to access 'https://github.com/x/y.git/': Could not resolve host: github.com", TRANSIENT),
+    ("error: RPC failed; HTTP 502 curl 22 The requested URL returned error: 502", TRANSIENT),
+    ("remote: Permission to x/y.git denied to someone.\nfatal: unable to access: "
+     "The requested URL returned error: 403", FATAL),
+])
+def test_classify(output, kind):
+    assert classify(output) == kind
+
+
+def test_fresh_branch_pushed_once_with_upstream(flaky_remote):
+    repo = flaky_remote.repo
+    pusher, delays = make_pusher(repo)
+    assert pusher.target().has_upstream is False
+
+    pusher.push()
+
+    assert flaky_remote.calls == 1
+    assert delays == []
+    assert repo.active_branch.tracking_branch().name == f"origin/{repo.active_branch.name}"
+    assert flaky_remote.remote.heads[repo.active_branch.name].commit == repo.head.commit
+
+
+def test_transient_failure_retried_with_backoff(flaky_remote):
+    pusher, delays = make_pusher(flaky_remote.repo, base_delay=1.0)
+    flaky_remote.fail_next(2)
+
+    pusher.push()
+
+    assert flaky_remote.calls == 3
+    # Half fixed, half jitter (fixed at 0.5 here) of 1s then 2s
+    assert delays == [0.75, 1.5]
+    assert flaky_remote.remote.heads[flaky_remote.repo.active_branch.name].commit == flaky_remote.repo.head.commit
+
+
+def test_backoff_is_capped():
+    pusher = Pusher(None, base_delay=1.0, max_delay=5.0, jitter=lambda: 1.0)
+    assert [pusher.backoff(attempt) for attempt in range(5)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_transient_failure_gives_up_after_max_retries(flaky_remote):
+    pusher, delays = make_pusher(flaky_remote.repo, max_retries=2)
+    flaky_remote.fail_next(5)
+
+    with pytest.raises(PushError) as excinfo:
+        pusher.push()
+
+    assert excinfo.value.kind == TRANSIENT
+    assert flaky_remote.calls == 3
+    assert len(delays) == 2
+
+
+def test_rejected_push_not_retried(flaky_remote, tmp_path):
+    repo = flaky_remote.repo
+    branch = repo.active_branch.name
+    Pusher(repo).push()
+
+    # Someone else pushes first, so our next commit is not a fast-forward
+    other = git.Repo.clone_from(flaky_remote.remote.working_dir, tmp_path / "other", branch=branch)
+    with other.config_writer() as git_config:
+        git_config.set_value('user', 'name', 'Other')
+        git_config.set_value('user', 'email', 'other@example.com')
+    other.index.commit("Their commit")
+    other.git.push('origin', branch)
+    repo.index.commit("Our commit")
+
+    pusher, delays = make_pusher(repo)
+    calls = flaky_remote.calls
+    with pytest.raises(PushError) as excinfo:
+        pusher.push()
+
+    assert excinfo.value.kind == REJECTED
+    assert flaky_remote.calls == calls + 1
+    assert delays == []
+
+
+def test_missing_remote_and_detached_head_are_fatal(repo_with_remote):
+    repo, _ = repo_with_remote
+    with pytest.raises(PushError) as excinfo:
+        Pusher(repo, remote='upstream').push()
+    assert excinfo.value.kind == FATAL
+
+    repo.git.checkout('--detach')
+    with pytest.raises(PushError) as excinfo:
+        Pusher(repo).push()
+    assert excinfo.value.kind == FATAL
+
+
+def test_target_resolved_once_per_run(flaky_remote, home_config, monkeypatch):
+    auto_commit = GitHubAutoCommit(home_config)
+    resolved = []
+    original = Pusher.target
+
+    def counting_target(self):
+        if self._target is None:
+            resolved.append(self)
+        return original(self)
+
+    monkeypatch.setattr(Pusher, 'target', counting_target)
+    auto_commit.run_commits(4, push_every=1)
+    assert len(resolved) == 1
+
+    auto_commit.run_commits(2, push_every=1)
+    assert len(resolved) == 2
+    assert flaky_remote.remote.heads[flaky_remote.repo.active_branch.name].commit == flaky_remote.repo.head.commit
+
+
+def test_run_commits_raises_push_error(flaky_remote, home_config):
+    auto_commit = GitHubAutoCommit(home_config)
+    flaky_remote.fail_next(1, " ! [remote rejected] master -> master (protected branch hook declined)")
+    with pytest.raises(PushError) as excinfo:
+        auto_commit.run_commits(1)
+    assert excinfo.value.kind == REJECTED
+    assert "protected branch hook declined" in str(excinfo.value)
+    assert "stderr:" not in str(excinfo.value)
+
+
+def test_background_pusher_folds_requests():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def push():
+        calls.append(len(calls))
+        started.set()
+        release.wait(5)
+
+    pushed = []
+    pusher = BackgroundPusher(push, on_push=pushed.append)
+    pusher.request(1)
+    assert started.wait(5)
+    # These arrive while the first push is in flight and share the next push
+    for committed in range(2, 6):
+        pusher.request(committed)
+    release.set()
+    pusher.close()
+
+    assert len(calls) == 2
+    assert pushed == [1, 5]
+    assert (pusher.pushes, pusher.pushed) == (2, 5)
+
+
+def test_background_pusher_raises_error():
+    def push():
+        raise PushError(REJECTED, "rejected")
+
+    pusher = BackgroundPusher(push)
+    pusher.request(1)
+    with pytest.raises(PushError):
+        pusher.close()
+    with pytest.raises(PushError):
+        pusher.request(2)
+    assert pusher.pushed == 0
+
+
+def test_background_pusher_close_without_flush():
+    release = threading.Event()
+    started = threading.Event()
+    calls = []
+
+    def push():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+
+    pusher = BackgroundPusher(push)
+    pusher.request(1)
+    assert started.wait(5)
+    pusher.request(2)
+    threading.Timer(0.1, release.set).start()
+    pusher.close(flush=False)
+
+    # The push in flight finishes; the queued one is dropped
+    assert len(calls) == 1
+    assert pusher.pushed == 1
@@ -0,0 +1,48 @@
+"""Tests for the multi-repository stats scanner."""
+
+import time
+from pathlib import Path
+
+import git
+
+from github_auto_commit.backends import FastImportBackend
+from github_auto_commit.scanner import find_repos, scan_repos
+
+
+def _make_repo(path, commits, days_ago):
+    """Create a repository with ``commits`` commits made ``days_ago`` days back."""
+    repo = git.Repo.init(path)
+    with repo.config_writer() as git_config:
+        git_config.set_value('user', 'name', 'Test User')
+        git_config.set_value('user', 'email', 'test@example.com')
+    when = int(time.time()) - days_ago * 86400
+    plan = [(f"Commit {i}", str(i), when + i) for i in range(commits)]
+    FastImportBackend(repo, Path(path)).commit_many(plan)
+    return repo
+
+
+def test_find_repos_skips_nested_and_plain_dirs(tmp_path):
+    """Repositories are found at any depth, but not inside other repositories."""
+    _make_repo(tmp_path / "a", 1, 0)
+    _make_repo(tmp_path / "group" / "b", 1, 0)
+    _make_repo(tmp_path / "a" / "vendor" / "c", 1, 0)
+    (tmp_path / "plain").mkdir()
+
+    assert find_repos(tmp_path) == [tmp_path / "a", tmp_path / "group" / "b"]
+
+
+def test_scan_repos_merges_results(tmp_path):
+    """Per-repository stats are merged into one combined summary."""
+    _make_repo(tmp_path / "a", 5, 1)
+    _make_repo(tmp_path / "b", 3, 1)
+    _make_repo(tmp_path / "c", 4, 3)
+    _make_repo(tmp_path / "old", 2, 200)
+
+    per_repo, combined = scan_repos(tmp_path, days=30, workers=2,
+                                    index_dir=tmp_path / ".index")
+
+    assert {p.name: s['total_commits'] for p, s in per_repo.items()} == {
+        "a": 5, "b": 3, "c": 4, "old": 0}
+    assert combined['repositories'] == 4
+    assert combined['total_commits'] == 12
+    assert combined['days_active'] == 2
@@ -0,0 +1,232 @@
+"""Tests for the cron scheduler."""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from github_auto_commit.auto_commit import GitHubAutoCommit
+from github_auto_commit.scheduler import (
+    CronExpression, Job, JobStore, Scheduler, notify_scheduler, run_job)
+
+
+@pytest.mark.parametrize('expression, after, expected', [
+    ('*/15 * * * *', datetime(2024, 1, 1, 10, 7), datetime(2024, 1, 1, 10, 15)),
+    ('0 9 * * *', datetime(2024, 1, 1, 9, 0), datetime(2024, 1, 2, 9, 0)),
+    ('0 9 * * MON', datetime(2024, 1, 3, 12, 0), datetime(2024, 1, 8, 9, 0)),
+    ('30 23 31 * *', datetime(2024, 2, 1, 0, 0), datetime(2024, 3, 31, 23, 30)),
+    ('0 0 29 feb *', datetime(2024, 3, 1, 0, 0), datetime(2028, 2, 29, 0, 0)),
+    ('@hourly', datetime(2024, 12, 31, 23, 59), datetime(2025, 1, 1, 0, 0)),
+    # Both day fields restricted: either one matching is enough
+    ('0 0 13 * 5', datetime(2024, 1, 1, 0, 0), datetime(2024, 1, 5, 0, 0)),
+    ('0 0 * * 7', datetime(2024, 1, 1, 0, 0), datetime(2024, 1, 7, 0, 0)),
+])
+def test_next_after(expression, after, expected):
+    assert CronExpression(expression).next_after(after) == expected
+
+
+@pytest.mark.parametrize('expression', ['* * * *', '60 * * * *', '* * * * 8', '*/0 * * * *', 'x * * * *'])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronExpression(expression)
+
+
+def test_impossible_expression():
+    with pytest.raises(ValueError):
+        CronExpression('0 0 31 feb *').next_after(datetime(2024, 1, 1))
+
+
+def test_jobs_persist(tmp_path):
+    scheduler = Scheduler(JobStore(tmp_path), lambda job: None)
+    job = scheduler.add(Job(cron='0 9 * * *', repo='/repo', count=3))
+
+    reloaded = JobStore(tmp_path).load()
+    assert list(reloaded) == [job.id]
+    assert reloaded[job.id].count == 3
+    assert reloaded[job.id].next_run == job.next_run
+
+    scheduler.remove(job.id)
+    assert JobStore(tmp_path).load() == {}
+
+
+def test_run_due_reschedules(tmp_path):
+    scheduler = Scheduler(JobStore(tmp_path), lambda job: None)
+    hourly = scheduler.add(Job(cron='0 * * * *', repo='/a'))
+    daily = scheduler.add(Job(cron='0 0 * * *', repo='/b'))
+
+    assert scheduler.next_wakeup() == hourly.next_run
+    first_run = hourly.next_run
+    assert scheduler.run_due(first_run - 1) == []
+    assert scheduler.run_due(first_run) == [hourly]
+    assert hourly.next_run == first_run + 3600
+    assert hourly.last_run == first_run
+    assert daily.last_run is None
+
+
+def test_changes_from_other_processes_are_kept(tmp_path):
+    """Saving re-reads the jobs file, so a scheduler never writes back a stale copy."""
+    scheduler = Scheduler(JobStore(tmp_path), lambda job: None)
+    hourly = scheduler.add(Job(cron='0 * * * *', repo='/a', id='hourly'))
+    scheduler.add(Job(cron='0 0 * * *', repo='/b', id='removed'))
+
+    # Another process (the CLI) adds one job and removes another
+    other = Scheduler(JobStore(tmp_path), lambda job: None)
+    other.add(Job(cron='0 0 * * *', repo='/c', id='added'))
+    other.remove('removed')
+
+    scheduler.run_due(hourly.next_run)
+    scheduler.add(Job(cron='0 0 * * *', repo='/d', id='late'))
+
+    jobs = JobStore(tmp_path).load()
+    assert sorted(jobs) == ['added', 'hourly', 'late']
+    assert jobs['hourly'].last_run == hourly.last_run
+    assert jobs['hourly'].next_run == hourly.next_run
+
+
+def test_concurrent_adds_are_all_saved(tmp_path):
+    def add(i):
+        Scheduler(JobStore(tmp_path), lambda job: None).add(Job(cron='@daily', repo=f'/{i}', id=str(i)))
+
+    threads = [threading.Thread(target=add, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(JobStore(tmp_path).load()) == [str(i) for i in range(8)]
+
+
+def test_missed_run_catches_up_once(tmp_path):
+    store = JobStore(tmp_path)
+    Scheduler(store, lambda job: None).add(Job(cron='* * * * *', repo='/a', id='late'))
+    jobs = store.load()
+    jobs['late'].next_run = time.time() - 3 * 86400
+    store.save(jobs)
+
+    scheduler = Scheduler(store, lambda job: None)
+    assert [job.id for job in scheduler.run_due()] == ['late']
+    assert scheduler.run_due() == []
+    assert scheduler.jobs['late'].next_run > time.time()
+
+
+def test_run_forever_wakes_for_new_jobs(tmp_path):
+    ran = threading.Event()
+    scheduler = Scheduler(JobStore(tmp_path), lambda job: ran.set())
+    thread = threading.Thread(target=scheduler.run_forever)
+    thread.start()
+    try:
+        # With no jobs the scheduler waits indefinitely; adding one must wake it
+        job = scheduler.add(Job(cron='* * * * *', repo='/a'))
+        with scheduler._cond:
+            job.next_run = time.time()
+            scheduler._push(job)
+            scheduler._cond.notify_all()
+        assert ran.wait(5)
+    finally:
+        scheduler.stop()
+        thread.join(5)
+    assert not thread.is_alive()
+    assert not (tmp_path / 'scheduler.pid').exists()
+
+
+def test_failing_job_does_not_stop_scheduler(tmp_path):
+    calls = []
+    done = threading.Event()
+
+    def runner(job):
+        calls.append(job.repo)
+        if job.repo == '/bad':
+            raise Exception('boom')
+        done.set()
+
+    scheduler = Scheduler(JobStore(tmp_path), runner)
+    bad = scheduler.add(Job(cron='* * * * *', repo='/bad'))
+    good = scheduler.add(Job(cron='* * * * *', repo='/good'))
+    scheduler.run_due(max(bad.next_run, good.next_run))
+    assert done.wait(5)
+    assert sorted(calls) == ['/bad', '/good']
+
+
+def _start(scheduler):
+    """Run ``scheduler`` in a thread and wait until it has claimed the pid file."""
+    pid_file = scheduler.store.config_dir / 'scheduler.pid'
+    thread = threading.Thread(target=scheduler.run_forever)
+    thread.start()
+    deadline = time.time() + 5
+    while not (pid_file.exists() and pid_file.read_text()):
+        assert time.time() < deadline
+        time.sleep(0.01)
+    return thread
+
+
+def test_only_one_scheduler_runs(tmp_path):
+    first = Scheduler(JobStore(tmp_path), lambda job: None)
+    thread = _start(first)
+    try:
+        with pytest.raises(Exception, match="already running"):
+            Scheduler(JobStore(tmp_path), lambda job: None).run_forever()
+    finally:
+        first.stop()
+        thread.join(5)
+    # Free again once the first has stopped
+    second = Scheduler(JobStore(tmp_path), lambda job: None)
+    thread = _start(second)
+    second.stop()
+    thread.join(5)
+
+
+def test_notify_ignores_stale_pid_file(tmp_path, monkeypatch):
+    """A pid file no scheduler holds is never signalled: its pid may be another process."""
+    signalled = []
+    monkeypatch.setattr(os, 'kill', lambda pid, sig: signalled.append(pid))
+    (tmp_path / 'scheduler.pid').write_text(str(os.getpid()))
+
+    assert not notify_scheduler(tmp_path)
+    assert not signalled
+
+    (tmp_path / 'scheduler.pid').unlink()
+    scheduler = Scheduler(JobStore(tmp_path), lambda job: None)
+    thread = _start(scheduler)
+    try:
+        assert notify_scheduler(tmp_path)
+        assert signalled == [os.getpid()]
+    finally:
+        scheduler.stop()
+        thread.join(5)
+
+
+def test_reload_request_is_applied_by_the_loop(tmp_path):
+    scheduler = Scheduler(JobStore(tmp_path), lambda job: None)
+    thread = _start(scheduler)
+    try:
+        jobs = scheduler.jobs
+        # Another process adds a job to the store
+        other = JobStore(tmp_path)
+        other.save({'new': Job(cron='0 0 * * *', repo='/a', id='new')})
+        scheduler.request_reload()
+        # The handler only flags the reload; the loop swaps the jobs
+        deadline = time.time() + 5
+        while 'new' not in scheduler.jobs:
+            assert time.time() < deadline
+            time.sleep(0.01)
+        assert scheduler.jobs is not jobs
+    finally:
+        scheduler.stop()
+        thread.join(5)
+
+
+def test_run_job_draws_no_progress_display(repo_with_remote, home_config, monkeypatch):
+    """Jobs run on worker threads, so they must not start a live display."""
+    repo, remote = repo_with_remote
+
+    def make_commits(*args, **kwargs):
+        raise AssertionError("make_commits draws a progress display")
+
+    monkeypatch.setattr(GitHubAutoCommit, 'make_commits', make_commits)
+    run_job(Job('@hourly', repo.working_dir, count=2))
+
+    assert remote.head.commit == repo.head.commit
+    # The fixture's initial commit plus the job's two
+    assert len(list(repo.iter_commits())) == 3
@@ -0,0 +1,80 @@
+"""Tests for simulated runs and their projections."""
+
+from click.testing import CliRunner
+
+from github_auto_commit.cli import main
+from github_auto_commit.metrics import metrics
+from github_auto_commit.simulate import projected_pushes, projected_seconds, simulate
+
+
+def test_projected_pushes():
+    # One push at the end, or one per push_every commits while pushes keep up
+    assert projected_pushes(100, 0, 0.01, 0, 0.5) == 1
+    assert projected_pushes(100, 10, 0.01, 1, 0.5) == 10
+    assert projected_pushes(0, 10, 0.01, 0, 0.5) == 0
+    # Pushes slower than the commits between them are folded together
+    assert projected_pushes(100, 2, 0.01, 0, 0.1) == 11
+    # Pushing after every commit never folds
+    assert projected_pushes(100, 1, 0.01, 0, 0.1) == 100
+
+
+def test_projected_seconds():
+    # Commits and delays, then the final push
+    assert projected_seconds(10, 0, 0.1, 2, 0.5, 0.0, 1) == 10 * 0.1 + 9 * 2 + 0.5
+    # Back-to-back pushes that fall behind the commits set the run's length
+    assert projected_seconds(100, 2, 0.01, 0, 0.1, 0.0, 11) == 2 * 0.01 + 11 * 0.1
+    # Pushing after every commit adds every push to the commits
+    assert projected_seconds(10, 1, 0.1, 0, 0.5, 0.0, 10) == 10 * 0.1 + 10 * 0.5
+
+
+def test_simulate_leaves_repository_alone(repo_with_remote, home_config):
+    repo, remote = repo_with_remote
+    head = repo.head.commit
+    status = repo.git.status('--porcelain')
+
+    projection = simulate(home_config, 1000, delay=5, push_every=10, sample=6)
+
+    assert projection.sampled == 6
+    assert projection.pushes == 100
+    assert projection.seconds >= 999 * 5
+    assert projection.commit_seconds > 0
+    assert projection.local_bytes > 0 and projection.remote_bytes > 0
+    assert repo.head.commit == head
+    assert repo.git.status('--porcelain') == status
+    assert not remote.heads
+    assert not (home_config.config_dir / 'journal').exists()
+    assert not (home_config.config_dir / 'messages').exists()
+
+
+def test_simulate_needs_no_credentials_and_records_no_metrics(repo_with_remote, home_config):
+    home_config.set("github_token", "")
+    metrics.reset()
+    metrics.increment('commits_total', 2)
+
+    simulate(home_config, 50, push_every=5, sample=5)
+
+    # Only what was recorded before the simulation
+    assert metrics.to_dict() == {
+        'histograms': [], 'counters': [{'name': 'commits_total', 'labels': {}, 'value': 2}]}
+    metrics.reset()
+
+
+def test_simulate_fast_import_pushes_once(repo_with_remote, home_config):
+    projection = simulate(home_config, 500, delay=30, push_every=1, backend='fast-import', sample=5)
+
+    # fast-import writes the whole run in one go, without delays
+    assert projection.pushes == 1
+    assert projection.delay == 0
+    assert projection.seconds < 500 * 30
+
+
+def test_commit_simulate_subcommand(home_config, repo_with_remote):
+    repo, _ = repo_with_remote
+    head = repo.head.commit
+
+    result = CliRunner().invoke(main, ['commit', '-n', '100', '--simulate', '--sample', '5',
+                                       '--push-latency', '0.2'])
+
+    assert result.exit_code == 0, result.output
+    assert 'Projected Run' in result.output
+    assert repo.head.commit == head
@@ -0,0 +1,234 @@
+"""Tests for the GitHub contribution statistics."""
+
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate
+
+import requests
+
+from github_auto_commit.http_cache import ResponseCache
+from github_auto_commit.ratelimit import RateLimiter
+from github_auto_commit.stats import ContributionStats
+
+
+def _recent(days_ago, hour=12):
+    """Return a UTC timestamp ``days_ago`` days and ``hour`` hours in the past."""
+    when = datetime.now(timezone.utc) - timedelta(days=days_ago, hours=hour)
+    return when.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _populate(stub, repos=12):
+    """Give the stub a spread of repositories and recent commits."""
+    for r in range(repos):
+        stub.add_repo(f"repo-{r}", [_recent(d % 20, hour=h) for d in range(r) for h in (9, 15)])
+
+
+def test_concurrent_fetch_matches_serial(github_stub):
+    """Concurrent fetching returns exactly what a serial fetch does."""
+    _populate(github_stub)
+    client = ContributionStats("test-token", api_url=github_stub.url, max_workers=6)
+
+    serial = client.get_user_stats("test-user", days=30, max_workers=1)
+    concurrent = client.get_user_stats("test-user", days=30)
+
+    assert list(concurrent[0].items()) == list(serial[0].items())
+    assert list(concurrent[1].items()) == list(serial[1].items())
+    assert sum(serial[1].values()) == sum(2 * r for r in range(12))
+
+
+def test_fetch_errors_skip_repository(github_stub):
+    """A repository that fails to fetch is reported and skipped."""
+    _populate(github_stub, repos=3)
+    github_stub.add_repo("broken", [])
+    client = ContributionStats("test-token", api_url=github_stub.url)
+    client_fetch = client._fetch_repo_commits
+
+    def fetch(username, repo_name, since):
+        if repo_name == "broken":
+            raise ValueError("boom")
+        return client_fetch(username, repo_name, since)
+
+    client._fetch_repo_commits = fetch
+    stats, repo_stats = client.get_user_stats("test-user")
+
+    assert "broken" not in repo_stats
+    assert sum(repo_stats.values()) == 6
+
+
+def test_follows_pagination(github_stub):
+    """Repositories and commits beyond the first page are counted."""
+    for r in range(130):
+        github_stub.add_repo(f"repo-{r}", [])
+    github_stub.add_repo("busy", [_recent(d % 25, hour=h) for d in range(25) for h in range(10)])
+    client = ContributionStats("test-token", api_url=github_stub.url)
+
+    stats, repo_stats = client.get_user_stats("test-user", days=30)
+
+    assert repo_stats == {"busy": 250}
+    assert sum(stats.values()) == 250
+    assert github_stub.requests.count("/users/test-user/repos") == 2
+    assert github_stub.requests.count("/repos/test-user/busy/commits") == 3
+
+
+def test_stops_paging_before_since_window(github_stub):
+    """Paging stops at the first commit older than the window."""
+    github_stub.ignore_since = True
+    github_stub.add_repo("old", [_recent(d % 10) for d in range(100)] +
+                         [_recent(100 + d) for d in range(300)])
+    client = ContributionStats("test-token", api_url=github_stub.url)
+
+    stats, repo_stats = client.get_user_stats("test-user", days=30)
+
+    assert repo_stats == {"old": 100}
+    assert github_stub.requests.count("/repos/test-user/old/commits") == 2
+
+
+def test_repeat_run_served_from_cache(github_stub, tmp_path):
+    """A second run revalidates with ETags and reads unchanged pages from the cache."""
+    _populate(github_stub, repos=5)
+    first = ContributionStats("test-token", api_url=github_stub.url,
+                              cache=ResponseCache(tmp_path / "cache"))
+    expected = first.get_user_stats("test-user")
+    assert first.cache.report()['misses'] == 6
+
+    second = ContributionStats("test-token", api_url=github_stub.url,
+                               cache=ResponseCache(tmp_path / "cache"))
+    assert second.get_user_stats("test-user") == expected
+    assert second.cache.report()['hits'] == 6
+    assert github_stub.not_modified == 6
+
+
+def test_cache_is_kept_per_token(github_stub, tmp_path):
+    """Another account's cached pages are never revalidated or served."""
+    _populate(github_stub, repos=5)
+    ContributionStats("first-token", api_url=github_stub.url,
+                      cache=ResponseCache(tmp_path / "cache")).get_user_stats("test-user")
+
+    other = ContributionStats("second-token", api_url=github_stub.url,
+                              cache=ResponseCache(tmp_path / "cache"))
+    other.get_user_stats("test-user")
+
+    assert other.cache.report()['hits'] == 0
+    assert github_stub.not_modified == 0
+
+
+def test_not_modified_without_cached_copy_is_refetched(github_stub):
+    """A 304 for a page that isn't cached is fetched again rather than parsed as JSON."""
+    _populate(github_stub, repos=3)
+    github_stub.force_not_modified = 1
+    client = ContributionStats("test-token", api_url=github_stub.url, cache=False)
+
+    stats, repo_stats = client.get_user_stats("test-user")
+
+    assert sum(repo_stats.values()) == 6
+    assert github_stub.not_modified == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Entries are evicted oldest-use first once the cache exceeds its budget."""
+    cache = ResponseCache(tmp_path, max_bytes=1000)
+    body = ["x" * 250]
+    for i in range(3):
+        cache.store(f"key{i}", {"body": body})
+        os.utime(tmp_path / f"key{i}.json", (i, i))
+    cache.load("key0")
+
+    cache.store("key3", {"body": body})
+
+    assert cache.load("key1") is None
+    assert all(cache.load(f"key{i}") is not None for i in (0, 2, 3))
+    assert cache.report()['evictions'] == 1
+
+
+def test_waits_for_quota_reset_instead_of_dropping_data(github_stub):
+    """Exhausting the primary quota pauses and retries rather than skipping repos."""
+    _populate(github_stub, repos=8)
+    github_stub.quota = 4
+    github_stub.quota_window = 0.5
+    client = ContributionStats("test-token", api_url=github_stub.url, cache=False)
+
+    stats, repo_stats = client.get_user_stats("test-user")
+
+    assert sum(repo_stats.values()) == sum(2 * r for r in range(8))
+    assert client.limiter.retries >= 1
+
+
+def test_retries_secondary_limit(github_stub):
+    """A secondary-limit response with Retry-After is retried."""
+    _populate(github_stub, repos=3)
+    github_stub.retry_after = [0, 0]
+    client = ContributionStats("test-token", api_url=github_stub.url, cache=False)
+
+    stats, repo_stats = client.get_user_stats("test-user")
+
+    assert sum(repo_stats.values()) == 6
+    assert client.limiter.retries == 2
+
+
+def test_concurrency_shrinks_as_quota_runs_low(github_stub):
+    """Low remaining quota throttles the number of requests in flight."""
+    _populate(github_stub, repos=12)
+    github_stub.latency = 0.05
+    github_stub.quota = 1000
+    client = ContributionStats("test-token", api_url=github_stub.url, max_workers=8, cache=False)
+    client.limiter.low_water = 10000
+
+    client.get_user_stats("test-user")
+
+    assert github_stub.max_in_flight == 1
+
+
+def test_rate_limiter_scales_allowed_concurrency():
+    """Allowed concurrency falls proportionally below the low-water mark."""
+    limiter = RateLimiter(max_concurrency=8, low_water=100)
+    assert limiter.allowed() == 8
+    limiter.remaining = 50
+    assert limiter.allowed() == 4
+    limiter.remaining = 3
+    assert limiter.allowed() == 1
+    limiter.remaining = 0
+    assert limiter.allowed() == 0
+
+
+def test_retry_after_http_date():
+    """Retry-After may be an HTTP date; an unreadable one falls back instead of raising."""
+    limiter = RateLimiter()
+    response = requests.Response()
+    response.status_code = 429
+    response.headers['Retry-After'] = formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= limiter.limit_delay(response, 0) <= 30
+
+    response.headers['Retry-After'] = 'soon'
+    response.headers['X-RateLimit-Remaining'] = '0'
+    response.headers['X-RateLimit-Reset'] = str(time.time() + 10)
+    assert 9 <= limiter.limit_delay(response, 0) <= 11
+
+
+def test_graphql_backend_matches_rest(github_stub):
+    """The GraphQL backend answers in one request with the same totals as REST."""
+    _populate(github_stub, repos=6)
+    client = ContributionStats("test-token", api_url=github_stub.url, cache=False)
+
+    rest_stats, rest_repos = client.get_user_stats("test-user", backend="rest")
+    rest_requests = len(github_stub.requests)
+    graphql_stats, graphql_repos = client.get_user_stats("test-user", backend="graphql")
+
+    assert dict(graphql_stats) == dict(rest_stats)
+    assert dict(graphql_repos) == dict(rest_repos)
+    assert len(github_stub.requests) - rest_requests == 1
+
+
+def test_graphql_backend_falls_back_to_rest(github_stub):
+    """GraphQL errors and over-long windows fall back to the REST path."""
+    _populate(github_stub, repos=3)
+    github_stub.graphql_error = "Resource not accessible by integration"
+    client = ContributionStats("test-token", api_url=github_stub.url, cache=False, backend="graphql")
+
+    stats, repo_stats = client.get_user_stats("test-user")
+    assert sum(repo_stats.values()) == 6
+    assert "/users/test-user/repos" in github_stub.requests
+
+    github_stub.requests.clear()
+    client.get_user_stats("test-user", days=400)
+    assert "/graphql" not in github_stub.requests